@@ -0,0 +1,502 @@
+"""
+Hayvanları NumPy dizilerinde (struct-of-arrays) tutan simülasyon motoru. `Simulation(engine="array")` ile seçilir.
+
+Konum, tür, cinsiyet, ID ve canlılık bilgisi her hayvan için ayrı bir nesnede değil, hayvan başına bir satır olan
+dizilerde tutulur; hareket, üreme ve avlanma adımları Python döngüleri yerine toplu dizi işlemleriyle yürütülür. Tahta
+üzerindeki doluluk, hücre başına hayvanın dizi indeksini tutan bir `board_size x board_size` dizisiyle izlenir.
+
+Nesne motoruyla aynı kuralları uygular; ancak varlıklar tek tek değil aynı anda hareket ettiği için sonuçlar adım adım
+değil istatistiksel olarak aynıdır:
+- Bir hareket biriminde aynı hücreye yönelen varlıklardan ID'si küçük olan hücreyi alır, diğeri o birimde yerinde kalır.
+- Bir tur içinde doğan dişiler, aynı turda kuşak kuşak ürer (sıralı motorda listeye eklenen yavruların da dolaşılması gibi).
+- Menzilinde erkek olmayan bir dişi, kendisinden önce sırası gelen dişilerin aynı turda doğan erkek yavrularıyla eşleşir
+  (sıralı motorda yavrular doğar doğmaz sonraki dişilere aday olduğu gibi).
+- Aynı doğum hücresini seçen çiftlerden ID'si küçük dişininki yerleşir, diğerleri `BIRTH_ROUNDS` kez yeniden dener.
+"""
+from __future__ import annotations
+import math
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy yalnızca bu motor için gereklidir
+    np = None
+
+from events import Event, EventKind, EventSink
+from metrics import SimulationMetrics
+from placement import ring_offsets
+from scenario import Scenario
+from simulation import GENDERS, Animal, Simulation, Species
+
+if TYPE_CHECKING:
+    from frames import FrameRing
+    from recorder import PopulationRecorder
+
+MALE, FEMALE = 0, 1
+
+
+def neighbor_pairs(x, y, sources, targets, radius: float):
+    """
+    `sources` içindeki her indeks için, `targets` içinden öklid mesafesi `radius` veya daha az olan indeksleri bulur.
+    Hedefler `radius` kenarlı hücrelere göre sıralanır; her kaynak yalnızca kendi hücresi ve 8 komşu hücreyle
+    karşılaştırılır. (kaynak, hedef, mesafe karesi) dizilerini döndürür; bir indeks kendisiyle eşleştirilmez.
+    """
+    cell = max(1, int(math.ceil(radius)))
+    empty = np.empty(0, np.int64)
+    if sources.size == 0 or targets.size == 0:
+        return empty, empty, empty
+    target_cx = x[targets].astype(np.int64) // cell
+    target_cy = y[targets].astype(np.int64) // cell
+    rows = int(target_cy.max()) + 3
+    keys = (target_cx + 1) * rows + (target_cy + 1)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    source_cx = x[sources].astype(np.int64) // cell
+    source_cy = y[sources].astype(np.int64) // cell
+    found_sources, found_targets = [], []
+    for offset_x in (-1, 0, 1):
+        for offset_y in (-1, 0, 1):
+            cy = source_cy + offset_y
+            query = (source_cx + offset_x + 1) * rows + (cy + 1)
+            low = np.searchsorted(sorted_keys, query, "left")
+            high = np.searchsorted(sorted_keys, query, "right")
+            counts = np.where((cy >= -1) & (cy < rows - 2), high - low, 0)
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            starts = np.repeat(low, counts)
+            within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            found_sources.append(np.repeat(sources, counts))
+            found_targets.append(targets[order[starts + within]])
+    if not found_sources:
+        return empty, empty, empty
+    pair_sources = np.concatenate(found_sources)
+    pair_targets = np.concatenate(found_targets)
+    dx = x[pair_sources].astype(np.int64) - x[pair_targets]
+    dy = y[pair_sources].astype(np.int64) - y[pair_targets]
+    squared = dx * dx + dy * dy
+    keep = (squared <= radius * radius) & (pair_sources != pair_targets)
+    return pair_sources[keep], pair_targets[keep], squared[keep]
+
+
+class ArraySimulation(Simulation):
+    """
+    `Simulation` ile aynı arayüzü sunan, hayvanları NumPy dizilerinde tutan motor. `animals` listesi bu motorda boş
+    kalır; hayvan durumu `x`, `y`, `species`, `gender`, `ids` ve `alive` dizilerinin ilk `count` satırındadır.
+    """
+    ENGINE = "array"
+    BIRTH_ROUNDS = 4
+    DIRECTIONS_X = (0, 0, 1, -1)
+    DIRECTIONS_Y = (-1, 1, 0, 0)
+
+    def __init__(self, board_size: int = 500, event_sink: Optional[EventSink] = None, engine: str = "array",
+                 seed: Optional[int] = None, metrics: Optional[SimulationMetrics] = None,
+                 recorder: Optional[PopulationRecorder] = None, incremental: bool = False,
+                 frames: Optional[FrameRing] = None, scenario: Optional[Scenario] = None):
+        if np is None:
+            raise ImportError("engine='array' requires NumPy (pip install numpy)")
+        if incremental:
+            raise ValueError("incremental=True is only supported by engine='object', not engine='array'")
+        super().__init__(board_size, event_sink, seed=seed, metrics=metrics, recorder=recorder, frames=frames,
+                         scenario=scenario)
+        self.np_rng = np.random.default_rng(self.rng.getrandbits(64))
+        self.count = 0
+        self._allocate(1024)
+        # [y, x] -> hayvanın dizi indeksi + 1; 0 boş hücre, -1 avcı.
+        self.cells = np.zeros((board_size, board_size), np.int32)
+        self.cells[self.hunter.y, self.hunter.x] = -1
+
+        # Tablolar nesne motorunun kullandığı senaryo tablolarının NumPy kopyalarıdır; tür koduyla indekslenir. Avcının
+        # satırları hayvan dizilerinde kullanılmaz, avcı ayrıca işlenir.
+        scenario = self.scenario
+        self.move_distance_table = np.array(scenario.move_distance[:-1] + [0], np.int64)
+        self.hunt_distance_table = np.array(scenario.hunt_distance[:-1] + [0], np.int64)
+        # perform_hunting'deki öncelik (yerleşik türlerde avcı > aslan > kurt > diğerleri), eşitlikte küçük ID.
+        self.priority_table = np.array(scenario.priority, np.int64)
+        self.eligible_table = np.array(scenario.eligible, np.bool_)
+        self.mating_table = np.array(scenario.mating, np.bool_)
+        # [anne, baba, yavru cinsiyeti] -> yavrunun tür kodu.
+        self.offspring_table = np.array(scenario.offspring, np.int8)
+        ring = ring_offsets(4)
+        self.ring_x = np.array([dx for dx, _ in ring], np.int64)
+        self.ring_y = np.array([dy for _, dy in ring], np.int64)
+
+    def _allocate(self, capacity: int):
+        def grow(name, dtype):
+            array = np.zeros(capacity, dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                array[:self.count] = old[:self.count]
+            setattr(self, name, array)
+
+        grow("x", np.int64)
+        grow("y", np.int64)
+        grow("species", np.int8)
+        grow("gender", np.int8)
+        grow("ids", np.int64)
+        grow("alive", np.bool_)
+
+    def _append(self, xs, ys, species_codes, genders, ids=None):
+        """
+        Yeni hayvanları dizilerin sonuna ekler, ID verir (`ids` verilirse bu ID'leri kullanır) ve doluluk dizisine işler.
+        Yeni indeksleri döndürür.
+        """
+        added = len(xs)
+        if self.count + added > len(self.x):
+            self._allocate(max(2 * len(self.x), self.count + added))
+        slots = np.arange(self.count, self.count + added)
+        self.x[slots] = xs
+        self.y[slots] = ys
+        self.species[slots] = species_codes
+        self.gender[slots] = genders
+        if ids is None:
+            first = self.allocate_ids(added)
+            ids = np.arange(first, first + added)
+        else:
+            # Dışarıdan gelen ID'ler sayacın önündeyse yeni ID'ler onlarla çakışmasın.
+            self.id_counter = max(self.id_counter, int(max(ids, default=0)))
+        self.ids[slots] = ids
+        self.alive[slots] = True
+        self.cells[ys, xs] = slots + 1
+        self.count += added
+        self._count_population(self.species[slots], self.gender[slots], 1)
+        return slots
+
+    def _count_population(self, species_codes, gender_codes, sign: int):
+        """Verilen hayvanları (tür, cinsiyet) bazındaki nüfus sayılarına ekler (`sign` = 1) veya çıkarır (`sign` = -1)."""
+        keys = species_codes.astype(np.int64) * 2 + gender_codes
+        members = self.scenario.members
+        for key, count in enumerate(np.bincount(keys, minlength=2 * len(members)).tolist()):
+            if count:
+                group = (members[key // 2], GENDERS[key % 2])
+                self.population[group] = self.population.get(group, 0) + sign * count
+
+    def export_entities(self):
+        n = self.count
+        return (self.ids[:n], self.x[:n].astype(np.int32), self.y[:n].astype(np.int32),
+                self.species[:n].astype(np.uint8), self.gender[:n].astype(np.uint8))
+
+    def import_entities(self, ids, xs, ys, species_codes, gender_codes):
+        """Kontrol noktası sütunlarını (bellek eşlemli görünümler) doğrudan dizilere kopyalar."""
+        count = len(ids)
+        self.count = 0
+        self._allocate(max(1024, count))
+        self.count = count
+        self.ids[:count] = np.frombuffer(ids, np.int64)
+        self.x[:count] = np.frombuffer(xs, np.int32)
+        self.y[:count] = np.frombuffer(ys, np.int32)
+        self.species[:count] = np.frombuffer(species_codes, np.uint8)
+        self.gender[:count] = np.frombuffer(gender_codes, np.uint8)
+        self.alive[:count] = True
+        self.population = {}
+        self._count_population(self.species[:count], self.gender[:count], 1)
+        self.cells[:] = 0
+        self.cells[self.y[:count], self.x[:count]] = np.arange(1, count + 1)
+        self.cells[self.hunter.y, self.hunter.x] = -1
+
+    def export_engine_state(self) -> dict:
+        return {"np_rng": self.np_rng.bit_generator.state}
+
+    def import_engine_state(self, state: dict):
+        self.np_rng.bit_generator.state = state["np_rng"]
+
+    def is_position_available(self, x: int, y: int, current_entity_id: Optional[int]) -> bool:
+        occupant = int(self.cells[y, x])
+        if occupant > 0:
+            return int(self.ids[occupant - 1]) == current_entity_id
+        return occupant == 0
+
+    def sample_empty_cells(self, count: int):
+        """Birbirinden farklı `count` boş hücreyi rastgele seçer; yeterli boş hücre yoksa bulunabilenleri döndürür."""
+        board = self.board_size
+        flat_cells = self.cells.ravel()
+        free = board * board - self.count - 1
+        count = min(count, free)
+        if count <= 0:
+            return np.empty(0, np.int64), np.empty(0, np.int64)
+        if count > free // 2:
+            chosen = self.np_rng.choice(np.flatnonzero(flat_cells == 0), count, replace=False)
+        else:
+            chosen = np.empty(0, np.int64)
+            while len(chosen) < count:
+                candidates = self.np_rng.integers(0, board * board, 2 * (count - len(chosen)) + 16)
+                candidates = candidates[flat_cells[candidates] == 0]
+                _, first = np.unique(candidates, return_index=True)
+                candidates = candidates[np.sort(first)]
+                candidates = candidates[~np.isin(candidates, chosen)]
+                chosen = np.concatenate([chosen, candidates])[:count]
+        return chosen % board, chosen // board
+
+    def find_empty_position(self) -> Tuple[Optional[int], Optional[int]]:
+        xs, ys = self.sample_empty_cells(1)
+        if len(xs):
+            return int(xs[0]), int(ys[0])
+        if self.metrics is not None:
+            self.metrics.current.failed_placements += 1
+        return None, None
+
+    def place_initial_animals(self):
+        for species, count, gender in self.animals_to_create:
+            self.create_animal(species, gender, count)
+
+    def create_animal(self, species: Species, gender: str, count: int):
+        """Belirli bir türden `count` hayvanı rastgele boş hücrelere yerleştirip dizilere ekler."""
+        xs, ys = self.sample_empty_cells(count)
+        self._append(xs, ys, species.code, GENDERS.index(gender))
+        if self.metrics is not None:
+            self.metrics.current.failed_placements += count - len(xs)
+
+    def add_animal(self, animal: Animal):
+        """
+        Hayvanın konumunu, türünü, cinsiyetini ve ID'sini dizilere ekler; nesnenin kendisi saklanmaz. Hücre tahta dışında
+        veya doluysa ValueError verir.
+        """
+        if not (0 <= animal.x < self.board_size and 0 <= animal.y < self.board_size
+                and self.is_position_available(animal.x, animal.y, None)):
+            raise ValueError(f"Cannot add animal at ({animal.x}, {animal.y}): cell is outside the board or occupied")
+        self._append([animal.x], [animal.y], animal.species.code, GENDERS.index(animal.gender), [animal.id])
+
+    def _sync_occupancy(self):
+        # Hayvanlar dizilerde tutulur; `animals` listesi kullanılmadığından yeniden kurulacak bir indeks yoktur.
+        pass
+
+    def move_entities_once(self):
+        if self.total_movement >= self.MAX_MOVEMENT:
+            return
+        n = self.count
+        x, y, cells, board = self.x, self.y, self.cells, self.board_size
+        move_distance = self.move_distance_table[self.species[:n]]
+        # Sıralı motordaki gibi her hayvan, kendisinden önceki hayvanlar harcadıktan sonra kalan hareket hakkını kullanır.
+        spent_before = self.total_movement + np.cumsum(move_distance) - move_distance
+        allowed = np.clip(self.MAX_MOVEMENT - spent_before, 0, move_distance)
+        sink = self.event_sink
+        log_events = sink is not None and sink.enabled
+        if log_events:
+            initial_x, initial_y = x[:n].copy(), y[:n].copy()
+
+        steps = allowed.copy()
+        directions_x = np.array(self.DIRECTIONS_X)
+        directions_y = np.array(self.DIRECTIONS_Y)
+        for step in range(int(allowed.max(initial=0))):
+            active = np.flatnonzero(steps > step)
+            if active.size == 0:
+                break
+            target_x = x[active, None] + directions_x
+            target_y = y[active, None] + directions_y
+            inside = (target_x >= 0) & (target_x < board) & (target_y >= 0) & (target_y < board)
+            valid = np.zeros(inside.shape, np.bool_)
+            valid[inside] = cells[target_y[inside], target_x[inside]] == 0
+            can_move = valid.any(axis=1)
+            if self.metrics is not None:
+                self.metrics.current.occupancy_checks += int(inside.sum())
+                self.metrics.current.blocked_moves += int(active.size - can_move.sum())
+            # Geçerli yönü kalmayan varlık bu turdaki hareketini bitirir.
+            steps[active[~can_move]] = 0
+            keys = self.np_rng.random(valid.shape)
+            keys[~valid] = -1.0
+            choice = keys.argmax(axis=1)[can_move]
+            movers = active[can_move]
+            target_x = x[movers] + directions_x[choice]
+            target_y = y[movers] + directions_y[choice]
+            _, first = np.unique(target_y * board + target_x, return_index=True)
+            winners = movers[first]
+            cells[y[winners], x[winners]] = 0
+            x[winners] = target_x[first]
+            y[winners] = target_y[first]
+            cells[y[winners], x[winners]] = winners + 1
+        self.total_movement += int(allowed.sum())
+
+        if log_events:
+            for index in np.flatnonzero(allowed > 0):
+                sink.emit(Event(self.tick, EventKind.MOVE, (int(self.ids[index]),), (self.scenario.members[self.species[index]],),
+                                ((int(initial_x[index]), int(initial_y[index])), (int(x[index]), int(y[index]))),
+                                int(allowed[index]), int(self.MAX_MOVEMENT - spent_before[index] - allowed[index])))
+        self._move_hunter(log_events)
+
+    def _move_hunter(self, log_events: bool):
+        hunter = self.hunter
+        if self.total_movement >= self.MAX_MOVEMENT:
+            return
+        allowed = min(hunter.move_distance, self.MAX_MOVEMENT - self.total_movement)
+        initial_position = (hunter.x, hunter.y)
+        for _ in range(allowed):
+            options = [(dx, dy) for dx, dy in zip(self.DIRECTIONS_X, self.DIRECTIONS_Y)
+                       if 0 <= hunter.x + dx < self.board_size and 0 <= hunter.y + dy < self.board_size
+                       and self.cells[hunter.y + dy, hunter.x + dx] == 0]
+            if not options:
+                break
+            dx, dy = options[int(self.np_rng.integers(len(options)))]
+            self.cells[hunter.y, hunter.x] = 0
+            hunter.update_position(dx, dy)
+            self.cells[hunter.y, hunter.x] = -1
+        self.total_movement += allowed
+        if log_events:
+            self.event_sink.emit(Event(self.tick, EventKind.MOVE, (hunter.id,), (hunter.species,),
+                                       (initial_position, (hunter.x, hunter.y)), allowed,
+                                       self.MAX_MOVEMENT - self.total_movement))
+
+    def perform_hunting(self):
+        n = self.count
+        if n == 0:
+            return
+        x, y, species = self.x[:n], self.y[:n], self.species[:n]
+        members = self.scenario.members
+        everyone = np.arange(n)
+        hunt_distance = self.hunt_distance_table[species]
+        predators = np.flatnonzero(hunt_distance > 0)
+        sources, targets, squared = neighbor_pairs(x, y, predators, everyone, int(self.hunt_distance_table.max()))
+        eligible = (squared <= hunt_distance[sources] ** 2) & self.eligible_table[species[sources], species[targets]]
+        sources, targets = sources[eligible], targets[eligible]
+
+        hunter = self.hunter
+        hunter_code = hunter.species.code
+        hunter_prey = np.flatnonzero(((x - hunter.x) ** 2 + (y - hunter.y) ** 2 <= hunter.hunt_distance ** 2)
+                                     & self.eligible_table[hunter_code, species])
+        prey = np.concatenate([targets, hunter_prey])
+        if prey.size == 0:
+            return
+        hunters = np.concatenate([sources, np.full(hunter_prey.size, -1)])
+        priority = np.concatenate([self.priority_table[species[sources]], np.full(hunter_prey.size, self.priority_table[hunter_code])])
+        hunter_ids = np.concatenate([self.ids[sources], np.full(hunter_prey.size, hunter.id)])
+        order = np.lexsort((hunter_ids, priority, prey))
+        prey, hunters = prey[order], hunters[order]
+        first = np.ones(prey.size, np.bool_)
+        first[1:] = prey[1:] != prey[:-1]
+        prey, hunters = prey[first], hunters[first]
+
+        for code, hunted in enumerate(np.bincount(species[prey], minlength=len(members))):
+            if hunted:
+                self.hunted_counts[members[code]] = self.hunted_counts.get(members[code], 0) + int(hunted)
+        predator_codes = np.where(hunters < 0, hunter_code, species[np.maximum(hunters, 0)])
+        for code, kills in enumerate(np.bincount(predator_codes, minlength=len(members))):
+            if kills:
+                self.kill_counts[members[code]] = self.kill_counts.get(members[code], 0) + int(kills)
+        sink = self.event_sink
+        if sink is not None and sink.enabled:
+            for prey_index, hunter_index in zip(prey.tolist(), hunters.tolist()):
+                if hunter_index < 0:
+                    predator = (hunter.id, hunter.species, (hunter.x, hunter.y))
+                else:
+                    predator = (int(self.ids[hunter_index]), members[species[hunter_index]],
+                                (int(x[hunter_index]), int(y[hunter_index])))
+                sink.emit(Event(self.tick, EventKind.HUNT, (predator[0], int(self.ids[prey_index])),
+                                (predator[1], members[species[prey_index]]),
+                                (predator[2], (int(x[prey_index]), int(y[prey_index])))))
+        if self.metrics is not None:
+            self.metrics.current.hunts += int(prey.size)
+        self.alive[prey] = False
+        self._compact()
+
+    def _compact(self):
+        """Ölen hayvanları dizilerden çıkarır ve doluluk dizisindeki indeksleri yeniler."""
+        n = self.count
+        keep = self.alive[:n].copy()
+        self._count_population(self.species[:n][~keep], self.gender[:n][~keep], -1)
+        self.cells[self.y[:n][~keep], self.x[:n][~keep]] = 0
+        for name in ("x", "y", "species", "gender", "ids", "alive"):
+            array = getattr(self, name)
+            survivors = array[:n][keep]
+            array[:survivors.size] = survivors
+        self.count = int(keep.sum())
+        self.cells[self.y[:self.count], self.x[:self.count]] = np.arange(1, self.count + 1)
+
+    def perform_reproduction(self):
+        if self.count == 0:
+            return
+        # Sıralı motorda tur içinde doğan dişiler de aynı tur ürer; burada bu, yavru dişilerle tekrarlanan kuşaklarla yapılır.
+        females = np.flatnonzero(self.gender[:self.count] == FEMALE)
+        while females.size:
+            first_child = self.count
+            self._reproduce(females)
+            females = first_child + np.flatnonzero(self.gender[first_child:self.count] == FEMALE)
+
+    def _reproduce(self, females):
+        """
+        Bir kuşağın dişilerini eşleştirir. Eş bulamayan dişiler, bu kuşakta doğan erkeklerle yeniden denenir; bir erkek
+        yavru yalnızca annesinden sonra sırası gelen (satırı daha büyük) dişilere aday olur.
+        """
+        males = np.flatnonzero(self.gender[:self.count] == MALE)
+        # Satır -> bu kuşakta doğduysa annesinin satırı, değilse -1.
+        mother_of = None
+        while females.size and males.size:
+            first_child = self.count
+            females, child_mothers = self._mate(females, males, mother_of)
+            born = np.arange(first_child, self.count)
+            males = born[self.gender[born] == MALE]
+            mother_of = np.full(self.count, -1, np.int64)
+            mother_of[born] = child_mothers
+
+    def _mate(self, females, males, mother_of):
+        """
+        Verilen dişiler için en yakın uyumlu erkeği seçer ve yavruları doğum çemberine yerleştirir. Menzilinde aday
+        erkek olmayan dişileri ve doğan yavruların annelerini (yavru sırasıyla) döndürür.
+        """
+        n = self.count
+        x, y, species = self.x, self.y, self.species
+        members = self.scenario.members
+        mothers, fathers, squared = neighbor_pairs(x[:n], y[:n], females, males, self.REPRODUCTION_DISTANCE)
+        compatible = self.mating_table[species[mothers], species[fathers]]
+        if mother_of is not None:
+            compatible &= mother_of[fathers] < mothers
+        mothers, fathers, squared = mothers[compatible], fathers[compatible], squared[compatible]
+        child_mothers = []
+        if mothers.size == 0:
+            return females, np.empty(0, np.int64)
+        # Her dişi en yakın erkeği seçer; eşit uzaklıktaki erkekler arasında rastgele seçim yapılır.
+        order = np.lexsort((self.np_rng.random(mothers.size), squared, mothers))
+        mothers, fathers = mothers[order], fathers[order]
+        first = np.ones(mothers.size, np.bool_)
+        first[1:] = mothers[1:] != mothers[:-1]
+        mothers, fathers = mothers[first], fathers[first]
+        unmated = np.setdiff1d(females, mothers, assume_unique=True)
+        center_x = (x[mothers] + x[fathers]) // 2
+        center_y = (y[mothers] + y[fathers]) // 2
+
+        board = self.board_size
+        pending = np.arange(mothers.size)
+        for _ in range(self.BIRTH_ROUNDS):
+            if pending.size == 0:
+                break
+            candidate_x = center_x[pending, None] + self.ring_x
+            candidate_y = center_y[pending, None] + self.ring_y
+            inside = (candidate_x >= 0) & (candidate_x < board) & (candidate_y >= 0) & (candidate_y < board)
+            free = np.zeros(inside.shape, np.bool_)
+            free[inside] = self.cells[candidate_y[inside], candidate_x[inside]] == 0
+            has_place = free.any(axis=1)
+            if self.metrics is not None:
+                self.metrics.current.occupancy_checks += int(inside.sum())
+                self.metrics.current.failed_placements += int(pending.size - has_place.sum())
+            keys = self.np_rng.random(free.shape)
+            keys[~free] = -1.0
+            pick = keys.argmax(axis=1)
+            pending, pick = pending[has_place], pick[has_place]
+            birth_x = center_x[pending] + self.ring_x[pick]
+            birth_y = center_y[pending] + self.ring_y[pick]
+            _, first = np.unique(birth_y * board + birth_x, return_index=True)
+            first = np.sort(first)
+            placed = pending[first]
+            genders = self.np_rng.integers(0, 2, placed.size).astype(np.int8)
+            mother_species = species[mothers[placed]]
+            child_species = self.offspring_table[mother_species, species[fathers[placed]], genders]
+            children = self._append(birth_x[first], birth_y[first], child_species, genders)
+            child_mothers.append(mothers[placed])
+            if self.metrics is not None:
+                self.metrics.current.births += int(children.size)
+            x, y, species = self.x, self.y, self.species
+            for code, born in enumerate(np.bincount(child_species, minlength=len(members))):
+                if born:
+                    self.born_counts[members[code]] = self.born_counts.get(members[code], 0) + int(born)
+            sink = self.event_sink
+            if sink is not None and sink.enabled:
+                for child, mother, father in zip(children.tolist(), mothers[placed].tolist(), fathers[placed].tolist()):
+                    sink.emit(Event(self.tick, EventKind.BIRTH,
+                                    (int(self.ids[child]), int(self.ids[mother]), int(self.ids[father])),
+                                    (members[species[child]], members[species[mother]], members[species[father]]),
+                                    ((int(x[child]), int(y[child])), (int(x[mother]), int(y[mother])),
+                                     (int(x[father]), int(y[father])))))
+            lost = np.ones(pending.size, np.bool_)
+            lost[first] = False
+            pending = pending[lost]
+        if self.metrics is not None:
+            self.metrics.current.failed_placements += int(pending.size)
+        return unmated, np.concatenate(child_mothers) if child_mothers else np.empty(0, np.int64)
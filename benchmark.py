@@ -0,0 +1,264 @@
+"""
+Simülasyon tur adımları için ölçeklenme ölçümleri.
+
+Tahta boyutu ve başlangıç nüfusu (`animals_to_create` sayıları bir çarpanla büyütülerek) kombinasyonları üzerinde sabit
+tohumlarla birkaç tur çalıştırır; `populate`, `move_entities_once`, `perform_reproduction`, `perform_hunting` ve olay
+kaydı sürelerini ayrı ayrı ölçer. Sonuçlar JSON olarak kaydedilir ve önceden kaydedilmiş bir temel (baseline) sonuçla
+karşılaştırılarak yavaşlamalar ve ikinci dereceden (quadratic) büyüme raporlanır.
+
+Kullanım:
+
+    python benchmark.py --boards 100 300 --scales 1 10 --ticks 5 --output bench.json
+    python benchmark.py --boards 100 300 --scales 1 10 --ticks 5 --baseline bench.json
+    python benchmark.py --entity-memory 100000
+"""
+from __future__ import annotations
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Sequence
+
+from events import BufferedEventSink, Event, EventSink, NullEventSink
+from simulation import Animal, Simulation
+
+PHASES = ("populate", "move_entities_once", "perform_reproduction", "perform_hunting", "logging")
+TICK_PHASES = PHASES[1:4]
+
+
+class TimedSink(EventSink):
+    """Başka bir yazıcıyı sarar ve `emit`/`close` içinde geçen süreyi toplar."""
+
+    def __init__(self, inner: EventSink):
+        self.inner = inner
+        self.enabled = inner.enabled
+        self.seconds = 0.0
+
+    def emit(self, event: Event):
+        start = time.perf_counter()
+        self.inner.emit(event)
+        self.seconds += time.perf_counter() - start
+
+    def close(self):
+        start = time.perf_counter()
+        self.inner.close()
+        self.seconds += time.perf_counter() - start
+
+
+def make_sink(log_format: str) -> EventSink:
+    if log_format == "none":
+        return NullEventSink()
+    return BufferedEventSink(os.devnull, format=log_format)
+
+
+def build_simulation(board_size: int, scale: int, seed: int, engine: str, sink: EventSink) -> Simulation:
+    """Başlangıç nüfusu `scale` katına çıkarılmış ve hareket sınırı kaldırılmış bir simülasyon kurar."""
+    simulation = Simulation(board_size=board_size, event_sink=sink, engine=engine, seed=seed)
+    simulation.animals_to_create = [(species, count * scale, gender) for species, count, gender in simulation.animals_to_create]
+    simulation.NUM_ANIMALS = {species: count * scale for species, count in Simulation.NUM_ANIMALS.items()}
+    # Turlar arasında hareket hakkı bitmesin; ölçüm `ticks` kadar tur sürer.
+    simulation.MAX_MOVEMENT = sys.maxsize
+    return simulation
+
+
+def run_case(board_size: int, scale: int, ticks: int, seed: int, engine: str = "object", log_format: str = "text",
+             measure_memory: bool = True) -> Dict[str, object]:
+    """Tek bir (tahta, nüfus) kombinasyonunu ölçer ve sonuçları sözlük olarak döndürür."""
+    sink = TimedSink(make_sink(log_format))
+    simulation = build_simulation(board_size, scale, seed, engine, sink)
+    seconds = dict.fromkeys(PHASES, 0.0)
+
+    def timed(phase, function):
+        logged = sink.seconds
+        start = time.perf_counter()
+        function()
+        # Olay kaydında geçen süre ilgili adımdan düşülüp `logging` altında raporlanır.
+        seconds[phase] += time.perf_counter() - start - (sink.seconds - logged)
+
+    timed("populate", simulation.populate)
+    population = len(simulation.animals) if engine == "object" else simulation.count
+    moves = simulation.total_movement
+    tick_start = time.perf_counter()
+    for _ in range(ticks):
+        simulation.tick += 1
+        timed("move_entities_once", simulation.move_entities_once)
+        timed("perform_reproduction", simulation.perform_reproduction)
+        timed("perform_hunting", simulation.perform_hunting)
+    sink.close()
+    elapsed = time.perf_counter() - tick_start
+    seconds["logging"] = sink.seconds
+    moves = simulation.total_movement - moves
+
+    result = {
+        "board_size": board_size,
+        "scale": scale,
+        "population": population,
+        "final_population": sum(simulation.final_counts().values()),
+        "ticks": ticks,
+        "seconds": seconds,
+        "seconds_per_tick": {phase: seconds[phase] / ticks for phase in TICK_PHASES + ("logging",)},
+        "ticks_per_second": ticks / elapsed if elapsed else float("inf"),
+        "entity_moves_per_second": moves / seconds["move_entities_once"] if seconds["move_entities_once"] else float("inf"),
+    }
+    if measure_memory:
+        result["peak_memory_bytes"] = measure_peak_memory(board_size, scale, ticks, seed, engine)
+    return result
+
+
+def measure_peak_memory(board_size: int, scale: int, ticks: int, seed: int, engine: str) -> int:
+    """Aynı çalıştırmayı olay kaydı olmadan tracemalloc altında tekrarlar ve en yüksek bellek kullanımını döndürür."""
+    tracemalloc.start()
+    try:
+        simulation = build_simulation(board_size, scale, seed, engine, NullEventSink())
+        simulation.populate()
+        for _ in range(ticks):
+            simulation.step()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure_entity_memory(count: int = 100000, board_size: int = 2000) -> float:
+    """
+    `count` hayvan nesnesi oluşturur ve tracemalloc ile hayvan başına ayrılan ortalama bellek miktarını (bayt) döndürür.
+    Koordinatlar ve ID'ler için ayrılan tamsayı nesneleri de dahildir.
+    """
+    simulation = Simulation(board_size=board_size, event_sink=NullEventSink(), seed=0)
+    species = list(Animal.species_attributes)
+    positions = [(index % board_size, index // board_size % board_size) for index in range(count)]
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        animals = [Animal(x, y, "Female" if index % 2 else "Male", species[index % len(species)], board_size, simulation)
+                   for index, (x, y) in enumerate(positions)]
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del animals
+    return used / count
+
+
+def run_sweep(boards: Sequence[int], scales: Sequence[int], ticks: int, seed: int, engine: str = "object",
+              log_format: str = "text", measure_memory: bool = True) -> Dict[str, object]:
+    cases = []
+    for board_size in boards:
+        for scale in scales:
+            case = run_case(board_size, scale, ticks, seed, engine, log_format, measure_memory)
+            cases.append(case)
+            print(format_case(case), flush=True)
+    return {
+        "engine": engine,
+        "log_format": log_format,
+        "seed": seed,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": cases,
+        "scaling": scaling_exponents(cases),
+    }
+
+
+def scaling_exponents(cases: Sequence[Dict[str, object]]) -> Dict[str, Dict[str, float]]:
+    """
+    Her tahta boyutu için, tur başına adım süresinin başlangıç nüfusuna göre log-log eğimini hesaplar. Eğim 1'e yakınsa
+    adım nüfusla doğrusal, 2'ye yakınsa karesel büyüyordur.
+    """
+    exponents: Dict[str, Dict[str, float]] = {}
+    by_board: Dict[int, List[Dict[str, object]]] = {}
+    for case in cases:
+        by_board.setdefault(case["board_size"], []).append(case)
+    for board_size, board_cases in by_board.items():
+        board_cases = sorted(board_cases, key=lambda case: case["population"])
+        if len(board_cases) < 2 or board_cases[0]["population"] == board_cases[-1]["population"]:
+            continue
+        exponents[str(board_size)] = {}
+        for phase in TICK_PHASES:
+            points = [(math.log(case["population"]), math.log(case["seconds_per_tick"][phase]))
+                      for case in board_cases if case["population"] > 0 and case["seconds_per_tick"][phase] > 0]
+            if len(points) < 2:
+                continue
+            mean_x = sum(x for x, _ in points) / len(points)
+            mean_y = sum(y for _, y in points) / len(points)
+            variance = sum((x - mean_x) ** 2 for x, _ in points)
+            if variance:
+                exponents[str(board_size)][phase] = sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+    return exponents
+
+
+def compare(results: Dict[str, object], baseline: Dict[str, object], threshold: float = 0.2,
+            max_exponent: float = 1.5) -> List[str]:
+    """
+    Sonuçları temel ölçümle karşılaştırır. Aynı (tahta, çarpan) kombinasyonunda tur başına süresi `threshold` oranından
+    fazla artan adımları ve nüfusa göre ölçeklenme eğimi `max_exponent` değerini aşan adımları listeler.
+    """
+    problems = []
+    baseline_cases = {(case["board_size"], case["scale"]): case for case in baseline.get("cases", [])}
+    for case in results["cases"]:
+        reference = baseline_cases.get((case["board_size"], case["scale"]))
+        if reference is None:
+            continue
+        for phase, value in case["seconds_per_tick"].items():
+            old = reference["seconds_per_tick"].get(phase)
+            if old and value > old * (1 + threshold):
+                problems.append(f"board={case['board_size']} scale={case['scale']} {phase}: "
+                                f"{old * 1000:.2f} ms/tick -> {value * 1000:.2f} ms/tick (+{(value / old - 1) * 100:.0f}%)")
+    for board_size, phases in results.get("scaling", {}).items():
+        for phase, exponent in phases.items():
+            if exponent > max_exponent:
+                problems.append(f"board={board_size} {phase}: time per tick grows as population^{exponent:.2f}")
+    return problems
+
+
+def format_case(case: Dict[str, object]) -> str:
+    per_tick = case["seconds_per_tick"]
+    memory = case.get("peak_memory_bytes")
+    return (f"board={case['board_size']:<6} scale={case['scale']:<5} animals={case['population']:<8} "
+            f"move={per_tick['move_entities_once'] * 1000:8.2f}ms reproduce={per_tick['perform_reproduction'] * 1000:8.2f}ms "
+            f"hunt={per_tick['perform_hunting'] * 1000:8.2f}ms log={per_tick['logging'] * 1000:8.2f}ms "
+            f"populate={case['seconds']['populate'] * 1000:8.2f}ms ticks/s={case['ticks_per_second']:8.2f} "
+            f"moves/s={case['entity_moves_per_second']:10.0f}"
+            + (f" peak={memory / 2 ** 20:.1f}MiB" if memory is not None else ""))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark simulation tick phases across board sizes and populations.")
+    parser.add_argument("--boards", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100],
+                        help="multipliers applied to the initial population counts")
+    parser.add_argument("--ticks", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", choices=Simulation.ENGINES, default="object")
+    parser.add_argument("--log-format", choices=("text", "jsonl", "binary", "none"), default="text")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory pass")
+    parser.add_argument("--output", default=None, help="write results to this JSON file")
+    parser.add_argument("--baseline", default=None, help="compare against results stored in this JSON file")
+    parser.add_argument("--entity-memory", type=int, default=None, metavar="COUNT",
+                        help="only measure the average memory of COUNT animal objects and exit")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown per phase (0.2 = 20%%)")
+    parser.add_argument("--max-exponent", type=float, default=1.5, help="largest acceptable population scaling exponent")
+    args = parser.parse_args(argv)
+
+    if args.entity_memory:
+        print(f"{measure_entity_memory(args.entity_memory):.1f} bytes per animal ({args.entity_memory} animals)")
+        return 0
+    results = run_sweep(args.boards, args.scales, args.ticks, args.seed, args.engine, args.log_format, not args.no_memory)
+    for board_size, phases in results["scaling"].items():
+        print(f"board={board_size} scaling exponents: " + ", ".join(f"{phase}={value:.2f}" for phase, value in phases.items()))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        problems = compare(results, baseline, args.threshold, args.max_exponent)
+        for problem in problems:
+            print("REGRESSION: " + problem)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Simülasyon durumunun ikili kontrol noktası (checkpoint) biçimi.
+
+Dosya düzeni (tüm sayılar little-endian):
+
+    8 bayt   sihirli değer b"ZOOCKPT1"
+    4 bayt   meta veri uzunluğu (uint32), 4 bayt boşluk
+    ...      meta veri: JSON (tahta boyutu, motor, tur, sayaçlar, avcı, ID sayacı, örneğe özgü ayarlar, varsa özel senaryo), 8 bayta hizalı
+    2500     Python rastgele sayı üretecinin Mersenne Twister durumu (625 x uint32)
+    ...      hayvan sütunları: id (int64), x (int32), y (int32), tür kodu (uint8), cinsiyet kodu (uint8); her sütun 8 bayta hizalı
+
+Yükleme sırasında dosya belleğe eşlenir (mmap) ve sütunlar kopyalanmadan okunur; dizi motoru sütunları doğrudan
+NumPy dizilerine aktarır.
+"""
+from __future__ import annotations
+import json
+import mmap
+import sys
+from array import array
+from typing import Optional
+
+from events import EventSink
+from scenario import Scenario
+from simulation import DEFAULT_SCENARIO, Gender, Hunter, Simulation
+
+MAGIC = b"ZOOCKPT1"
+FORMAT_VERSION = 1
+RNG_STATE_WORDS = 625
+COLUMNS = (("ids", "q"), ("xs", "i"), ("ys", "i"), ("species", "B"), ("genders", "B"))
+
+
+def _align(size: int) -> int:
+    return (size + 7) // 8 * 8
+
+
+def _little_endian(column, typecode: str) -> bytes:
+    """`array` veya NumPy dizisi gibi bir tampon nesnesinin baytlarını little-endian olarak döndürür."""
+    if sys.byteorder == "big" and array(typecode).itemsize > 1:
+        column = array(typecode, memoryview(column).cast("B").cast(typecode))
+        column.byteswap()
+    return memoryview(column).tobytes()
+
+
+def save_checkpoint(simulation: Simulation, path: str):
+    """Simülasyonun tüm durumunu `path` dosyasına yazar."""
+    columns = simulation.export_entities()
+    version, rng_state, gauss_next = simulation.rng.getstate()
+    hunter = simulation.hunter
+    metadata = {
+        "version": FORMAT_VERSION,
+        "engine": simulation.ENGINE,
+        "board_size": simulation.board_size,
+        "tick": simulation.tick,
+        "total_movement": simulation.total_movement,
+        "max_movement": simulation.MAX_MOVEMENT,
+        "id_counter": simulation.id_counter,
+        # Örnek üzerinde değiştirilmiş olabilecek ayarlar (ör. `ensemble.run_single` veya `service.py` tarafından).
+        "reproduction_distance": simulation.REPRODUCTION_DISTANCE,
+        "num_animals": {species.value: count for species, count in simulation.NUM_ANIMALS.items()},
+        "animals_to_create": [[species.value, count, getattr(gender, "value", gender)]
+                              for species, count, gender in simulation.animals_to_create],
+        "hunted_counts": {species.value: count for species, count in simulation.hunted_counts.items()},
+        "born_counts": {species.value: count for species, count in simulation.born_counts.items()},
+        "kill_counts": {species.value: count for species, count in simulation.kill_counts.items()},
+        "hunter": {"id": hunter.id, "x": hunter.x, "y": hunter.y, "hunt_distance": hunter.hunt_distance},
+        "rng": {"version": version, "gauss_next": gauss_next},
+        "engine_state": simulation.export_engine_state(),
+        "count": len(columns[0]),
+    }
+    if simulation.scenario is not DEFAULT_SCENARIO:
+        metadata["scenario"] = simulation.scenario.to_dict()
+    encoded = json.dumps(metadata).encode("utf-8")
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(len(encoded).to_bytes(4, "little") + bytes(4))
+        file.write(encoded + bytes(_align(len(encoded)) - len(encoded)))
+        state = _little_endian(array("I", rng_state), "I")
+        file.write(state + bytes(_align(len(state)) - len(state)))
+        for column, (_, typecode) in zip(columns, COLUMNS):
+            data = _little_endian(column, typecode)
+            file.write(data + bytes(_align(len(data)) - len(data)))
+
+
+def load_checkpoint(path: str, event_sink: Optional[EventSink] = None) -> Simulation:
+    """`save_checkpoint` ile yazılmış dosyadan simülasyonu yeniden oluşturur."""
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if mapped[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a simulation checkpoint")
+        length = int.from_bytes(mapped[8:12], "little")
+        metadata = json.loads(mapped[16:16 + length].decode("utf-8"))
+        if metadata["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {metadata['version']} in {path}")
+        offset = 16 + _align(length)
+
+        scenario = Scenario.from_dict(metadata["scenario"]) if "scenario" in metadata else None
+        simulation = Simulation(board_size=metadata["board_size"], event_sink=event_sink, engine=metadata["engine"], seed=0,
+                                scenario=scenario)
+        by_name = {species.value: species for species in simulation.scenario.members}
+        # Izgara kova boyutu üreme mesafesine bağlı olduğundan ayarlar hayvanlar aktarılmadan önce uygulanır.
+        if metadata.get("reproduction_distance", Simulation.REPRODUCTION_DISTANCE) != Simulation.REPRODUCTION_DISTANCE:
+            simulation.REPRODUCTION_DISTANCE = metadata["reproduction_distance"]
+        if "num_animals" in metadata:
+            simulation.NUM_ANIMALS = {by_name[name]: count for name, count in metadata["num_animals"].items()}
+        if "animals_to_create" in metadata:
+            simulation.animals_to_create = [(by_name[name], count, Gender(gender))
+                                            for name, count, gender in metadata["animals_to_create"]]
+        with memoryview(mapped) as view:
+            state = view[offset:offset + 4 * RNG_STATE_WORDS]
+            words = array("I", state.tobytes()) if sys.byteorder == "big" else array("I", state.cast("I"))
+            state.release()
+            if sys.byteorder == "big":
+                words.byteswap()
+            simulation.rng.setstate((metadata["rng"]["version"], tuple(words), metadata["rng"]["gauss_next"]))
+            offset += _align(4 * RNG_STATE_WORDS)
+
+            count = metadata["count"]
+            columns = []
+            for _, typecode in COLUMNS:
+                size = count * array(typecode).itemsize
+                column = view[offset:offset + size].cast(typecode)
+                if sys.byteorder == "big" and column.itemsize > 1:
+                    swapped = array(typecode, column)
+                    swapped.byteswap()
+                    column.release()
+                    column = memoryview(swapped)
+                columns.append(column)
+                offset += _align(size)
+            hunter_state = metadata["hunter"]
+            simulation.hunter = Hunter(hunter_state["x"], hunter_state["y"], simulation.board_size, hunter_state["hunt_distance"],
+                                       simulation.scenario.hunter)
+            simulation.hunter.id = hunter_state["id"]
+            simulation.import_entities(*columns)
+            for column in columns:
+                column.release()
+
+    simulation.tick = metadata["tick"]
+    simulation.total_movement = metadata["total_movement"]
+    if metadata["max_movement"] != Simulation.MAX_MOVEMENT:
+        simulation.MAX_MOVEMENT = metadata["max_movement"]
+    simulation.hunted_counts = {by_name[name]: count for name, count in metadata["hunted_counts"].items()}
+    simulation.born_counts = {by_name[name]: count for name, count in metadata["born_counts"].items()}
+    simulation.kill_counts = {by_name[name]: count for name, count in metadata.get("kill_counts", {}).items()}
+    simulation.import_engine_state(metadata["engine_state"])
+    simulation.id_counter = metadata["id_counter"]
+    return simulation
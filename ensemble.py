@@ -0,0 +1,150 @@
+"""
+Aynı senaryonun çok sayıda bağımsız çalıştırmasını (Monte Carlo topluluğu) süreç havuzunda yürütür ve tür bazındaki
+initial/final/born/hunted sayılarını ortalama, varyans ve yüzdeliklerle özetler.
+
+Her çalıştırma kendi tohumuyla kendi `random.Random` nesnesini kullanır; bu yüzden bir çalıştırmanın sonucu yalnızca
+tohumuna bağlıdır ve hangi süreçte, hangi sırayla çalıştığından etkilenmez.
+
+Komut satırından kullanım:
+
+    python ensemble.py --runs 200 --seed 0 --board-size 100
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from events import BufferedEventSink, NullEventSink
+from simulation import Gender, Simulation, Species
+
+METRICS = ("initial", "final", "born", "hunted")
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+class RunConfig(NamedTuple):
+    seed: int
+    board_size: int = 100
+    max_movement: Optional[int] = None
+    engine: str = "object"
+    output_file: Optional[str] = None
+    # (tür adı, sayı, cinsiyet adı) üçlüleri; verilmezse simülasyonun varsayılan başlangıç nüfusu kullanılır.
+    animals_to_create: Optional[Tuple[Tuple[str, int, str], ...]] = None
+    reproduction_distance: Optional[int] = None
+
+
+class RunResult(NamedTuple):
+    seed: int
+    counts: Dict[str, Dict[str, int]]  # tür adı -> {"initial", "final", "born", "hunted"}
+
+
+def run_single(config: RunConfig) -> RunResult:
+    """
+    Tek bir simülasyonu verilen tohumla çalıştırır. `output_file` verilirse olaylar bu dosyaya yazılır, verilmezse
+    olay kaydı kapatılır. ID'ler simülasyonun kendi sayacından ayrıldığı için aynı tohum her süreçte aynı çıktıyı üretir.
+    """
+    sink = BufferedEventSink(config.output_file) if config.output_file else NullEventSink()
+    simulation = Simulation(board_size=config.board_size, event_sink=sink, engine=config.engine, seed=config.seed)
+    if config.max_movement is not None:
+        simulation.MAX_MOVEMENT = config.max_movement
+    if config.reproduction_distance is not None:
+        simulation.REPRODUCTION_DISTANCE = config.reproduction_distance
+    if config.animals_to_create is not None:
+        animals = [(Species(species), count, Gender(gender)) for species, count, gender in config.animals_to_create]
+        simulation.animals_to_create = animals
+        simulation.NUM_ANIMALS = {species: sum(count for name, count, _ in animals if name is species)
+                                  for species in Simulation.NUM_ANIMALS}
+    simulation.run(report=False)
+    counts = {species.value: values for species, values in simulation.results().items()}
+    return RunResult(config.seed, counts)
+
+
+def quantile(sorted_values: Sequence[float], q: float) -> float:
+    """Sıralı değerler için doğrusal ara değerlemeli yüzdelik."""
+    if not sorted_values:
+        return float("nan")
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def aggregate(results: Sequence[RunResult]) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Çalıştırma sonuçlarını tür ve ölçü bazında ortalama, varyans, en küçük/en büyük ve yüzdeliklerle özetler."""
+    summary: Dict[str, Dict[str, Dict[str, float]]] = {}
+    species_names = [species.value for species in Simulation.NUM_ANIMALS]
+    for name in species_names:
+        summary[name] = {}
+        for metric in METRICS:
+            values = sorted(result.counts[name][metric] for result in results)
+            stats = {
+                "mean": statistics.fmean(values) if values else float("nan"),
+                "variance": statistics.variance(values) if len(values) > 1 else 0.0,
+                "min": values[0] if values else float("nan"),
+                "max": values[-1] if values else float("nan"),
+            }
+            for q in QUANTILES:
+                stats[f"p{int(q * 100)}"] = quantile(values, q)
+            summary[name][metric] = stats
+    return summary
+
+
+def run_ensemble(runs: int, base_seed: int = 0, board_size: int = 100, max_movement: Optional[int] = None,
+                 engine: str = "object", processes: Optional[int] = None,
+                 output_dir: Optional[str] = None) -> List[RunResult]:
+    """
+    `runs` adet bağımsız simülasyonu `base_seed`, `base_seed + 1`, ... tohumlarıyla çalıştırır ve sonuçları tohum
+    sırasıyla döndürür. `processes` verilmezse tüm çekirdekler kullanılır; 1 ise çalıştırmalar bu süreçte yürütülür.
+    `output_dir` verilirse her çalıştırma olaylarını `run_<tohum>.txt` dosyasına yazar.
+    """
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    configs = [
+        RunConfig(seed, board_size, max_movement, engine,
+                  os.path.join(output_dir, f"run_{seed}.txt") if output_dir is not None else None)
+        for seed in range(base_seed, base_seed + runs)
+    ]
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or runs <= 1:
+        return [run_single(config) for config in configs]
+    chunksize = max(1, runs // (processes * 4))
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(run_single, configs, chunksize=chunksize))
+
+
+def format_summary(summary: Dict[str, Dict[str, Dict[str, float]]], runs: int) -> str:
+    lines = [f"Ensemble Results ({runs} runs):", ""]
+    lines.append("{:<10} {:<8} {:>10} {:>12} {:>8} {:>8} {:>8}".format("Species", "Metric", "Mean", "Variance", "P5", "P50", "P95"))
+    lines.append("-" * 70)
+    for species, metrics in summary.items():
+        for metric, stats in metrics.items():
+            lines.append(f"{species:<10} {metric:<8} {stats['mean']:>10.2f} {stats['variance']:>12.2f} "
+                         f"{stats['p5']:>8.1f} {stats['p50']:>8.1f} {stats['p95']:>8.1f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Run many independent simulations and aggregate their results.")
+    parser.add_argument("--runs", type=int, default=100, help="number of independent runs")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first run; run i uses seed + i")
+    parser.add_argument("--board-size", type=int, default=100)
+    parser.add_argument("--max-movement", type=int, default=None, help="override Simulation.MAX_MOVEMENT")
+    parser.add_argument("--engine", choices=Simulation.ENGINES, default="object")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--output-dir", default=None, help="write each run's event log to this directory")
+    parser.add_argument("--json", default=None, help="write per-run counts and the summary to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run_ensemble(args.runs, args.seed, args.board_size, args.max_movement, args.engine,
+                           args.processes, args.output_dir)
+    summary = aggregate(results)
+    print(format_summary(summary, len(results)))
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"runs": [result._asdict() for result in results], "summary": summary}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
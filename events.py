@@ -0,0 +1,324 @@
+"""
+Simülasyon olaylarının (hareket, doğum, avlanma) yapılandırılmış kayıtları ve bu kayıtları dosyaya yazan olay yazıcıları.
+
+Simülasyon her olay için bir `Event` üretir ve bunu kendisine verilen yazıcıya (`EventSink`) iletir. `BufferedEventSink`
+olayları bellekte sınırlı bir tamponda biriktirir ve ayrı bir iş parçacığında büyük gruplar halinde diske yazar.
+"""
+from __future__ import annotations
+import atexit
+import json
+import queue
+import struct
+import threading
+from enum import IntEnum
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class EventKind(IntEnum):
+    MOVE = 0
+    BIRTH = 1
+    HUNT = 2
+
+
+class Event(NamedTuple):
+    """
+    Tek bir simülasyon olayı. `ids`, `species` ve `positions` olay türüne göre şu sırayla doldurulur:
+    MOVE: (varlık,) ve (ilk konum, son konum); BIRTH: (yavru, anne, baba); HUNT: (avcı, av).
+    """
+    tick: int
+    kind: EventKind
+    ids: Tuple[int, ...]
+    species: Tuple[Any, ...]
+    positions: Tuple[Tuple[int, int], ...]
+    movement: int = 0
+    remaining: int = 0
+
+
+class Move(NamedTuple):
+    id: int
+    x: int
+    y: int
+
+
+class Birth(NamedTuple):
+    id: int
+    species: Any
+    x: int
+    y: int
+    mother: int
+    father: int
+
+
+class Hunt(NamedTuple):
+    predator: int
+    prey: int
+    prey_species: Any
+
+
+class TickDelta(NamedTuple):
+    """
+    Bir turun özeti: konumu değişen varlıkların yeni konumları, doğumlar, avlanmalar ve tur sonundaki tür bazında nüfus.
+    Önceki turun durumuna uygulandığında bu turun durumunu verir.
+    """
+    tick: int
+    moves: List[Move]
+    births: List[Birth]
+    hunts: List[Hunt]
+    population: Dict[Any, int]
+
+
+def format_text(event: Event) -> str:
+    """Olayı, simülasyonun `simulation_output.txt` dosyasında kullandığı metin biçimine çevirir."""
+    if event.kind == EventKind.MOVE:
+        (initial_x, initial_y), (x, y) = event.positions
+        return (f"Entity ID: {event.ids[0]}, Species: {event.species[0]}, Initial Position: ({initial_x}, {initial_y}), "
+                f"Final Position: ({x}, {y}), Movement Allowed: {event.movement}, Remaining Movement: {event.remaining}")
+    parts = [f"{species.value} (ID: {entity_id}, Location: ({x}, {y}))"
+             for entity_id, species, (x, y) in zip(event.ids, event.species, event.positions)]
+    if event.kind == EventKind.BIRTH:
+        return "-------BORNING-------\n" f"{parts[0]} born from {parts[1]} and {parts[2]}"
+    return "-------HUNTING-------\n" f"{parts[0]} has hunted {parts[1]}"
+
+
+def format_json(event: Event) -> str:
+    """Olayı tek satırlık bir JSON nesnesine çevirir (JSONL biçimi)."""
+    record = {
+        "tick": event.tick,
+        "kind": event.kind.name.lower(),
+        "ids": list(event.ids),
+        "species": [species.value for species in event.species],
+        "positions": [list(position) for position in event.positions],
+    }
+    if event.kind == EventKind.MOVE:
+        record["movement"] = event.movement
+        record["remaining"] = event.remaining
+    return json.dumps(record, separators=(",", ":"))
+
+
+# Sabit genişlikli ikili kayıt: tick, tür, 3 ID (int64; kontrol noktasındaki ID sütunuyla aynı genişlik), 3 tür kodu
+# (-1 boş), 3 konum (x, y), hareket ve kalan hareket.
+BINARY_RECORD = struct.Struct("<IB3q3b6i2i")
+_species_codes: Dict[Any, int] = {}
+
+
+def species_code(species: Any) -> int:
+    """Tür üyesinin, ait olduğu Enum içindeki sırasını döndürür (ikili biçimde tür kodu olarak kullanılır)."""
+    code = _species_codes.get(species)
+    if code is None:
+        for index, member in enumerate(type(species)):
+            _species_codes[member] = index
+        code = _species_codes[species]
+    return code
+
+
+def encode_binary(event: Event) -> bytes:
+    ids = event.ids + (0,) * (3 - len(event.ids))
+    codes = tuple(species_code(species) for species in event.species) + (-1,) * (3 - len(event.species))
+    coordinates = [coordinate for position in event.positions for coordinate in position]
+    coordinates += [0] * (6 - len(coordinates))
+    return BINARY_RECORD.pack(event.tick, event.kind, *ids, *codes, *coordinates, event.movement, event.remaining)
+
+
+def decode_binary(data: bytes, species_enum: Optional[Iterable[Any]] = None) -> Iterator[Event]:
+    """
+    `encode_binary` ile yazılmış ardışık kayıtları `Event` nesnelerine geri çevirir. `species_enum` verilmezse
+    simülasyonun `Species` Enum'u kullanılır.
+    """
+    if species_enum is None:
+        from simulation import Species
+        species_enum = Species
+    members = list(species_enum)
+    for record in BINARY_RECORD.iter_unpack(data):
+        tick, kind = record[0], EventKind(record[1])
+        count = 1 if kind == EventKind.MOVE else (3 if kind == EventKind.BIRTH else 2)
+        position_count = 2 if kind == EventKind.MOVE else count
+        species = tuple(members[code] for code in record[5:5 + count])
+        positions = tuple((record[8 + 2 * i], record[9 + 2 * i]) for i in range(position_count))
+        yield Event(tick, kind, tuple(record[2:2 + count]), species, positions, record[14], record[15])
+
+
+def read_binary_events(path: str, species_enum: Optional[Iterable[Any]] = None) -> Iterator[Event]:
+    """İkili biçimde yazılmış bir olay dosyasını okur."""
+    with open(path, "rb") as file:
+        data = file.read()
+    return decode_binary(data, species_enum)
+
+
+FORMATS: Dict[str, Callable[[List[Event]], bytes]] = {
+    "text": lambda events: "".join(format_text(event) + "\n" for event in events).encode("utf-8"),
+    "jsonl": lambda events: "".join(format_json(event) + "\n" for event in events).encode("utf-8"),
+    "binary": lambda events: b"".join(encode_binary(event) for event in events),
+}
+
+
+class EventSink:
+    """Olay yazıcılarının temel sınıfı. `enabled` False ise simülasyon olay kaydı bile oluşturmaz."""
+    enabled = True
+
+    def emit(self, event: Event):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class NullEventSink(EventSink):
+    """Hiçbir şey yazmayan yazıcı; simülasyon bu yazıcıyla çalışırken olay oluşturma maliyeti ödenmez."""
+    enabled = False
+
+    def emit(self, event: Event):
+        pass
+
+
+class ListEventSink(EventSink):
+    """Olayları bellekteki bir listede biriktirir; testler ve küçük analizler için."""
+
+    def __init__(self):
+        self.events: List[Event] = []
+
+    def emit(self, event: Event):
+        self.events.append(event)
+
+
+class DeltaSink(EventSink):
+    """
+    Olayları tur deltası (`TickDelta`) olarak toplar ve `inner` verilmişse ve açıksa olayları ona da iletir.
+    `Simulation.iter_ticks` tarafından kullanılır; her tur sonunda `take` ile o turun deltası alınır ve liste sıfırlanır.
+    """
+
+    def __init__(self, inner: Optional[EventSink] = None):
+        self.inner = inner
+        self.forward = inner is not None and inner.enabled
+        self.moves: List[Move] = []
+        self.births: List[Birth] = []
+        self.hunts: List[Hunt] = []
+
+    def emit(self, event: Event):
+        kind = event.kind
+        if kind == EventKind.MOVE:
+            initial, (x, y) = event.positions
+            if initial != (x, y):
+                self.moves.append(Move(event.ids[0], x, y))
+        elif kind == EventKind.BIRTH:
+            x, y = event.positions[0]
+            self.births.append(Birth(event.ids[0], event.species[0], x, y, event.ids[1], event.ids[2]))
+        else:
+            self.hunts.append(Hunt(event.ids[0], event.ids[1], event.species[1]))
+        if self.forward:
+            self.inner.emit(event)
+
+    def take(self, tick: int, population: Dict[Any, int]) -> TickDelta:
+        delta = TickDelta(tick, self.moves, self.births, self.hunts, population)
+        self.moves, self.births, self.hunts = [], [], []
+        return delta
+
+    def flush(self):
+        if self.inner is not None:
+            self.inner.flush()
+
+    def close(self):
+        if self.inner is not None:
+            self.inner.close()
+
+
+class BufferedEventSink(EventSink):
+    """
+    Olayları `batch_size` büyüklüğünde gruplar halinde sınırlı bir kuyruğa koyar; arka plandaki yazıcı iş parçacığı bu
+    grupları seçilen biçimde (`text`, `jsonl` veya `binary`) dosyaya yazar. Kuyrukta en fazla `capacity` olay bekleyebilir;
+    kuyruk doluysa `emit` yazıcı yetişene kadar bekler (backpressure). `close` bekleyen tüm olayları yazıp dosyayı kapatır;
+    kapatılmamış yazıcılar yorumlayıcı kapanırken `atexit` ile kapatılır.
+    """
+
+    _STOP = None
+
+    def __init__(self, path: str, format: str = "text", capacity: int = 65536, batch_size: int = 4096):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown event log format: {format!r} (expected one of {sorted(FORMATS)})")
+        self.path = path
+        self.format = format
+        self.batch_size = max(1, batch_size)
+        self._encode = FORMATS[format]
+        self._pending: List[Event] = []
+        self._queue: "queue.Queue[Optional[List[Event]]]" = queue.Queue(maxsize=max(1, capacity // self.batch_size))
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._file: BinaryIO = open(path, "wb")
+        self._thread = threading.Thread(target=self._write_loop, name="event-log-writer", daemon=True)
+        self._thread.start()
+        # Yazıcı iş parçacığı daemon olduğundan `close` çağrılmadan çıkılırsa kuyruktaki olaylar kaybolmasın.
+        atexit.register(self.close)
+
+    def emit(self, event: Event):
+        pending = self._pending
+        pending.append(event)
+        if len(pending) >= self.batch_size:
+            self._submit()
+
+    def _submit(self):
+        if self._error is not None:
+            raise RuntimeError(f"Event log writer for {self.path} failed") from self._error
+        if self._pending:
+            self._queue.put(self._pending)
+            self._pending = []
+
+    def _write_loop(self):
+        while True:
+            batch = self._queue.get()
+            try:
+                if batch is self._STOP:
+                    return
+                # Kuyrukta bekleyen diğer grupları da alıp tek seferde yaz.
+                batches = [batch]
+                stop = False
+                while True:
+                    try:
+                        extra = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if extra is self._STOP:
+                        stop = True
+                        self._queue.task_done()
+                        break
+                    batches.append(extra)
+                    self._queue.task_done()
+                if self._error is None:
+                    self._file.write(b"".join(self._encode(events) for events in batches))
+                if stop:
+                    return
+            except BaseException as error:  # yazıcı hatası bir sonraki emit/flush/close çağrısında bildirilir
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Bekleyen tüm olayların dosyaya yazılmasını bekler."""
+        if self._closed:
+            return
+        self._submit()
+        self._queue.join()
+        self._file.flush()
+        if self._error is not None:
+            raise RuntimeError(f"Event log writer for {self.path} failed") from self._error
+
+    def close(self):
+        if self._closed:
+            return
+        atexit.unregister(self.close)
+        try:
+            self._submit()
+        finally:
+            self._closed = True
+            self._queue.put(self._STOP)
+            self._thread.join()
+            self._file.close()
+        if self._error is not None:
+            raise RuntimeError(f"Event log writer for {self.path} failed") from self._error
@@ -0,0 +1,275 @@
+"""
+Tur bazında tahta kareleri (frame) yayınlayan, belleğe eşlenmiş halka tampon.
+
+`Simulation(frames=FrameRing("kareler.bin", board_size))` ile açılır. Her tur sonunda (ve yerleştirmeden sonra tur 0
+için) tahtanın `board_size × board_size` baytlık bir karesi ve avcının konumu halkadaki sıradaki yuvaya yazılır. Hücre
+değeri boş hücre için 0, aksi halde `Species` sırasındaki tür kodunun bir fazlasıdır; avcı tahtaya çizilmez, konumu
+yuva başlığında tutulur. Dosya `/dev/shm` altında açılırsa paylaşılan bellekte durur.
+
+Kareler `animals` listesinden yeniden kurulmaz: halka, tur boyunca simülasyonun olay yazıcısının önüne geçer ve
+hareket, doğum ve avlanma olaylarını bellekteki çalışma tahtasına uygular. Her yuva, en son yazıldığı turdan beri
+değişen hücreleri tutar ve yayınlanırken yalnızca bu hücreler kopyalanır.
+
+Dosya düzeni: başlık (sihirli sayı, tahta boyutu, yuva sayısı, yayınlanan kare sayısı, başlık uzunluğu ve JSON olarak tür
+adları; uzunluk 8'in katına yuvarlanır) ve ardından `slots` adet yuva; her yuva `SLOT_HEADER_SIZE` baytlık başlık
+(sıra numarası, tur, avcı x, avcı y) ve kare baytlarından oluşur. Yırtık okumaları önlemek için yuvalar sıra kilidi
+(seqlock) ile yazılır: yazıcı yazmadan önce sıra numarasını tek sayıya, yazdıktan sonra bir sonraki çift sayıya çıkarır.
+Okuyucu (`FrameReader`) sıra numarası okumadan önce ve sonra aynı çift sayıysa kareyi tutarlı kabul eder.
+
+Başlık uzunluğu tür adlarına göre belirlenir; senaryonun adları sığmıyorsa başlık ilk kareden önce (`reset`) büyütülür.
+İlk kare yayınlandıktan sonra dosya düzeni değişmez.
+"""
+from __future__ import annotations
+import json
+import mmap
+import struct
+from typing import TYPE_CHECKING, Any, List, NamedTuple, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy varsa kareler kopyalanmadan (H, W) boyutlu uint8 dizisi olarak okunur
+    np = None
+
+from events import Event, EventKind, EventSink
+
+if TYPE_CHECKING:
+    from simulation import Hunter, Simulation
+
+FRAME_MAGIC = b"ZOOFRM2\x00"
+# Sihirli sayı, tahta boyutu, yuva sayısı, yayınlanan kare sayısı, başlık uzunluğu; ardından tür adları gelir.
+HEADER = struct.Struct("<8sIIQI")
+SLOT_HEADER = struct.Struct("<Qqii")
+SLOT_HEADER_SIZE = 32
+# Başlıktaki yayınlanan kare sayısının konumu.
+PUBLISHED_OFFSET = 16
+
+
+def _slot_size(board_size: int) -> int:
+    return SLOT_HEADER_SIZE + (board_size * board_size + 7) // 8 * 8
+
+
+def _header_size(names: bytes) -> int:
+    return (HEADER.size + len(names) + 7) // 8 * 8
+
+
+class Frame(NamedTuple):
+    """Okunan bir kare. `cells[y][x]` hücredeki tür kodu (0 boş); `sequence` yuvanın okunduğu andaki sıra numarası."""
+    number: int
+    tick: int
+    hunter: Tuple[int, int]
+    cells: Any
+    slot: int
+    sequence: int
+
+
+class FrameRing(EventSink):
+    """
+    Karelerin yazıcısı. Simülasyon her tur `inner` olarak asıl olay yazıcısını bağlar ve olayları bu nesneye gönderir;
+    olaylar çalışma tahtasına uygulanır ve `inner` açıksa ona iletilir.
+    """
+
+    def __init__(self, path: str, board_size: int, slots: int = 4):
+        if slots < 2:
+            raise ValueError("FrameRing needs at least two slots")
+        self.path = path
+        self.board_size = board_size
+        self.slots = slots
+        self.slot_size = _slot_size(board_size)
+        self.inner: Optional[EventSink] = None
+        self.started = False
+        self.published = 0
+        self._board = bytearray(board_size * board_size)
+        # Yuva -> o yuvanın son yazılışından beri değişen hücreler; None tüm karenin kopyalanması gerektiği anlamına gelir.
+        self._dirty: List[Optional[Set[int]]] = [None] * slots
+        self._changed: Set[int] = set()
+        self._moves: List[Tuple[int, int, int]] = []
+        from simulation import Species
+        self._codes = {species: code + 1 for code, species in enumerate(Species)}
+        self._hunter_species = Species.HUNTER
+        self._map: Optional[mmap.mmap] = None
+        self.header_size = 0
+        self._write_header(list(Species))
+
+    def _write_header(self, members: List[Any]):
+        """
+        Başlığı tür adlarıyla yazar. Adlar başlığa sığmıyorsa başlık ve dosya büyütülür; bu yalnızca ilk kareden önce
+        yapılır, yuvalar o zamana kadar boş olduğundan kaydırılacak veri yoktur. Dosya hiç küçülmez, böylece önceden
+        açılmış okuyucuların eşlemesi dosyanın dışına taşmaz.
+        """
+        names = json.dumps([species.value for species in members]).encode()
+        header_size = max(_header_size(names), self.header_size)
+        if header_size != self.header_size:
+            if self.published:
+                raise ValueError("Frame header cannot grow after frames were published")
+            if self._map is not None:
+                self._map.close()
+            with open(self.path, "w+b" if self._map is None else "r+b") as file:
+                file.truncate(header_size + self.slots * self.slot_size)
+                self._map = mmap.mmap(file.fileno(), 0)
+            self.header_size = header_size
+        HEADER.pack_into(self._map, 0, FRAME_MAGIC, self.board_size, self.slots, self.published, header_size)
+        self._map[HEADER.size:header_size] = names + bytes(header_size - HEADER.size - len(names))
+
+    def reset(self, simulation: 'Simulation'):
+        """
+        Çalışma tahtasını simülasyonun o anki hayvanlarından kurar; yalnızca ilk kareden önce çağrılır. Tür kodları ve
+        başlıktaki tür adları simülasyonun senaryosundan alınır.
+        """
+        species = simulation.scenario.members
+        self._write_header(species)
+        board, size = self._board, self.board_size
+        board[:] = bytes(len(board))
+        self._codes = {member: code + 1 for code, member in enumerate(species)}
+        self._hunter_species = simulation.scenario.hunter
+        _, xs, ys, species_codes, _ = simulation.export_entities()
+        for x, y, code in zip(xs, ys, species_codes):
+            board[y * size + x] = self._codes[species[code]]
+        self._dirty = [None] * self.slots
+        self._changed = set()
+        self._moves = []
+        self.started = True
+
+    def emit(self, event: Event):
+        kind = event.kind
+        if kind == EventKind.MOVE:
+            (x0, y0), (x, y) = event.positions
+            if (x0, y0) != (x, y) and event.species[0] is not self._hunter_species:
+                size = self.board_size
+                self._moves.append((y0 * size + x0, y * size + x, self._codes[event.species[0]]))
+        else:
+            self._apply_moves()
+            if kind == EventKind.BIRTH:
+                x, y = event.positions[0]
+                self._set(y * self.board_size + x, self._codes[event.species[0]])
+            else:
+                x, y = event.positions[1]
+                self._set(y * self.board_size + x, 0)
+        inner = self.inner
+        if inner is not None and inner.enabled:
+            inner.emit(event)
+
+    def _set(self, cell: int, value: int):
+        self._board[cell] = value
+        self._changed.add(cell)
+
+    def _apply_moves(self):
+        # Bir turun hareketleri hücrelerin bir permütasyonudur; önce tüm eski hücreler boşaltılıp sonra yeni hücreler
+        # doldurulduğunda sonuç olayların sırasından bağımsızdır.
+        if not self._moves:
+            return
+        for old, _, _ in self._moves:
+            self._set(old, 0)
+        for _, new, code in self._moves:
+            self._set(new, code)
+        self._moves = []
+
+    def publish(self, tick: int, hunter: 'Hunter'):
+        """Çalışma tahtasını halkadaki sıradaki yuvaya yazar ve yayınlanan kare sayısını artırır."""
+        self._apply_moves()
+        changed, self._changed = self._changed, set()
+        full = len(self._board) // 8
+        for slot, dirty in enumerate(self._dirty):
+            if dirty is not None:
+                dirty |= changed
+                if len(dirty) > full:
+                    self._dirty[slot] = None
+        slot = self.published % self.slots
+        base = self.header_size + slot * self.slot_size
+        mapped, board = self._map, self._board
+        sequence = struct.unpack_from("<Q", mapped, base)[0]
+        struct.pack_into("<Q", mapped, base, sequence + 1)
+        data = base + SLOT_HEADER_SIZE
+        dirty = self._dirty[slot]
+        if dirty is None:
+            mapped[data:data + len(board)] = board
+        else:
+            for cell in dirty:
+                mapped[data + cell] = board[cell]
+        SLOT_HEADER.pack_into(mapped, base, sequence + 1, tick, hunter.x, hunter.y)
+        struct.pack_into("<Q", mapped, base, sequence + 2)
+        self._dirty[slot] = set()
+        self.published += 1
+        struct.pack_into("<Q", mapped, PUBLISHED_OFFSET, self.published)
+
+    def flush(self):
+        if self.inner is not None:
+            self.inner.flush()
+
+    def close(self):
+        if not self._map.closed:
+            self._map.flush()
+            self._map.close()
+
+
+class FrameReader:
+    """
+    `FrameRing` dosyasını salt okunur olarak belleğe eşler. Yazıcıyla aynı süreçte olması gerekmez; kareler kopyalanmadan
+    veya seqlock korumasıyla kopyalanarak okunur.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map: Optional[mmap.mmap] = None
+        self._load()
+
+    def _load(self):
+        """Dosyayı eşler ve başlığı okur. İlk kareden önce açılmışsa yazıcı başlığı büyütmüş olabilir."""
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.board_size, self.slots, published, self.header_size = HEADER.unpack_from(self._map, 0)
+        if magic != FRAME_MAGIC:
+            raise ValueError(f"{self.path} is not a frame ring")
+        self._final = published > 0
+        self.slot_size = _slot_size(self.board_size)
+        names = bytes(self._map[HEADER.size:self.header_size]).rstrip(b"\x00")
+        self.species: List[str] = json.loads(names)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def published(self) -> int:
+        return struct.unpack_from("<Q", self._map, PUBLISHED_OFFSET)[0]
+
+    def _cells(self, base: int, copy: bool):
+        size = self.board_size
+        if np is not None:
+            cells = np.frombuffer(self._map, np.uint8, size * size, base + SLOT_HEADER_SIZE).reshape(size, size)
+            return cells.copy() if copy else cells
+        view = memoryview(self._map)[base + SLOT_HEADER_SIZE:base + SLOT_HEADER_SIZE + size * size]
+        return (memoryview(bytes(view)) if copy else view).cast("B", (size, size))
+
+    def latest(self, copy: bool = True, attempts: int = 1000) -> Optional[Frame]:
+        """
+        En son yayınlanan kareyi döndürür; henüz kare yoksa None. `copy` True ise kare, sıra numarası okuma boyunca
+        değişmediği doğrulanarak kopyalanır. `copy` False ise kare kopyalanmadan dosyayı gösterir; yazıcı aynı yuvaya
+        ancak `slots - 1` kare sonra yeniden yazar, görüntü kullanıldıktan sonra `is_current` ile doğrulanmalıdır.
+        """
+        for _ in range(attempts):
+            published = self.published
+            if published == 0:
+                return None
+            if not self._final:
+                self._load()
+            slot = (published - 1) % self.slots
+            base = self.header_size + slot * self.slot_size
+            sequence, tick, hunter_x, hunter_y = SLOT_HEADER.unpack_from(self._map, base)
+            if sequence % 2:
+                continue
+            cells = self._cells(base, copy)
+            if struct.unpack_from("<Q", self._map, base)[0] == sequence:
+                return Frame(published - 1, tick, (hunter_x, hunter_y), cells, slot, sequence)
+        raise RuntimeError(f"Could not read a stable frame from {self.path}")
+
+    def is_current(self, frame: Frame) -> bool:
+        """Karenin yuvası okunduğundan beri yeniden yazılmadıysa True döner."""
+        return struct.unpack_from("<Q", self._map, self.header_size + frame.slot * self.slot_size)[0] == frame.sequence
@@ -0,0 +1,278 @@
+"""
+Sıkıştırılmış, indeksli olay kaydı (trace).
+
+`IndexedTraceSink` olayları `events.encode_binary` kayıtları olarak tamponlar ve her `block_events` olayda bir, tur
+sınırında keserek zlib ile sıkıştırılmış bir blok halinde dosyaya ekler; bir turun olayları hiçbir zaman iki bloğa
+bölünmez. Kapatılırken dosyanın yanına `<path>.idx` adlı bir JSON indeks yazılır:
+
+- `blocks`: her blok için [dosyadaki konum, sıkıştırılmış boyut, ilk tur, son tur, olay sayısı],
+- `entities`: varlık ID -> olaylarında geçtiği blokların numaraları,
+- `tags`: olay türü (`move`, `birth`, `hunt`) ve olaya katılan her tür için `<olay türü>.<Species değeri>` -> blok
+  numaraları.
+
+`IndexedTrace` bu indeksle yalnızca sorguyla ilgili blokları açar: bir varlığın tüm geçmişi, bir tur aralığındaki
+avlanmalar veya belirli bir türün katıldığı doğumlar dosyanın tamamı okunmadan bulunur. `convert_text_trace` eski
+`simulation_output.txt` metin kaydını bu biçime çevirir.
+
+    python indexed_trace.py convert simulation_output.txt trace.bin
+    python indexed_trace.py query trace.bin --kind hunt --start 5000 --stop 6000
+"""
+from __future__ import annotations
+import argparse
+import json
+import re
+import sys
+import zlib
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+
+from events import BINARY_RECORD, Event, EventKind, EventSink, decode_binary, encode_binary, format_text
+
+
+def index_path(path: str) -> str:
+    return path + ".idx"
+
+
+class IndexedTraceSink(EventSink):
+    """
+    Olayları tur sınırlarında kesilen zlib bloklarına yazar ve `close` sırasında blok indeksini kaydeder. `flush` yalnızca
+    tamamlanmış blokları diske indirir; açık bloğu kesmez, böylece bloklar tur hizalı kalır.
+    """
+
+    def __init__(self, path: str, block_events: int = 16384, level: int = 6):
+        self.path = path
+        self.block_events = max(1, block_events)
+        self.level = level
+        self.blocks: List[List[int]] = []
+        self.entities: Dict[int, List[int]] = {}
+        self.tags: Dict[str, List[int]] = {}
+        self._pending: List[Event] = []
+        self._closed = False
+        self._file = open(path, "wb")
+
+    def emit(self, event: Event):
+        pending = self._pending
+        if len(pending) >= self.block_events and event.tick != pending[-1].tick:
+            self._write_block()
+            pending = self._pending
+        pending.append(event)
+
+    def _mark(self, index: Dict[Any, List[int]], key: Any, block: int):
+        blocks = index.get(key)
+        if blocks is None:
+            index[key] = [block]
+        elif blocks[-1] != block:
+            blocks.append(block)
+
+    def _write_block(self):
+        events, block = self._pending, len(self.blocks)
+        data = zlib.compress(b"".join(encode_binary(event) for event in events), self.level)
+        offset = self._file.tell()
+        self._file.write(data)
+        self.blocks.append([offset, len(data), events[0].tick, events[-1].tick, len(events)])
+        for event in events:
+            kind = event.kind.name.lower()
+            self._mark(self.tags, kind, block)
+            for species in event.species:
+                self._mark(self.tags, f"{kind}.{species.value}", block)
+            for entity_id in event.ids:
+                self._mark(self.entities, entity_id, block)
+        self._pending = []
+
+    def flush(self):
+        if not self._closed:
+            self._file.flush()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._pending:
+                self._write_block()
+        finally:
+            self._file.close()
+        with open(index_path(self.path), "w") as file:
+            json.dump({"version": 1, "record_size": BINARY_RECORD.size, "blocks": self.blocks,
+                       "entities": {str(entity_id): blocks for entity_id, blocks in self.entities.items()},
+                       "tags": self.tags}, file, separators=(",", ":"))
+
+
+class IndexedTrace:
+    """`IndexedTraceSink` ile yazılmış bir kaydı indeksi üzerinden sorgular. Olaylar dosyadaki sırayla döner."""
+
+    def __init__(self, path: str, species_enum: Optional[Iterable[Any]] = None):
+        self.path = path
+        self.species_enum = species_enum
+        with open(index_path(path)) as file:
+            index = json.load(file)
+        if index.get("version") != 1 or index.get("record_size") != BINARY_RECORD.size:
+            raise ValueError(f"Unsupported trace index: {index_path(path)}")
+        self.blocks: List[List[int]] = index["blocks"]
+        self.entities: Dict[str, List[int]] = index["entities"]
+        self.tags: Dict[str, List[int]] = index["tags"]
+        self._first_ticks = [block[2] for block in self.blocks]
+        self._last_ticks = [block[3] for block in self.blocks]
+        self._file = open(path, "rb")
+        self.blocks_read = 0
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def read_block(self, block: int) -> List[Event]:
+        offset, size = self.blocks[block][:2]
+        self._file.seek(offset)
+        self.blocks_read += 1
+        return list(decode_binary(zlib.decompress(self._file.read(size)), self.species_enum))
+
+    def _tick_blocks(self, start: Optional[int], stop: Optional[int]) -> range:
+        first = 0 if start is None else bisect_left(self._last_ticks, start)
+        last = len(self.blocks) if stop is None else bisect_left(self._first_ticks, stop)
+        return range(first, max(first, last))
+
+    def events(self, kind: Optional[EventKind] = None, species: Any = None, entity: Optional[int] = None,
+               start: Optional[int] = None, stop: Optional[int] = None) -> Iterator[Event]:
+        """
+        Verilen koşulların hepsine uyan olayları döndürür: `kind` olay türü, `species` olaya (herhangi bir rolde) katılan
+        tür, `entity` olayda geçen varlık ID'si, [start, stop) tur aralığı. Yalnızca indekse göre bu koşullara uyan olay
+        içerebilecek bloklar okunur.
+        """
+        candidates = set(self._tick_blocks(start, stop))
+        if entity is not None:
+            candidates.intersection_update(self.entities.get(str(entity), ()))
+        if kind is not None or species is not None:
+            kinds = [EventKind(kind)] if kind is not None else list(EventKind)
+            tagged = set()
+            for event_kind in kinds:
+                tag = event_kind.name.lower() if species is None else f"{event_kind.name.lower()}.{species.value}"
+                tagged.update(self.tags.get(tag, ()))
+            candidates &= tagged
+        for block in sorted(candidates):
+            for event in self.read_block(block):
+                if start is not None and event.tick < start or stop is not None and event.tick >= stop:
+                    continue
+                if kind is not None and event.kind != kind:
+                    continue
+                if entity is not None and entity not in event.ids:
+                    continue
+                if species is not None and species not in event.species:
+                    continue
+                yield event
+
+    def entity_history(self, entity_id: int) -> List[Event]:
+        """Varlığın hareket ettiği, doğduğu, doğurduğu, avladığı veya avlandığı tüm olaylar."""
+        return list(self.events(entity=entity_id))
+
+    def ticks(self, start: int, stop: int) -> List[Event]:
+        """[start, stop) aralığındaki turların tüm olayları."""
+        return list(self.events(start=start, stop=stop))
+
+
+_MOVE_LINE = re.compile(r"Entity ID: (\d+), Species: Species\.(\w+), Initial Position: \((-?\d+), (-?\d+)\), "
+                        r"Final Position: \((-?\d+), (-?\d+)\), Movement Allowed: (-?\d+), Remaining Movement: (-?\d+)")
+_ENTITY = re.compile(r"(\w+) \(ID: (\d+), Location: \((-?\d+), (-?\d+)\)\)")
+_HEADERS = {"-------BORNING-------": EventKind.BIRTH, "-------HUNTING-------": EventKind.HUNT}
+
+
+def parse_text_events(lines: Iterable[str], species_enum: Optional[Iterable[Any]] = None) -> Iterator[Event]:
+    """
+    `events.format_text` biçimindeki eski metin kaydını `Event` nesnelerine çevirir. Metin kaydı tur numarası
+    içermediğinden turlar olay sırasından çıkarılır: her tur hareketler, doğumlar ve avlanmalar sırasıyla yazılır; bu
+    sıra geriye döndüğünde veya aynı varlık ikinci kez hareket ettiğinde yeni bir tur başlar. İlk tur 1'dir.
+    """
+    if species_enum is None:
+        from simulation import Species
+        species_enum = Species
+    by_name = {member.name: member for member in species_enum}
+    by_value = {member.value: member for member in species_enum}
+    tick, phase, moved = 1, EventKind.MOVE, set()
+    header = None
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip("\n")
+        if not line:
+            continue
+        if line in _HEADERS:
+            header = _HEADERS[line]
+            continue
+        if header is None:
+            match = _MOVE_LINE.fullmatch(line)
+            if match is None:
+                raise ValueError(f"Unrecognised trace line {number}: {line!r}")
+            kind = EventKind.MOVE
+            entity_id, name, x0, y0, x1, y1, movement, remaining = match.groups()
+            entity_id = int(entity_id)
+            event = Event(tick, kind, (entity_id,), (by_name[name],), ((int(x0), int(y0)), (int(x1), int(y1))),
+                          int(movement), int(remaining))
+        else:
+            kind, header = header, None
+            parts = _ENTITY.findall(line)
+            if len(parts) != (3 if kind == EventKind.BIRTH else 2):
+                raise ValueError(f"Unrecognised trace line {number}: {line!r}")
+            event = Event(tick, kind, tuple(int(part[1]) for part in parts), tuple(by_value[part[0]] for part in parts),
+                          tuple((int(part[2]), int(part[3])) for part in parts))
+        if kind < phase or kind == EventKind.MOVE and event.ids[0] in moved:
+            tick += 1
+            moved.clear()
+            event = event._replace(tick=tick)
+        phase = kind
+        if kind == EventKind.MOVE:
+            moved.add(event.ids[0])
+        yield event
+
+
+def convert_text_trace(text_path: str, trace_path: str, block_events: int = 16384) -> int:
+    """Eski metin kaydını indeksli kayda çevirir ve yazılan olay sayısını döndürür."""
+    count = 0
+    sink = IndexedTraceSink(trace_path, block_events=block_events)
+    try:
+        with open(text_path, encoding="utf-8") as file:
+            for event in parse_text_events(file):
+                sink.emit(event)
+                count += 1
+    finally:
+        sink.close()
+    return count
+
+
+def _print_events(events: Iterable[Event], output: TextIO):
+    for event in events:
+        output.write(f"[tick {event.tick}] {format_text(event)}\n")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from simulation import Species
+
+    parser = argparse.ArgumentParser(description="Convert and query indexed simulation traces.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert = commands.add_parser("convert", help="convert a legacy text log into an indexed trace")
+    convert.add_argument("text_path")
+    convert.add_argument("trace_path")
+    convert.add_argument("--block-events", type=int, default=16384)
+    query = commands.add_parser("query", help="print the events of an indexed trace that match all filters")
+    query.add_argument("trace_path")
+    query.add_argument("--entity", type=int, default=None)
+    query.add_argument("--kind", choices=[kind.name.lower() for kind in EventKind], default=None)
+    query.add_argument("--species", choices=[species.value for species in Species], default=None)
+    query.add_argument("--start", type=int, default=None, help="first tick (inclusive)")
+    query.add_argument("--stop", type=int, default=None, help="last tick (exclusive)")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        count = convert_text_trace(args.text_path, args.trace_path, args.block_events)
+        print(f"{count} events written to {args.trace_path}")
+        return 0
+    with IndexedTrace(args.trace_path) as trace:
+        _print_events(trace.events(kind=EventKind[args.kind.upper()] if args.kind else None,
+                                   species=Species(args.species) if args.species else None,
+                                   entity=args.entity, start=args.start, stop=args.stop), sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Simülasyon için tur bazında ölçümler.
+
+`Simulation(metrics=SimulationMetrics())` ile açılır; açık değilken simülasyon yalnızca `metrics is None` kontrolü yapar.
+Her tur için hareket, üreme ve avlanma adımlarının süresi, doluluk kontrolü sayısı, başarısız yerleştirmeler, doğumlar,
+avlanmalar ve engellenen hareketler bir `TickMetrics` kaydında toplanır. Kayıtlar geri çağırma fonksiyonlarına iletilir,
+isteğe bağlı olarak son `history` tur saklanır ve her `export_every` turda bir özet satırı yazılır.
+"""
+from __future__ import annotations
+from collections import deque
+from typing import Callable, Deque, List, Optional
+
+
+class TickMetrics:
+    """Tek bir turun ölçümleri."""
+    __slots__ = ("tick", "move_seconds", "reproduction_seconds", "hunting_seconds", "occupancy_checks",
+                 "failed_placements", "births", "hunts", "blocked_moves")
+    COUNTERS = ("occupancy_checks", "failed_placements", "births", "hunts", "blocked_moves")
+    TIMERS = ("move_seconds", "reproduction_seconds", "hunting_seconds")
+
+    def __init__(self, tick: int = 0):
+        self.tick = tick
+        self.move_seconds = 0.0
+        self.reproduction_seconds = 0.0
+        self.hunting_seconds = 0.0
+        self.occupancy_checks = 0
+        self.failed_placements = 0
+        self.births = 0
+        self.hunts = 0
+        self.blocked_moves = 0
+
+    def add(self, other: 'TickMetrics'):
+        for name in self.TIMERS + self.COUNTERS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"TickMetrics({fields})"
+
+
+class SimulationMetrics:
+    """
+    Tur ölçümlerini toplar. `callbacks` her tur sonunda o turun `TickMetrics` kaydıyla çağrılır; `totals` tüm turların
+    toplamını tutar. `export_every` sıfırdan büyükse her o kadar turda son turların özeti `export` fonksiyonuna verilir.
+    """
+
+    def __init__(self, history: Optional[int] = 1000, export_every: int = 0,
+                 export: Optional[Callable[[str], None]] = None):
+        self.current = TickMetrics()
+        self.totals = TickMetrics()
+        self.history: Deque[TickMetrics] = deque(maxlen=history)
+        self.callbacks: List[Callable[[TickMetrics], None]] = []
+        self.export_every = export_every
+        self.export = export if export is not None else print
+        self._window = TickMetrics()
+        self._window_ticks = 0
+
+    def add_callback(self, callback: Callable[[TickMetrics], None]):
+        self.callbacks.append(callback)
+
+    def begin_tick(self, tick: int):
+        self.current = TickMetrics(tick)
+
+    def end_tick(self):
+        record = self.current
+        self.totals.tick = record.tick
+        self.totals.add(record)
+        self.history.append(record)
+        for callback in self.callbacks:
+            callback(record)
+        if self.export_every > 0:
+            self._window.tick = record.tick
+            self._window.add(record)
+            self._window_ticks += 1
+            if self._window_ticks >= self.export_every:
+                self.export(self.format_summary(self._window, self._window_ticks))
+                self._window = TickMetrics()
+                self._window_ticks = 0
+
+    @staticmethod
+    def format_summary(window: TickMetrics, ticks: int) -> str:
+        """`ticks` turluk toplam ölçümü tur başına ortalamalarla tek satırlık bir özete çevirir."""
+        per_tick = max(ticks, 1)
+        return (f"tick {window.tick}: last {ticks} ticks "
+                f"move={window.move_seconds / per_tick * 1000:.2f}ms "
+                f"reproduce={window.reproduction_seconds / per_tick * 1000:.2f}ms "
+                f"hunt={window.hunting_seconds / per_tick * 1000:.2f}ms "
+                f"occupancy_checks={window.occupancy_checks / per_tick:.0f}/tick "
+                f"failed_placements={window.failed_placements} births={window.births} "
+                f"hunts={window.hunts} blocked_moves={window.blocked_moves}")
@@ -0,0 +1,666 @@
+"""
+Tahtayı yatay şeritlere (tile) bölen ve tur adımlarını çekirdeklere dağıtan paralel simülasyon motoru.
+
+`Simulation(engine="parallel", processes=4)` ile seçilir. Hayvan durumu (x, y, tür, cinsiyet, ID sütunları) ve tahtanın
+hücre dizisi `multiprocessing.shared_memory` üzerinde tutulur; işçi süreçler bu belleğe adıyla bağlanır ve hiçbir veri
+kopyalanmaz. Her hayvan, o turdaki y koordinatının düştüğü şeride aittir; sahiplik her turun başında konumdan yeniden
+hesaplandığından şerit sınırını geçen hayvanlar bir sonraki turda kendiliğinden yeni şeride geçer.
+
+- Hareket: şeritler çift ve tek olmak üzere iki dalgada hareket eder. Şerit yüksekliği en büyük hareket mesafesinin iki
+  katından büyük tutulduğu için aynı dalgadaki iki şeridin varlıkları aynı hücreye ulaşamaz; sınır çakışmaları böylece
+  kilitsiz ve sırası belirli biçimde çözülür. Her şerit o tur için ana üreteçten çekilen kendi tohumunu kullanır.
+- Avlanma ve üreme: her şerit kendi avları için en öncelikli avcıyı (avcı > aslan > kurt > küçük ID), kendi dişileri için
+  en yakın uyumlu erkekleri bulur. Komşu şeritlerdeki varlıklar, en büyük etkileşim yarıçapı kadar genişlikteki kenar
+  (halo) satırlarından doğrudan paylaşılan hücre dizisinden okunur. Sonuçlar ana süreçte ID sırasıyla uygulanır; doğum
+  konumu seçimi, yeni doğanlar ve avcının kendisi ana süreçte sırayla işlenir. Menzilinde erkek olmayan dişiler, aynı
+  turda kendilerinden önce doğuran dişilerin erkek yavrularıyla ana süreçte yeniden denenir.
+
+Sonuçlar yalnızca tohuma ve şerit düzenine bağlıdır; süreç sayısı ve işlerin bitiş sırası sonucu değiştirmez. Hareket
+sırası ve rastgele sayı akışı nesne motorundan farklı olduğundan aynı tohumla birebir aynı olaylar değil, istatistiksel
+olarak eşdeğer sonuçlar üretir.
+"""
+from __future__ import annotations
+import math
+import os
+import random
+import uuid
+import weakref
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from events import Event, EventKind, EventSink
+from metrics import SimulationMetrics
+from placement import FreeCells
+from scenario import Scenario
+from simulation import GENDERS, Animal, Direction, Gender, MovableEntity, Simulation, Species
+
+if TYPE_CHECKING:
+    from frames import FrameRing
+    from recorder import PopulationRecorder
+
+MALE, FEMALE = 0, 1
+HUNTER_CELL = -1
+DIRECTIONS = tuple(direction.value for direction in Direction)
+
+
+def _align(size: int) -> int:
+    return (size + 7) // 8 * 8
+
+
+class SharedState:
+    """
+    Paylaşılan bellekteki motor durumu: `board_size x board_size` hücre dizisi (hayvanın satır indeksi + 1; 0 boş hücre,
+    -1 avcı) ve `capacity` satırlık x, y, tür kodu, cinsiyet kodu ve ID sütunları. `name` verilirse var olan bloğa bağlanır.
+    """
+    COLUMNS = (("x", "i"), ("y", "i"), ("species", "B"), ("gender", "B"), ("ids", "q"))
+
+    def __init__(self, board_size: int, capacity: int, name: Optional[str] = None):
+        self.board_size = board_size
+        self.capacity = capacity
+        sizes = [("cells", "i", board_size * board_size)] + [(column, typecode, capacity) for column, typecode in self.COLUMNS]
+        total = sum(_align(count * array(typecode).itemsize) for _, typecode, count in sizes)
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=max(total, 1))
+            _owned[self.memory.name] = self
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.name = self.memory.name
+        self._views = []
+        offset = 0
+        for column, typecode, count in sizes:
+            size = count * array(typecode).itemsize
+            raw = self.memory.buf[offset:offset + size]
+            view = raw.cast(typecode)
+            self._views += [raw, view]
+            setattr(self, column, view)
+            offset += _align(size)
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self.memory.close()
+
+    def unlink(self):
+        _owned.pop(self.name, None)
+        self.memory.unlink()
+
+
+# Bu süreçte oluşturulan bloklar; işler havuz yerine bu süreçte çalıştığında aynı blok yeniden bağlanmadan kullanılır.
+_owned: "weakref.WeakValueDictionary[str, SharedState]" = weakref.WeakValueDictionary()
+# İşçi süreçte açık olan paylaşılan bellek bloğu; ana süreç bloğu büyüttüğünde yeni adla yeniden bağlanılır.
+_attached: Dict[str, SharedState] = {}
+
+
+def _attach(name: str, board_size: int, capacity: int) -> SharedState:
+    state = _owned.get(name)
+    if state is not None:
+        return state
+    state = _attached.get(name)
+    if state is None:
+        for old in _attached.values():
+            old.close()
+        _attached.clear()
+        state = _attached[name] = SharedState(board_size, capacity, name)
+    return state
+
+
+class RuleTables(NamedTuple):
+    """Şerit işlerinin kullandığı, tür koduyla indekslenen senaryo tabloları (avcının satırları sıfırdır)."""
+    move: Sequence[int]
+    hunt_squared: Sequence[int]
+    priority: Sequence[int]
+    eligible: Sequence[Sequence[int]]
+    mating: Sequence[Sequence[int]]
+
+
+# Tablo anahtarı -> tablolar. Ana süreçte simülasyon kurulurken, işçi süreçlerde havuz başlatıcısı (`_install_tables`)
+# tarafından bir kez doldurulur; işler tabloları değil yalnızca anahtarı taşır.
+_tables: Dict[str, RuleTables] = {}
+
+
+def _install_tables(key: str, tables: RuleTables):
+    _tables[key] = tables
+
+
+@lru_cache(maxsize=None)
+def disk_offsets(radius: int) -> Tuple[Tuple[int, int, int], ...]:
+    """Merkeze öklid mesafesi `radius` veya daha az olan (dx, dy, mesafe karesi) ofsetleri."""
+    return tuple((dx, dy, dx * dx + dy * dy) for dy in range(-radius, radius + 1) for dx in range(-radius, radius + 1)
+                 if dx * dx + dy * dy <= radius * radius)
+
+
+def move_tile(name: str, board_size: int, capacity: int, rows: array, seed: int, tables: str,
+              allowed: Optional[array]) -> int:
+    """
+    Şeride ait satırları sırayla hareket ettirir ve engellenen hareket sayısını döndürür. `allowed` verilmezse her hayvan
+    türünün hareket mesafesi kadar, verilirse `rows` ile aynı sıradaki adım sayıları kadar ilerler.
+    """
+    state = _attach(name, board_size, capacity)
+    cells, xs, ys, species = state.cells, state.x, state.y, state.species
+    move_table = _tables[tables].move
+    rng = random.Random(seed)
+    blocked = 0
+    for position, row in enumerate(rows):
+        steps = move_table[species[row]] if allowed is None else allowed[position]
+        x, y = xs[row], ys[row]
+        for _ in range(steps):
+            options = [(dx, dy) for dx, dy in DIRECTIONS
+                       if 0 <= x + dx < board_size and 0 <= y + dy < board_size and cells[(y + dy) * board_size + x + dx] == 0]
+            if not options:
+                blocked += 1
+                break
+            dx, dy = rng.choice(options)
+            cells[y * board_size + x] = 0
+            x += dx
+            y += dy
+            cells[y * board_size + x] = row + 1
+        xs[row], ys[row] = x, y
+    return blocked
+
+
+def hunt_tile(name: str, board_size: int, capacity: int, rows: array, tables: str) -> array:
+    """
+    Şeride ait her av için menzilindeki en öncelikli hayvan avcıyı bulur. Sonuç (av, avcı, ilk avcı) üçlüleridir; ilk
+    avcı, nesne motorunun avcıları liste sırasıyla taradığı düzende ava ilk ulaşan, yani en küçük satırlı avcıdır.
+    """
+    state = _attach(name, board_size, capacity)
+    cells, xs, ys, species, ids = state.cells, state.x, state.y, state.species, state.ids
+    _, hunt_squared, priority, eligible, _ = _tables[tables]
+    offsets = disk_offsets(math.isqrt(max(hunt_squared)))
+    found = array("i")
+    for row in rows:
+        x, y, prey_species = xs[row], ys[row], species[row]
+        best = first = -1
+        best_key = None
+        for dx, dy, squared in offsets:
+            cx, cy = x + dx, y + dy
+            if not (0 <= cx < board_size and 0 <= cy < board_size):
+                continue
+            occupant = cells[cy * board_size + cx] - 1
+            if occupant < 0:
+                continue
+            predator_species = species[occupant]
+            if not eligible[predator_species][prey_species] or squared > hunt_squared[predator_species]:
+                continue
+            key = (priority[predator_species], ids[occupant])
+            if best_key is None or key < best_key:
+                best, best_key = occupant, key
+            if first < 0 or occupant < first:
+                first = occupant
+        if best >= 0:
+            found.extend((row, best, first))
+    return found
+
+
+def mates_tile(name: str, board_size: int, capacity: int, rows: array, radius: int, tables: str) -> array:
+    """
+    Şeride ait her dişi için üreme mesafesindeki en yakın uyumlu erkekleri bulur. Sonuç düz bir dizidir: dişi, erkek
+    sayısı ve satır sırasıyla erkekler.
+    """
+    state = _attach(name, board_size, capacity)
+    cells, xs, ys, species, gender = state.cells, state.x, state.y, state.species, state.gender
+    mating = _tables[tables].mating
+    offsets = disk_offsets(radius)
+    found = array("i")
+    for row in rows:
+        x, y, compatible = xs[row], ys[row], mating[species[row]]
+        closest: List[int] = []
+        closest_squared = None
+        for dx, dy, squared in offsets:
+            if closest_squared is not None and squared > closest_squared:
+                continue
+            cx, cy = x + dx, y + dy
+            if not (0 <= cx < board_size and 0 <= cy < board_size):
+                continue
+            occupant = cells[cy * board_size + cx] - 1
+            if occupant < 0 or gender[occupant] != MALE or not compatible[species[occupant]]:
+                continue
+            if closest_squared is None or squared < closest_squared:
+                closest, closest_squared = [occupant], squared
+            else:
+                closest.append(occupant)
+        if closest:
+            found.extend((row, len(closest)))
+            found.extend(sorted(closest))
+    return found
+
+
+class _Resources:
+    """Simülasyon çöpe gittiğinde de serbest bırakılması gereken paylaşılan bellek ve süreç havuzu."""
+
+    def __init__(self, state: SharedState, tables: str):
+        self.state = state
+        self.tables = tables
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def release(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        _tables.pop(self.tables, None)
+        if self.state is not None:
+            self.state.close()
+            self.state.unlink()
+            self.state = None
+
+
+class ParallelSimulation(Simulation):
+    """
+    `Simulation` ile aynı arayüzü sunan, tahtayı şeritlere bölüp tur adımlarını süreç havuzunda yürüten motor.
+    `animals` listesi bu motorda boş kalır; hayvanlar paylaşılan bellekteki sütunların ilk `count` satırındadır ve
+    satırlar ID sırasıyla tutulur. `processes` verilmezse tahtanın her `CELLS_PER_PROCESS` hücresi için bir süreç (en
+    fazla çekirdek sayısı kadar) kullanılır; küçük tahtalarda işleri süreçlere göndermenin maliyeti işin kendisini aştığı
+    için işler bu süreçte yürütülür. 1 verilirse de işler bu süreçte yürütülür. `tiles` şerit sayısıdır ve sonuçlar
+    süreç sayısından değil, yalnızca şerit düzeninden etkilenir.
+    """
+    ENGINE = "parallel"
+    TILES = 8
+    CELLS_PER_PROCESS = 40_000
+
+    def __init__(self, board_size: int = 500, event_sink: Optional[EventSink] = None, engine: str = "parallel",
+                 seed: Optional[int] = None, metrics: Optional[SimulationMetrics] = None,
+                 recorder: Optional[PopulationRecorder] = None, incremental: bool = False,
+                 frames: Optional[FrameRing] = None, processes: Optional[int] = None, tiles: Optional[int] = None,
+                 scenario: Optional[Scenario] = None):
+        if incremental:
+            raise ValueError("incremental=True is only supported by engine='object', not engine='parallel'")
+        super().__init__(board_size, event_sink, seed=seed, metrics=metrics, recorder=recorder, frames=frames,
+                         scenario=scenario)
+        self.processes = processes or max(1, min(os.cpu_count() or 1, board_size * board_size // self.CELLS_PER_PROCESS))
+        self.count = 0
+        # Senaryo tabloları işçilere havuz kurulurken bir kez gönderilir; avcı ana süreçte ayrıca işlenir.
+        scenario = self.scenario
+        self.move_table = scenario.move_distance[:-1] + [0]
+        self.hunt_squared = [distance ** 2 for distance in scenario.hunt_distance[:-1]] + [0]
+        self.priority = scenario.priority
+        self.eligible = scenario.eligible
+        self.mating = scenario.mating
+        self.tables = uuid.uuid4().hex
+        _tables[self.tables] = RuleTables(self.move_table, self.hunt_squared, self.priority, self.eligible, self.mating)
+        # Aynı dalgada hareket eden iki şeridin ulaşabileceği satırlar çakışmasın diye şerit en az 2 * adım + 1 yüksekliktedir.
+        self.set_tile_height(max(math.ceil(board_size / (tiles or self.TILES)), 2 * max(self.move_table) + 1))
+        self._resources = _Resources(SharedState(board_size, 1024), self.tables)
+        self._finalizer = weakref.finalize(self, self._resources.release)
+        self.state.cells[self.hunter.y * board_size + self.hunter.x] = HUNTER_CELL
+
+    @property
+    def state(self) -> SharedState:
+        return self._resources.state
+
+    def set_tile_height(self, height: int):
+        self.tile_height = min(height, self.board_size)
+        self.tile_count = math.ceil(self.board_size / self.tile_height)
+
+    def close(self):
+        """İşçi süreçleri durdurur ve paylaşılan belleği serbest bırakır."""
+        self._finalizer()
+
+    def run(self, report: bool = True):
+        try:
+            super().run(report)
+        finally:
+            self.close()
+
+    def _map(self, function, tasks: List[tuple]) -> list:
+        """`function` işini her argüman demeti için çalıştırır ve sonuçları görev sırasıyla döndürür."""
+        if self.processes == 1 or len(tasks) <= 1:
+            return [function(*task) for task in tasks]
+        resources = self._resources
+        if resources.executor is None:
+            resources.executor = ProcessPoolExecutor(max_workers=min(self.processes, self.tile_count),
+                                                     initializer=_install_tables,
+                                                     initargs=(self.tables, _tables[self.tables]))
+        futures = [resources.executor.submit(function, *task) for task in tasks]
+        return [future.result() for future in futures]
+
+    def _tiles(self, rows) -> List[array]:
+        """Satırları, y koordinatlarına göre sahip oldukları şeritlere dağıtır."""
+        tiles = [array("i") for _ in range(self.tile_count)]
+        ys, height = self.state.y, self.tile_height
+        for row in rows:
+            tiles[ys[row] // height].append(row)
+        return tiles
+
+    def _grow(self, needed: int):
+        old = self.state
+        capacity = old.capacity
+        while capacity < needed:
+            capacity *= 2
+        state = SharedState(self.board_size, capacity)
+        state.cells[:] = old.cells
+        for column, _ in SharedState.COLUMNS:
+            getattr(state, column)[:self.count] = getattr(old, column)[:self.count]
+        old.close()
+        old.unlink()
+        self._resources.state = state
+
+    def _append(self, x: int, y: int, species_code: int, gender_code: int, entity_id: Optional[int] = None) -> int:
+        """
+        Yeni bir hayvanı sütunların sonuna ekler, ID verir (`entity_id` verilirse onu kullanır) ve hücre dizisine işler.
+        Satır indeksini döndürür.
+        """
+        if self.count >= self.state.capacity:
+            self._grow(self.count + 1)
+        state, row = self.state, self.count
+        state.x[row], state.y[row] = x, y
+        state.species[row], state.gender[row] = species_code, gender_code
+        if entity_id is None:
+            entity_id = self.allocate_ids()
+        else:
+            # Satırlar ID sırasıyla tutulduğundan dışarıdan gelen ID sayacın önünde olmalıdır.
+            if entity_id <= (state.ids[row - 1] if row else 0):
+                raise ValueError(f"Cannot add animal with ID {entity_id}: rows are kept in ID order")
+            self.id_counter = max(self.id_counter, entity_id)
+        state.ids[row] = entity_id
+        state.cells[y * self.board_size + x] = row + 1
+        if self.free_cells is not None:
+            self.free_cells.occupy(x, y)
+        self.count += 1
+        key = (self.scenario.members[species_code], GENDERS[gender_code])
+        self.population[key] = self.population.get(key, 0) + 1
+        return row
+
+    def export_entities(self):
+        state, n = self.state, self.count
+        return (array("q", state.ids[:n]), array("i", state.x[:n]), array("i", state.y[:n]),
+                array("B", state.species[:n]), array("B", state.gender[:n]))
+
+    def import_entities(self, ids, xs, ys, species_codes, gender_codes):
+        count = len(ids)
+        if count > self.state.capacity:
+            self._grow(count)
+        state = self.state
+        state.ids[:count], state.x[:count], state.y[:count] = ids, xs, ys
+        state.species[:count], state.gender[:count] = species_codes, gender_codes
+        self.count = count
+        self.free_cells = None
+        self.population = {}
+        for code, gender_code in zip(state.species[:count], state.gender[:count]):
+            key = (self.scenario.members[code], GENDERS[gender_code])
+            self.population[key] = self.population.get(key, 0) + 1
+        cells, board = state.cells, self.board_size
+        cells[:] = array("i", bytes(len(cells) * 4))
+        for row in range(count):
+            cells[state.y[row] * board + state.x[row]] = row + 1
+        cells[self.hunter.y * board + self.hunter.x] = HUNTER_CELL
+
+    def export_engine_state(self) -> dict:
+        return {"tile_height": self.tile_height}
+
+    def import_engine_state(self, state: dict):
+        self.set_tile_height(state["tile_height"])
+
+    def is_position_available(self, x: int, y: int, current_entity_id: Optional[int]) -> bool:
+        if self.metrics is not None:
+            self.metrics.current.occupancy_checks += 1
+        occupant = self.state.cells[y * self.board_size + x]
+        if occupant == 0:
+            return True
+        if occupant == HUNTER_CELL:
+            return current_entity_id == self.hunter.id
+        return self.state.ids[occupant - 1] == current_entity_id
+
+    def relocate(self, entity: MovableEntity, dx: int, dy: int):
+        # Bu motorda `relocate` yalnızca avcı için çağrılır; hayvanlar işçilerde hücre dizisi üzerinde hareket eder.
+        cells, board = self.state.cells, self.board_size
+        cells[entity.y * board + entity.x] = 0
+        if self.free_cells is not None:
+            self.free_cells.release(entity.x, entity.y)
+        entity.update_position(dx, dy)
+        cells[entity.y * board + entity.x] = HUNTER_CELL
+        if self.free_cells is not None:
+            self.free_cells.occupy(entity.x, entity.y)
+
+    def create_animal(self, species: Species, gender: str, count: int):
+        for _ in range(count):
+            x, y = self.find_empty_position()
+            if x is not None and y is not None:
+                self._append(x, y, species.code, GENDERS.index(gender))
+
+    def add_animal(self, animal: Animal):
+        """
+        Hayvanın konumunu, türünü, cinsiyetini ve ID'sini sütunlara ekler; nesnenin kendisi saklanmaz. Hücre tahta dışında
+        veya doluysa ya da ID son satırınkinden küçükse ValueError verir.
+        """
+        if not (0 <= animal.x < self.board_size and 0 <= animal.y < self.board_size
+                and self.state.cells[animal.y * self.board_size + animal.x] == 0):
+            raise ValueError(f"Cannot add animal at ({animal.x}, {animal.y}): cell is outside the board or occupied")
+        self._append(animal.x, animal.y, animal.species.code, GENDERS.index(animal.gender), animal.id)
+
+    def occupied_cells(self) -> int:
+        return self.count + 1
+
+    def build_free_cells(self) -> FreeCells:
+        board = self.board_size
+        return FreeCells(board, ((cell % board, cell // board) for cell, occupant in enumerate(self.state.cells) if occupant))
+
+    def _sync_occupancy(self):
+        # Hayvanlar paylaşılan bellekteki sütunlarda tutulur; `animals` listesi kullanılmaz.
+        pass
+
+    def move_entities_once(self):
+        remaining = self.MAX_MOVEMENT - self.total_movement
+        if remaining <= 0:
+            return
+        # Hayvanlar işçilerde hareket ettiğinden boş hücreler kümesi güncel tutulamaz; gerekirse yeniden kurulur.
+        self.free_cells = None
+        state, n = self.state, self.count
+        sink = self.event_sink
+        log_events = sink is not None and sink.enabled
+        steps = array("i", map(self.move_table.__getitem__, state.species[:n]))
+        # Nesne motorundaki gibi hareket hakkı ID sırasıyla harcanır; sınıra yaklaşıldığında her hayvanın adımı kırpılır.
+        allowed = None
+        if sum(steps) > remaining:
+            allowed, budget = array("i"), remaining
+            for step in steps:
+                allowed.append(min(step, budget))
+                budget -= allowed[-1]
+            steps = allowed
+        if log_events:
+            before_x, before_y = array("i", state.x[:n]), array("i", state.y[:n])
+
+        tiles = self._tiles(range(n))
+        seeds = [self.rng.getrandbits(64) for _ in tiles]
+        for parity in (0, 1):
+            tasks = [(state.name, self.board_size, state.capacity, rows, seeds[index], self.tables,
+                      None if allowed is None else array("i", (allowed[row] for row in rows)))
+                     for index, rows in enumerate(tiles) if index % 2 == parity and rows]
+            blocked = sum(self._map(move_tile, tasks))
+            if self.metrics is not None:
+                self.metrics.current.blocked_moves += blocked
+
+        if log_events:
+            spent = self.total_movement
+            for row in range(n):
+                spent += steps[row]
+                sink.emit(Event(self.tick, EventKind.MOVE, (state.ids[row],), (self.scenario.members[state.species[row]],),
+                                ((before_x[row], before_y[row]), (state.x[row], state.y[row])), steps[row],
+                                self.MAX_MOVEMENT - spent))
+        self.total_movement += sum(steps)
+        self._move_hunter(log_events)
+
+    def _move_hunter(self, log_events: bool):
+        hunter = self.hunter
+        if self.total_movement >= self.MAX_MOVEMENT:
+            return
+        allowed = min(hunter.move_distance, self.MAX_MOVEMENT - self.total_movement)
+        initial_position = (hunter.x, hunter.y)
+        hunter.move(self, max_movement=allowed)
+        self.total_movement += allowed
+        if log_events:
+            self.event_sink.emit(Event(self.tick, EventKind.MOVE, (hunter.id,), (hunter.species,),
+                                       (initial_position, (hunter.x, hunter.y)), allowed,
+                                       self.MAX_MOVEMENT - self.total_movement))
+
+    def perform_reproduction(self):
+        # Nesne motorunda tur içinde doğan dişiler de aynı tur ürer; burada bu, yavru dişilerle tekrarlanan kuşaklarla yapılır.
+        gender = self.state.gender
+        females = [row for row in range(self.count) if gender[row] == FEMALE]
+        while females:
+            first_child = self.count
+            self._reproduce(females)
+            gender = self.state.gender
+            females = [row for row in range(first_child, self.count) if gender[row] == FEMALE]
+
+    def _reproduce(self, females: List[int]):
+        """
+        Verilen dişilerin eş adaylarını şeritlerde bulur, doğumları ana süreçte satır sırasıyla uygular. Menzilinde erkek
+        olmayan dişiler, bu kuşakta kendilerinden önce sırası gelen (satırı daha küçük) dişilerin erkek yavrularıyla
+        yeniden denenir (nesne motorunda yavrular doğar doğmaz sonraki dişilere aday olduğu gibi).
+        """
+        state = self.state
+        tasks = [(state.name, self.board_size, state.capacity, rows, self.REPRODUCTION_DISTANCE, self.tables)
+                 for rows in self._tiles(females) if rows]
+        candidates: Dict[int, List[int]] = {}
+        for found in self._map(mates_tile, tasks):
+            position = 0
+            while position < len(found):
+                female, count = found[position], found[position + 1]
+                candidates[female] = list(found[position + 2:position + 2 + count])
+                position += 2 + count
+        unmated = set(females).difference(candidates)
+        while candidates:
+            # Yeni doğan erkek satırı -> annesinin satırı.
+            males = {child: mother for child, mother in self._give_births(candidates)
+                     if self.state.gender[child] == MALE}
+            candidates = self._newborn_mates(unmated, males) if unmated and males else {}
+            unmated.difference_update(candidates)
+
+    def _give_births(self, candidates: Dict[int, List[int]]) -> List[Tuple[int, int]]:
+        """Her dişi için adaylarından birini rastgele seçip yavruyu yerleştirir; (yavru, anne) satırlarını döndürür."""
+        sink = self.event_sink
+        log_events = sink is not None and sink.enabled
+        members = self.scenario.members
+        born = []
+        for female in sorted(candidates):
+            state = self.state
+            male = self.rng.choice(candidates[female])
+            birth_x, birth_y = self.find_birth_position((state.x[female] + state.x[male]) // 2,
+                                                        (state.y[female] + state.y[male]) // 2, radius=4)
+            if birth_x is None or birth_y is None:
+                continue
+            child_gender = self.rng.choice(GENDERS)
+            mother, father = members[state.species[female]], members[state.species[male]]
+            male_species, female_species = self.scenario.offspring_species[mother.code][father.code]
+            species = female_species if child_gender is Gender.FEMALE else male_species
+            child = self._append(birth_x, birth_y, species.code, GENDERS.index(child_gender))
+            born.append((child, female))
+            state = self.state
+            self.born_counts[species] += 1
+            if self.metrics is not None:
+                self.metrics.current.births += 1
+            if log_events:
+                sink.emit(Event(self.tick, EventKind.BIRTH, (state.ids[child], state.ids[female], state.ids[male]),
+                                (species, mother, father),
+                                ((birth_x, birth_y), (state.x[female], state.y[female]), (state.x[male], state.y[male]))))
+        return born
+
+    def _newborn_mates(self, unmated: set, males: Dict[int, int]) -> Dict[int, List[int]]:
+        """
+        `unmated` dişilerinden menzilinde annesi kendisinden önce sırası gelen yeni doğan bir erkek olanlar için en
+        yakın uyumlu yeni doğan erkekleri (`mates_tile` gibi satır sırasıyla) döndürür. Yalnızca yeni doğanların
+        çevresine bakılır.
+        """
+        state, board = self.state, self.board_size
+        cells, xs, ys, species = state.cells, state.x, state.y, state.species
+        offsets = disk_offsets(self.REPRODUCTION_DISTANCE)
+        nearby = set()
+        for male in males:
+            for dx, dy, _ in offsets:
+                x, y = xs[male] + dx, ys[male] + dy
+                if 0 <= x < board and 0 <= y < board and cells[y * board + x] - 1 in unmated:
+                    nearby.add(cells[y * board + x] - 1)
+        found: Dict[int, List[int]] = {}
+        for female in nearby:
+            compatible = self.mating[species[female]]
+            closest: List[int] = []
+            closest_squared = None
+            for dx, dy, squared in offsets:
+                if closest_squared is not None and squared > closest_squared:
+                    continue
+                x, y = xs[female] + dx, ys[female] + dy
+                if not (0 <= x < board and 0 <= y < board):
+                    continue
+                occupant = cells[y * board + x] - 1
+                # Yeni doğan olmayan satırlar için `get` dişinin kendisini döndürür ve aday elenir.
+                if males.get(occupant, female) >= female or not compatible[species[occupant]]:
+                    continue
+                if closest_squared is None or squared < closest_squared:
+                    closest, closest_squared = [occupant], squared
+                else:
+                    closest.append(occupant)
+            if closest:
+                found[female] = sorted(closest)
+        return found
+
+    def perform_hunting(self):
+        state, n, board = self.state, self.count, self.board_size
+        if n == 0:
+            return
+        tasks = [(state.name, board, state.capacity, rows, self.tables)
+                 for rows in self._tiles(range(n)) if rows]
+        # av satırı -> (avcı satırı, ilk avcı satırı); -1 avcının kendisini, n de avcının tarama sırasındaki yerini belirtir.
+        hunted: Dict[int, Tuple[int, int]] = {}
+        for found in self._map(hunt_tile, tasks):
+            for position in range(0, len(found), 3):
+                hunted[found[position]] = (found[position + 1], found[position + 2])
+        hunter = self.hunter
+        members = self.scenario.members
+        hunter_code = hunter.species.code
+        eligible = self.scenario.eligible[hunter_code]
+        hunter_key = (self.scenario.priority[hunter_code], hunter.id)
+        for dx, dy, _ in disk_offsets(hunter.hunt_distance):
+            x, y = hunter.x + dx, hunter.y + dy
+            if 0 <= x < board and 0 <= y < board and state.cells[y * board + x] > 0:
+                prey = state.cells[y * board + x] - 1
+                if not eligible[state.species[prey]]:
+                    continue
+                if prey not in hunted:
+                    hunted[prey] = (-1, n)
+                    continue
+                predator, first = hunted[prey]
+                if hunter_key < (self.priority[state.species[predator]], state.ids[predator]):
+                    hunted[prey] = (-1, first)
+        if not hunted:
+            return
+
+        sink = self.event_sink
+        log_events = sink is not None and sink.enabled
+        for prey in sorted(hunted, key=lambda row: (hunted[row][1], row)):
+            predator = hunted[prey][0]
+            prey_species = members[state.species[prey]]
+            predator_species = hunter.species if predator < 0 else members[state.species[predator]]
+            if log_events:
+                if predator < 0:
+                    predator_id, predator_position = hunter.id, (hunter.x, hunter.y)
+                else:
+                    predator_id, predator_position = state.ids[predator], (state.x[predator], state.y[predator])
+                sink.emit(Event(self.tick, EventKind.HUNT, (predator_id, state.ids[prey]), (predator_species, prey_species),
+                                (predator_position, (state.x[prey], state.y[prey]))))
+            self.hunted_counts[prey_species] += 1
+            self.population[(prey_species, GENDERS[state.gender[prey]])] -= 1
+            self.kill_counts[predator_species] = self.kill_counts.get(predator_species, 0) + 1
+        if self.metrics is not None:
+            self.metrics.current.hunts += len(hunted)
+        self._compact(hunted)
+
+    def _compact(self, dead):
+        """Ölen satırları sütunlardan çıkarır ve kayan satırların hücre dizisindeki indekslerini yeniler."""
+        state, n, board = self.state, self.count, self.board_size
+        cells = state.cells
+        for row in dead:
+            cells[state.y[row] * board + state.x[row]] = 0
+            if self.free_cells is not None:
+                self.free_cells.release(state.x[row], state.y[row])
+        first = min(dead)
+        survivors = [row for row in range(first, n) if row not in dead]
+        for column, typecode in SharedState.COLUMNS:
+            view = getattr(state, column)
+            view[first:first + len(survivors)] = array(typecode, (view[row] for row in survivors))
+        self.count = first + len(survivors)
+        for row in range(first, self.count):
+            cells[state.y[row] * board + state.x[row]] = row + 1
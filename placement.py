@@ -0,0 +1,77 @@
+"""
+Yerleştirme yardımcıları: doğum çemberinin önceden hesaplanmış ofset tabloları ve boş hücrelerden O(1) rastgele seçim
+yapan `FreeCells` kümesi.
+
+Boş tahtada rastgele deneme (rejection sampling) ucuzdur; tahta dolduğunda ise denemelerin çoğu dolu hücreye düşer ve
+100 denemenin hepsi başarısız olabilir. `FreeCells` tüm boş hücreleri bir dizide tutar, böylece tahta %99 dolu olsa bile
+boş hücrelerden biri tek adımda ve eşit olasılıkla seçilir; tahtada boş hücre varsa yerleştirme hiçbir zaman başarısız
+olmaz.
+"""
+import math
+from array import array
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+# Doğum pozisyonları ebeveynlerin orta noktası etrafında 10 derece arayla 36 açıda aranır.
+RING_ANGLES = range(0, 360, 10)
+
+
+@lru_cache(maxsize=None)
+def ring_offsets(radius: float) -> Tuple[Tuple[int, int], ...]:
+    """
+    `radius` yarıçaplı çember üzerindeki noktaların tam sayıya yuvarlanmış (dx, dy) ofsetleri. Yuvarlama sonrası aynı
+    hücreye düşen açılar tabloda bir kez, ilk geçtikleri sırada yer alır; böylece her aday hücre eşit olasılıkla seçilir.
+    """
+    offsets = {}
+    for angle in RING_ANGLES:
+        radian = math.radians(angle)
+        offsets.setdefault((round(radius * math.cos(radian)), round(radius * math.sin(radian))), None)
+    return tuple(offsets)
+
+
+class FreeCells:
+    """
+    Tahtadaki boş hücrelerin kümesi. `cells` boş hücrelerin düz indekslerini (y * board_size + x) sırasız tutar,
+    `slots` her hücrenin `cells` içindeki konumunu (dolu hücreler için -1). Çıkarma, hücreyi dizinin son elemanıyla yer
+    değiştirerek yapılır; ekleme, çıkarma ve rastgele seçim O(1)'dir.
+    """
+
+    def __init__(self, board_size: int, occupied: Iterable[Tuple[int, int]] = ()):
+        size = board_size * board_size
+        self.board_size = board_size
+        self.cells = array("i", range(size))
+        self.slots = array("i", range(size))
+        for x, y in occupied:
+            self.occupy(x, y)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __contains__(self, position: Tuple[int, int]) -> bool:
+        x, y = position
+        return self.slots[y * self.board_size + x] >= 0
+
+    def occupy(self, x: int, y: int):
+        """Hücreyi boş hücreler kümesinden çıkarır; hücre zaten doluysa bir şey yapmaz."""
+        cell = y * self.board_size + x
+        slot = self.slots[cell]
+        if slot < 0:
+            return
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[slot] = last
+            self.slots[last] = slot
+        self.slots[cell] = -1
+
+    def release(self, x: int, y: int):
+        """Hücreyi boş hücreler kümesine ekler; hücre zaten boşsa bir şey yapmaz."""
+        cell = y * self.board_size + x
+        if self.slots[cell] >= 0:
+            return
+        self.slots[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    def sample(self, rng) -> Tuple[int, int]:
+        """Boş hücrelerden birini eşit olasılıkla seçer ve (x, y) olarak döndürür. Küme boş olmamalıdır."""
+        cell = self.cells[rng.randrange(len(self.cells))]
+        return cell % self.board_size, cell // self.board_size
@@ -0,0 +1,177 @@
+"""
+Tur bazında nüfus zaman serisi kaydedici.
+
+`Simulation(recorder=PopulationRecorder("kayit"))` ile açılır. Yerleştirmeden sonra (tur 0) ve her turun sonunda bir satır
+kaydedilir: (tür, cinsiyet) bazında nüfus, tür bazında o turdaki doğum ve avlanma sayıları ve avcı türüne (avcı, aslan,
+kurt) göre o turdaki av sayıları. Satırlar sütun başına önceden ayrılmış `chunk_ticks` uzunluğunda tamponlarda birikir;
+tampon dolduğunda diske eklenir.
+
+Dosya düzeni: `directory` içinde her sütun için tek boyutlu, little-endian int64 bir `<sütun>.npy` dosyası ve sütun
+adlarını listeleyen `columns.json`. `.npy` başlığı sabit uzunluktadır ve satır sayısı yerinde güncellenir; böylece dosya
+yeniden yazılmadan büyür ve NumPy ile `numpy.load(path, mmap_mode="r")` olarak da açılabilir. `load_recording` istenen tur
+aralığını dosyaları belleğe eşleyerek (mmap) okur; dosyanın geri kalanı okunmaz.
+"""
+from __future__ import annotations
+import ast
+import json
+import mmap
+import os
+import sys
+from array import array
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy varsa okunan sütunlar kopyalanmadan NumPy dizisi olarak döner
+    np = None
+
+from simulation import GENDERS
+
+if TYPE_CHECKING:
+    from simulation import Simulation
+
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+HEADER_SIZE = 128
+MANIFEST = "columns.json"
+
+
+def _npy_header(length: int) -> bytes:
+    """Uzunluk alanı sabit genişlikte olan, toplam `HEADER_SIZE` baytlık .npy 1.0 başlığı."""
+    text = "{'descr': '<i8', 'fortran_order': False, 'shape': (%20d,), }" % length
+    text = text.ljust(HEADER_SIZE - len(NPY_MAGIC) - 3) + "\n"
+    return NPY_MAGIC + len(text).to_bytes(2, "little") + text.encode("latin1")
+
+
+def _read_npy_header(data) -> tuple:
+    """.npy başlığını çözer ve (satır sayısı, verinin başladığı konum) döndürür."""
+    if bytes(data[:len(NPY_MAGIC) - 2]) != NPY_MAGIC[:-2]:
+        raise ValueError("not a .npy file")
+    if data[6] != 1:
+        raise ValueError(f"Unsupported .npy version {data[6]}.{data[7]}")
+    length = int.from_bytes(data[8:10], "little")
+    header = ast.literal_eval(bytes(data[10:10 + length]).decode("latin1"))
+    if header["descr"] != "<i8" or header["fortran_order"] or len(header["shape"]) != 1:
+        raise ValueError(f"Unsupported .npy layout: {header}")
+    return header["shape"][0], 10 + length
+
+
+class AppendableNpy:
+    """Sonuna değer eklenebilen tek boyutlu int64 .npy dosyası."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.length = 0
+        self.file = open(path, "w+b")
+        self.file.write(_npy_header(0))
+
+    def append(self, values: array):
+        if sys.byteorder == "big":
+            values = array("q", values)
+            values.byteswap()
+        # Önce veri, sonra başlık yazılır; başlık hiçbir zaman yazılmamış satırları göstermez.
+        self.file.seek(HEADER_SIZE + 8 * self.length)
+        self.file.write(values.tobytes())
+        self.length += len(values)
+        self.file.seek(0)
+        self.file.write(_npy_header(self.length))
+
+    def close(self):
+        self.file.close()
+
+
+class PopulationRecorder:
+    """
+    Tur satırlarını sütunlar halinde biriktirir ve her `chunk_ticks` satırda bir diske ekler. Doğum, avlanma ve av
+    sayıları simülasyonun kümülatif sayaçlarının bir önceki satıra göre farkıdır; ilk satırda o ana kadarki toplamlardır.
+    """
+
+    def __init__(self, directory: str, chunk_ticks: int = 4096):
+        self.directory = directory
+        self.chunk_ticks = chunk_ticks
+        self.columns: List[str] = []
+        self._buffers: List[array] = []
+        self._files: List[AppendableNpy] = []
+        self._filled = 0
+        self._last: List[int] = []
+        self.closed = False
+
+    def _open(self, simulation: 'Simulation'):
+        species = list(simulation.NUM_ANIMALS)
+        predators = [simulation.scenario.hunter] + [s for s in species if simulation.scenario.hunt_distance[s.code]]
+        self._population_keys = [(s, gender) for s in species for gender in GENDERS]
+        self._species = species
+        self._predators = predators
+        self.columns = (["tick"]
+                        + [f"population.{s.value}.{gender.value}" for s, gender in self._population_keys]
+                        + [f"born.{s.value}" for s in species]
+                        + [f"hunted.{s.value}" for s in species]
+                        + [f"kills.{s.value}" for s in predators])
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, MANIFEST), "w") as file:
+            json.dump({"columns": self.columns}, file)
+        self._buffers = [array("q", bytes(8 * self.chunk_ticks)) for _ in self.columns]
+        self._files = [AppendableNpy(os.path.join(self.directory, f"{column}.npy")) for column in self.columns]
+        self._last = [0] * (2 * len(species) + len(predators))
+
+    def record(self, simulation: 'Simulation'):
+        """Simülasyonun şu anki durumunu bir satır olarak ekler."""
+        if not self.columns:
+            self._open(simulation)
+        population = simulation.population
+        totals = ([simulation.born_counts.get(s, 0) for s in self._species]
+                  + [simulation.hunted_counts.get(s, 0) for s in self._species]
+                  + [simulation.kill_counts.get(s, 0) for s in self._predators])
+        row = ([simulation.tick] + [population.get(key, 0) for key in self._population_keys]
+               + [total - last for total, last in zip(totals, self._last)])
+        self._last = totals
+        filled = self._filled
+        for buffer, value in zip(self._buffers, row):
+            buffer[filled] = value
+        self._filled = filled + 1
+        if self._filled == self.chunk_ticks:
+            self.flush()
+
+    def flush(self):
+        """Tamponda bekleyen satırları dosyalara ekler."""
+        if self._filled:
+            for buffer, file in zip(self._buffers, self._files):
+                file.append(buffer[:self._filled] if self._filled < self.chunk_ticks else buffer)
+            self._filled = 0
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        for file in self._files:
+            file.close()
+        self.closed = True
+
+
+def _read_column(path: str, start: int, stop: int):
+    if np is not None:
+        return np.load(path, mmap_mode="r")[start:stop]
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        length, offset = _read_npy_header(mapped)
+        start, stop, _ = slice(start, stop).indices(length)
+        values = array("q")
+        values.frombytes(mapped[offset + 8 * start:offset + 8 * max(start, stop)])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def load_recording(directory: str, start: Optional[int] = None, stop: Optional[int] = None,
+                   columns: Optional[Sequence[str]] = None) -> Dict[str, Sequence[int]]:
+    """
+    `PopulationRecorder` kaydından [start, stop) tur aralığını okur ve sütun adı -> değerler sözlüğü döndürür. Turlar
+    ardışık kaydedildiğinden satır konumu ilk kaydedilen turdan hesaplanır. NumPy varsa değerler belleğe eşlenmiş
+    dosyaları gösteren NumPy dizileridir, yoksa `array("q")` kopyalarıdır. `columns` verilmezse tüm sütunlar okunur.
+    """
+    if columns is None:
+        with open(os.path.join(directory, MANIFEST)) as file:
+            columns = json.load(file)["columns"]
+    first = _read_column(os.path.join(directory, "tick.npy"), 0, 1)
+    first_tick = int(first[0]) if len(first) else 0
+    row_start = None if start is None else max(start - first_tick, 0)
+    row_stop = None if stop is None else max(stop - first_tick, 0)
+    return {column: _read_column(os.path.join(directory, f"{column}.npy"), row_start, row_stop) for column in columns}
@@ -0,0 +1,241 @@
+"""
+Senaryo katmanı: tür kuralları (hareket ve avlanma mesafeleri, kimin kimi avladığı, avcı önceliği, kimin kimle
+üreyebildiği ve yavrunun türü) başlangıçta bir kez tam sayı tablolarına derlenir.
+
+Her tür, senaryonun `Species` Enum'undaki sırasıyla bir tür koduna sahiptir. Derlenen tablolar koda göre indekslenen
+listelerdir:
+
+- `eligible[avcı][av]`: avcı türün bu türü avlayıp avlayamayacağı (1/0),
+- `priority[tür]`: aynı avı hedefleyen avcılar arasındaki öncelik (küçük olan önce, eşitlikte küçük ID),
+- `mating[a][b]`: iki türün üreme uyumluluğu (1/0, simetrik),
+- `offspring[anne][baba]`: yavrunun (erkek, dişi) tür kodları.
+
+Tablolar senaryoda tutulur; tür üyelerine yalnızca Enum'daki sıraları (`SpeciesEnum.code`) eklenir. Nesne motoru
+satırları tür koduyla okur (`scenario.eligible[avcı.species.code][av.species.code]`); dizi motorları aynı listelerden
+NumPy tabloları kurar. Aynı `Species` Enum'u birden fazla senaryoda kullanılabilir. Tür sayısı arttıkça yalnızca tablolar
+büyür, tur döngülerindeki arama maliyeti değişmez. Tür kodları dizi motorunda ve ikili olay kaydında işaretli bir
+baytta saklandığından bir senaryoda avcı dahil en fazla `MAX_SPECIES` tür olabilir.
+
+Özel türler JSON dosyasından `load_scenario` ile yüklenir:
+
+    {
+      "species": [
+        {"name": "Rabbit", "move_distance": 3, "initial": {"Male": 20, "Female": 20}},
+        {"name": "Fox", "move_distance": 3, "hunt_distance": 4, "prey": ["Rabbit"], "priority": 1,
+         "initial": {"Male": 5, "Female": 5}}
+      ],
+      "hunter": {"hunt_distance": 8, "priority": 0}
+    }
+
+Tür alanları: `name` (zorunlu), `move_distance` (zorunlu), `hunt_distance` (avcı türler için), `prey` (varsayılan
+kendisi dışındaki tüm hayvan türleri), `priority` (varsayılan en düşük öncelik), `mates` (kendi türüne ek olarak
+üreyebildiği türler), `offspring` (yavru türü cinsiyete göre, ör. {"Male": "Rooster", "Female": "Chicken"}) ve
+`initial` (cinsiyet başına başlangıç sayısı). Avcı her senaryoda `Hunter` adıyla son türdür.
+"""
+import json
+import re
+from enum import Enum
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+HUNTER_NAME = "Hunter"
+GENDER_NAMES = ("Male", "Female")
+SPECIES_FIELDS = {"name", "move_distance", "hunt_distance", "prey", "priority", "mates", "offspring", "initial"}
+HUNTER_FIELDS = {"hunt_distance", "priority", "prey"}
+# Avcı dahil tür sayısı sınırı; tür kodları int8 olarak saklanır (dizi motoru, `events.BINARY_RECORD`).
+MAX_SPECIES = 127
+_NAME = re.compile(r"[A-Za-z][A-Za-z0-9_]*")
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "species": [
+        {"name": "Sheep", "move_distance": 2, "initial": {"Male": 15, "Female": 15}},
+        {"name": "Cow", "move_distance": 2, "initial": {"Male": 5, "Female": 5}},
+        {"name": "Wolf", "move_distance": 3, "hunt_distance": 4, "priority": 2, "initial": {"Male": 5, "Female": 5}},
+        {"name": "Lion", "move_distance": 4, "hunt_distance": 5, "priority": 1, "initial": {"Male": 4, "Female": 4}},
+        {"name": "Chicken", "move_distance": 1, "mates": ["Rooster"],
+         "offspring": {"Male": "Rooster", "Female": "Chicken"}, "initial": {"Female": 10}},
+        {"name": "Rooster", "move_distance": 1, "initial": {"Male": 10}},
+    ],
+    "hunter": {"hunt_distance": 8, "priority": 0},
+}
+
+
+class ScenarioError(ValueError):
+    """Senaryo yapılandırması geçersiz olduğunda fırlatılır; mesaj hatalı alanı belirtir."""
+
+
+class SpeciesEnum(Enum):
+    """
+    Senaryo türlerinin taban Enum'u. Her üye, tanım sırasındaki yerini `code` olarak taşır; senaryo tabloları bu kodla
+    indekslenir. Kod senaryodan bağımsızdır ve Enum oluşturulurken bir kez atanır.
+    """
+
+    def __init__(self, *args):
+        self.code = len(type(self).__members__)
+
+
+class SpeciesTraits(NamedTuple):
+    """Bir türün tüm hayvanlarınca paylaşılan sabit özellikleri (flyweight)."""
+    move_distance: int
+    hunt_distance: Optional[int]
+
+
+def _integer(value: Any, where: str, minimum: int) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+        raise ScenarioError(f"{where} must be an integer >= {minimum}, got {value!r}")
+    return value
+
+
+def _names(value: Any, where: str, known: Sequence[str]) -> List[str]:
+    if not isinstance(value, list) or not all(isinstance(name, str) for name in value):
+        raise ScenarioError(f"{where} must be a list of species names, got {value!r}")
+    for name in value:
+        if name not in known:
+            raise ScenarioError(f"{where} refers to unknown species {name!r}")
+    return value
+
+
+def _check_fields(entry: Any, allowed: set, where: str):
+    if not isinstance(entry, dict):
+        raise ScenarioError(f"{where} must be an object, got {entry!r}")
+    unknown = sorted(set(entry) - allowed)
+    if unknown:
+        raise ScenarioError(f"{where} has unknown fields: {', '.join(unknown)}")
+
+
+class Scenario:
+    """
+    Derlenmiş tür kuralları. Doğrudan değil `from_dict` veya `load_scenario` ile oluşturulur. Tüm tablolar tür koduna
+    göre indekslenen listelerdir ve senaryo oluşturulduktan sonra değiştirilmemelidir.
+    """
+
+    def __init__(self, config: Dict[str, Any], species: Type[SpeciesEnum]):
+        self.config = config
+        self.species = species
+        self.members = list(species)
+        if len(self.members) > MAX_SPECIES:
+            raise ScenarioError(f"scenario has {len(self.members)} species including the hunter, at most {MAX_SPECIES} "
+                                f"are supported")
+        if any(getattr(member, "code", None) != index for index, member in enumerate(self.members)):
+            raise ScenarioError(f"{species.__name__} must be a SpeciesEnum without aliases")
+        self.hunter = self.members[-1]
+        self.animals = self.members[:-1]
+        entries = config["species"]
+        hunter_entry = config.get("hunter", {})
+        code = {entry["name"]: index for index, entry in enumerate(entries)}
+        hunter_code = len(entries)
+        size = len(self.members)
+
+        self.hunter_distance: int = hunter_entry.get("hunt_distance", 8)
+        self.move_distance = [entry["move_distance"] for entry in entries] + [1]
+        self.hunt_distance = [entry.get("hunt_distance") or 0 for entry in entries] + [self.hunter_distance]
+        explicit = [entry["priority"] for entry in entries if "priority" in entry] + [hunter_entry.get("priority", 0)]
+        lowest = max(explicit) + 1
+        self.priority = [entry.get("priority", lowest) for entry in entries] + [hunter_entry.get("priority", 0)]
+
+        self.eligible = [[0] * size for _ in range(size)]
+        for predator, entry in enumerate(entries + [hunter_entry]):
+            if predator < hunter_code and not entry.get("hunt_distance"):
+                continue
+            prey = entry.get("prey")
+            targets = [code[name] for name in prey] if prey is not None else range(hunter_code)
+            for target in targets:
+                if target != predator:
+                    self.eligible[predator][target] = 1
+
+        self.mating = [[int(a == b) for b in range(size)] for a in range(size)]
+        for a, entry in enumerate(entries):
+            for name in entry.get("mates", ()):
+                self.mating[a][code[name]] = self.mating[code[name]][a] = 1
+        rules = [(code[entry["offspring"]["Male"]], code[entry["offspring"]["Female"]]) if "offspring" in entry else None
+                 for entry in entries] + [None]
+        self.offspring = [[rules[a] or rules[b] or (a, a) for b in range(size)] for a in range(size)]
+        # Nesne motoru için aynı tablo, kodlar yerine tür üyeleriyle: `offspring_species[anne][baba]` = (erkek, dişi).
+        self.offspring_species = [[(self.members[male], self.members[female]) for male, female in row]
+                                  for row in self.offspring]
+        self.traits = [SpeciesTraits(move_distance, hunt_distance or None)
+                       for move_distance, hunt_distance in zip(self.move_distance, self.hunt_distance)]
+
+        self.animals_to_create: List[Tuple[Enum, int, str]] = []
+        self.initial_counts: Dict[Enum, int] = {}
+        for member, entry in zip(self.animals, entries):
+            initial = entry.get("initial", {})
+            for gender in GENDER_NAMES:
+                if initial.get(gender):
+                    self.animals_to_create.append((member, initial[gender], gender))
+            self.initial_counts[member] = sum(initial.values())
+        self.max_hunt_distance = max(self.hunt_distance[:hunter_code], default=0)
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any], species: Optional[Type[SpeciesEnum]] = None) -> 'Scenario':
+        """
+        Yapılandırmayı doğrular ve derler. `species` verilmezse türler için yeni bir `Species` Enum'u oluşturulur;
+        verilirse bir `SpeciesEnum` olmalı ve değerleri yapılandırmadaki tür adları ve en sonda `Hunter` olmalıdır.
+        """
+        _check_fields(config, {"species", "hunter"}, "scenario")
+        entries = config.get("species")
+        if not isinstance(entries, list) or not entries:
+            raise ScenarioError("scenario.species must be a non-empty list")
+        names: List[str] = []
+        for index, entry in enumerate(entries):
+            where = f"species[{index}]"
+            _check_fields(entry, SPECIES_FIELDS, where)
+            name = entry.get("name")
+            if not isinstance(name, str) or not _NAME.fullmatch(name):
+                raise ScenarioError(f"{where}.name must be an identifier, got {name!r}")
+            if name == HUNTER_NAME or name in names:
+                raise ScenarioError(f"{where}.name {name!r} is reserved or already used")
+            names.append(name)
+        for index, entry in enumerate(entries):
+            where = f"species[{index}] ({entry['name']})"
+            if "move_distance" not in entry:
+                raise ScenarioError(f"{where} is missing move_distance")
+            _integer(entry["move_distance"], f"{where}.move_distance", 0)
+            if entry.get("hunt_distance") is not None:
+                _integer(entry["hunt_distance"], f"{where}.hunt_distance", 1)
+            elif "prey" in entry:
+                raise ScenarioError(f"{where}.prey requires a hunt_distance")
+            if "priority" in entry:
+                _integer(entry["priority"], f"{where}.priority", 0)
+            if "prey" in entry:
+                _names(entry["prey"], f"{where}.prey", names)
+            if "mates" in entry:
+                _names(entry["mates"], f"{where}.mates", names)
+            if "offspring" in entry:
+                offspring = entry["offspring"]
+                _check_fields(offspring, set(GENDER_NAMES), f"{where}.offspring")
+                if set(offspring) != set(GENDER_NAMES):
+                    raise ScenarioError(f"{where}.offspring must name a species for both Male and Female")
+                _names(list(offspring.values()), f"{where}.offspring", names)
+            initial = entry.get("initial", {})
+            _check_fields(initial, set(GENDER_NAMES), f"{where}.initial")
+            for gender, count in initial.items():
+                _integer(count, f"{where}.initial.{gender}", 0)
+        hunter = config.get("hunter", {})
+        _check_fields(hunter, HUNTER_FIELDS, "hunter")
+        if "hunt_distance" in hunter:
+            _integer(hunter["hunt_distance"], "hunter.hunt_distance", 1)
+        if "priority" in hunter:
+            _integer(hunter["priority"], "hunter.priority", 0)
+        if "prey" in hunter:
+            _names(hunter["prey"], "hunter.prey", names)
+
+        values = names + [HUNTER_NAME]
+        if species is None:
+            species = SpeciesEnum("Species", [(value.upper(), value) for value in values])
+        elif [member.value for member in species] != values:
+            raise ScenarioError(f"{species.__name__} members do not match the configured species {values}")
+        return cls(json.loads(json.dumps(config)), species)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """`from_dict` ile aynı senaryoyu yeniden kuran yapılandırmanın bir kopyası."""
+        return json.loads(json.dumps(self.config))
+
+
+def load_scenario(path: str) -> Scenario:
+    """JSON senaryo dosyasını okur, doğrular ve derler."""
+    try:
+        with open(path, encoding="utf-8") as file:
+            config = json.load(file)
+    except json.JSONDecodeError as error:
+        raise ScenarioError(f"{path} is not valid JSON: {error}") from None
+    return Scenario.from_dict(config)
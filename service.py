@@ -0,0 +1,526 @@
+"""
+Birçok simülasyonu tek bir süreçte barındıran asyncio sunucusu.
+
+İstemciler yerel bir TCP veya Unix soketine satır başına bir JSON nesnesi gönderir ve her isteğe aynı `id` ile bir JSON
+satırı yanıt alır. İstekler aynı bağlantı üzerinden art arda gönderilebilir; yanıtlar tamamlandıkça döner.
+
+    {"id": 1, "op": "create", "board_size": 60, "seed": 3, "animals": [["Sheep", 10, "Male"], ["Sheep", 10, "Female"]]}
+    {"id": 2, "op": "step", "sim": "s1", "ticks": 20}
+    {"id": 3, "op": "counts", "sim": "s1"}
+    {"id": 4, "op": "snapshot", "sim": "s1"}
+    {"id": 5, "op": "destroy", "sim": "s1"}
+
+`create` isteğinde `"scenario"` alanı verilirse simülasyon bu yapılandırmadaki türlerle kurulur (biçimi için bkz.
+`scenario.py`); `animals` listesindeki tür adları da senaryonun türleridir.
+
+Başarılı yanıtlar `{"id": ..., "ok": true, "result": ...}`, hatalı istekler `{"id": ..., "ok": false, "error": "..."}`
+biçimindedir. İsteğe `"tenant"` alanı eklenebilir; verilmezse her bağlantı ayrı bir kiracı sayılır.
+
+Tur adımları olay döngüsünü bloklamamak için iş parçacığı havuzunda, `quantum` turluk dilimler halinde yürütülür.
+`FairScheduler` dilimleri kiracılar arasında sırayla (round-robin) dağıtır; uzun bir `step` isteği diğer kiracıların
+kısa isteklerini bekletmez. Saf Python turları GIL nedeniyle iş parçacıkları arasında paralel koşmaz; havuz, olay
+döngüsünün yanıt vermeye devam etmesini ve NumPy'nin GIL'i bıraktığı `engine="array"` adımlarının örtüşmesini sağlar.
+Bir simülasyonun adımı sürerken gelen `counts` ve `snapshot` istekleri adım dilimi bitene kadar bekler; böylece yarım
+kalmış bir tur okunmaz.
+
+Komut satırından kullanım:
+
+    python service.py --port 8765
+    python service.py --unix /tmp/zoo.sock
+    python service.py --load-test 200
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from events import NullEventSink
+from scenario import Scenario
+from simulation import GENDERS, Gender, Simulation
+
+DEFAULT_PORT = 8765
+# Anlık görüntü yanıtları büyük olabileceğinden istemci tarafında satır sınırı yüksek tutulur.
+LINE_LIMIT = 2 ** 26
+SERVICE_ENGINES = ("object", "array")
+
+
+class ServiceError(RuntimeError):
+    """İstek geçersiz olduğunda veya sunucu bir hata yanıtı döndürdüğünde fırlatılır."""
+
+
+class HostedSimulation:
+    """Sunucudaki bir simülasyon ve onun sahibi olan kiracı."""
+
+    def __init__(self, name: str, tenant: str, simulation: Simulation):
+        self.name = name
+        self.tenant = tenant
+        self.simulation = simulation
+        self.busy = False
+        self.closed = False
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+    def set_busy(self, busy: bool):
+        self.busy = busy
+        if busy:
+            self.idle.clear()
+        else:
+            self.idle.set()
+
+    async def wait_idle(self):
+        while self.busy:
+            await self.idle.wait()
+
+
+class StepJob:
+    def __init__(self, hosted: HostedSimulation, ticks: int, future: asyncio.Future):
+        self.hosted = hosted
+        self.remaining = ticks
+        self.done = 0
+        self.future = future
+
+
+def advance(simulation: Simulation, ticks: int) -> int:
+    """Simülasyonu en fazla `ticks` tur ilerletir; hareket sınırına ulaşılırsa erken durur. Yürütülen tur sayısı."""
+    done = 0
+    while done < ticks and simulation.total_movement < simulation.MAX_MOVEMENT:
+        simulation.step()
+        done += 1
+    return done
+
+
+class FairScheduler:
+    """
+    Adım isteklerini kiracı başına kuyruklarda tutar ve en fazla `workers` dilimi aynı anda havuzda çalıştırır. Her
+    dağıtımda sıradaki kiracının ilk uygun işi bir dilim (`quantum` tur) ilerletilir ve kiracı sıranın sonuna geçer.
+    Bir simülasyonun aynı anda yalnızca bir dilimi çalışır.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor, workers: int, quantum: int):
+        self.executor = executor
+        self.quantum = max(1, quantum)
+        self._slots = asyncio.Semaphore(workers)
+        self._queues: Dict[str, Deque[StepJob]] = {}
+        self._order: Deque[str] = deque()
+        self._work = asyncio.Event()
+        self._tasks = set()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def stop(self):
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, *self._tasks, return_exceptions=True)
+        for queue in self._queues.values():
+            for job in queue:
+                job.future.cancel()
+
+    def submit(self, tenant: str, hosted: HostedSimulation, ticks: int) -> asyncio.Future:
+        job = StepJob(hosted, ticks, asyncio.get_running_loop().create_future())
+        self._enqueue(tenant, job)
+        return job.future
+
+    def _enqueue(self, tenant: str, job: StepJob, front: bool = False):
+        queue = self._queues.get(tenant)
+        if queue is None:
+            queue = self._queues[tenant] = deque()
+            self._order.append(tenant)
+        if front:
+            queue.appendleft(job)
+        else:
+            queue.append(job)
+        self._work.set()
+
+    def _next_job(self) -> Optional[Tuple[str, StepJob]]:
+        for _ in range(len(self._order)):
+            tenant = self._order.popleft()
+            queue = self._queues[tenant]
+            job = next((job for job in queue if not job.hosted.busy), None)
+            if job is None:
+                self._order.append(tenant)
+                continue
+            queue.remove(job)
+            if queue:
+                self._order.append(tenant)
+            else:
+                del self._queues[tenant]
+            return tenant, job
+        return None
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._slots.acquire()
+            picked = self._next_job()
+            while picked is None:
+                self._work.clear()
+                await self._work.wait()
+                picked = self._next_job()
+            tenant, job = picked
+            job.hosted.set_busy(True)
+            task = loop.create_task(self._run_slice(tenant, job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_slice(self, tenant: str, job: StepJob):
+        hosted = job.hosted
+        ticks = min(self.quantum, job.remaining)
+        try:
+            if hosted.closed:
+                raise ServiceError(f"Simulation {hosted.name} was destroyed")
+            done = await asyncio.get_running_loop().run_in_executor(self.executor, advance, hosted.simulation, ticks)
+        except BaseException as error:
+            if not job.future.done():
+                job.future.set_exception(error)
+            return
+        finally:
+            hosted.set_busy(False)
+            self._slots.release()
+            self._work.set()
+        job.done += done
+        job.remaining = job.remaining - ticks if done == ticks else 0
+        if job.remaining > 0 and not job.future.done():
+            # İş, kiracının kuyruğunun başına döner; kiracı ise diğer kiracılardan sonra yeniden sıraya girer.
+            self._enqueue(tenant, job, front=True)
+        elif not job.future.done():
+            job.future.set_result(job.done)
+
+
+class SimulationServer:
+    """
+    Simülasyonları barındıran sunucu. `workers` adım dilimlerini yürüten iş parçacığı sayısı, `quantum` bir dilimdeki
+    tur sayısı, `max_simulations` aynı anda barındırılabilecek simülasyon sayısıdır.
+    """
+
+    def __init__(self, workers: Optional[int] = None, quantum: int = 5, max_simulations: int = 1024):
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.quantum = quantum
+        self.max_simulations = max_simulations
+        self.simulations: Dict[str, HostedSimulation] = {}
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="simulation")
+        self.scheduler: Optional[FairScheduler] = None
+        self._names = itertools.count(1)
+        self._connections = itertools.count(1)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, path: Optional[str] = None):
+        """Sunucuyu başlatır ve dinlenen adresi döndürür: Unix soketi için yol, TCP için (host, port)."""
+        self.scheduler = FairScheduler(self.executor, self.workers, self.quantum)
+        self.scheduler.start()
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._serve_connection, path)
+            return path
+        self._server = await asyncio.start_server(self._serve_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in list(self._handlers):
+            task.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self.scheduler is not None:
+            await self.scheduler.stop()
+        self.executor.shutdown(wait=True)
+        self.simulations.clear()
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        tenant = f"connection-{next(self._connections)}"
+        lock = asyncio.Lock()
+        pending = set()
+
+        async def answer(line: bytes):
+            request_id = None
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ServiceError("Request must be a JSON object")
+                request_id = request.get("id")
+                response = {"id": request_id, "ok": True,
+                            "result": await self.handle(request, str(request.get("tenant", tenant)))}
+            except Exception as error:  # hatalı istek bağlantıyı kapatmaz, hata yanıtı olarak döner
+                response = {"id": request_id, "ok": False, "error": f"{type(error).__name__}: {error}"}
+            async with lock:
+                writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+                await writer.drain()
+
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.get_running_loop().create_task(answer(line))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            await asyncio.gather(*pending, return_exceptions=True)
+        except (ConnectionError, asyncio.CancelledError):
+            for task in pending:
+                task.cancel()
+        finally:
+            self._handlers.discard(handler)
+            writer.close()
+
+    def _hosted(self, request: Dict[str, Any]) -> HostedSimulation:
+        hosted = self.simulations.get(request.get("sim"))
+        if hosted is None:
+            raise ServiceError(f"Unknown simulation: {request.get('sim')!r}")
+        return hosted
+
+    async def handle(self, request: Dict[str, Any], tenant: str) -> Any:
+        """Tek bir isteği yürütür ve yanıtın `result` alanını döndürür."""
+        op = request.get("op")
+        if op == "create":
+            return await self._create(request, tenant)
+        if op == "list":
+            return sorted(self.simulations)
+        hosted = self._hosted(request)
+        if op == "step":
+            ticks = int(request.get("ticks", 1))
+            if ticks < 0:
+                raise ServiceError("ticks must not be negative")
+            done = await self.scheduler.submit(tenant, hosted, ticks)
+            return {"tick": hosted.simulation.tick, "ticks": done,
+                    "finished": hosted.simulation.total_movement >= hosted.simulation.MAX_MOVEMENT}
+        if op == "counts":
+            await hosted.wait_idle()
+            simulation = hosted.simulation
+            return {"tick": simulation.tick,
+                    "counts": {species.value: values for species, values in simulation.results().items()}}
+        if op == "snapshot":
+            await hosted.wait_idle()
+            return snapshot(hosted.simulation)
+        if op == "destroy":
+            hosted.closed = True
+            del self.simulations[hosted.name]
+            await hosted.wait_idle()
+            return {"sim": hosted.name}
+        raise ServiceError(f"Unknown op: {op!r}")
+
+    async def _create(self, request: Dict[str, Any], tenant: str) -> Dict[str, str]:
+        if len(self.simulations) >= self.max_simulations:
+            raise ServiceError(f"Server already hosts {self.max_simulations} simulations")
+        board_size = int(request.get("board_size", 100))
+        if not 1 <= board_size <= 10000:
+            raise ServiceError(f"board_size must be between 1 and 10000, got {board_size}")
+        engine = request.get("engine", "object")
+        if engine not in SERVICE_ENGINES:
+            raise ServiceError(f"engine must be one of {SERVICE_ENGINES}, got {engine!r}")
+        seed = request.get("seed")
+        scenario = Scenario.from_dict(request["scenario"]) if request.get("scenario") is not None else None
+        simulation = Simulation(board_size=board_size, event_sink=NullEventSink(), engine=engine,
+                                seed=None if seed is None else int(seed), scenario=scenario)
+        animals = None
+        if request.get("animals") is not None:
+            animals = [(simulation.scenario.species(species), int(count), Gender(gender))
+                       for species, count, gender in request["animals"]]
+            if any(count < 0 for _, count, _ in animals):
+                raise ServiceError("animal counts must not be negative")
+        if animals is not None:
+            simulation.animals_to_create = animals
+        if request.get("max_movement") is not None:
+            simulation.MAX_MOVEMENT = int(request["max_movement"])
+        name = f"s{next(self._names)}"
+        hosted = HostedSimulation(name, tenant, simulation)
+        self.simulations[name] = hosted
+        hosted.set_busy(True)
+        try:
+            await asyncio.get_running_loop().run_in_executor(self.executor, simulation.populate)
+        except BaseException:
+            del self.simulations[name]
+            raise
+        finally:
+            hosted.set_busy(False)
+        return {"sim": name}
+
+
+def snapshot(simulation: Simulation) -> Dict[str, Any]:
+    """Simülasyonun tahtasının JSON'a çevrilebilir görüntüsü: her hayvan için [id, tür, cinsiyet, x, y]."""
+    species = simulation.scenario.members
+    ids, xs, ys, species_codes, gender_codes = simulation.export_entities()
+    return {
+        "tick": simulation.tick,
+        "board_size": simulation.board_size,
+        "total_movement": simulation.total_movement,
+        "hunter": [simulation.hunter.x, simulation.hunter.y],
+        "animals": [[int(entity_id), species[code].value, GENDERS[gender].value, int(x), int(y)]
+                    for entity_id, x, y, code, gender in zip(ids, xs, ys, species_codes, gender_codes)],
+    }
+
+
+class SimulationClient:
+    """Sunucuya tek bağlantı üzerinden istek gönderen istemci; aynı anda birden fazla istek beklenebilir."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                      path: Optional[str] = None) -> 'SimulationClient':
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=LINE_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+        return cls(reader, writer)
+
+    async def _listen(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if response["ok"]:
+                    future.set_result(response["result"])
+                else:
+                    future.set_exception(ServiceError(response["error"]))
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection to simulation server closed"))
+            self._pending.clear()
+
+    async def request(self, op: str, **fields) -> Any:
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(json.dumps({"id": request_id, "op": op, **fields}, separators=(",", ":")).encode() + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def create(self, **fields) -> str:
+        return (await self.request("create", **fields))["sim"]
+
+    async def step(self, sim: str, ticks: int = 1, **fields) -> Dict[str, Any]:
+        return await self.request("step", sim=sim, ticks=ticks, **fields)
+
+    async def counts(self, sim: str) -> Dict[str, Any]:
+        return await self.request("counts", sim=sim)
+
+    async def snapshot(self, sim: str) -> Dict[str, Any]:
+        return await self.request("snapshot", sim=sim)
+
+    async def destroy(self, sim: str):
+        await self.request("destroy", sim=sim)
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._listener.cancel()
+        await asyncio.gather(self._listener, return_exceptions=True)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else float("nan")
+
+
+async def load_test(client: SimulationClient, simulations: int = 100, ticks: int = 10, board_size: int = 60,
+                    probe_interval: float = 0.01) -> Dict[str, float]:
+    """
+    `simulations` simülasyonu her biri ayrı bir kiracı olarak kurar ve hepsini aynı anda `ticks` tur ilerletir. Adımlar
+    sürerken `probe_interval` aralıklarla hafif `list` istekleri gönderilir; bunların gecikmesi, yoğun yük altında
+    sunucunun yanıt süresini ölçer. Sonunda simülasyonlar silinir.
+    """
+    start = time.perf_counter()
+    names = await asyncio.gather(*(client.create(board_size=board_size, seed=index, tenant=f"tenant-{index}")
+                                   for index in range(simulations)))
+    created = time.perf_counter()
+    stepping = asyncio.gather(*(client.step(name, ticks, tenant=f"tenant-{index}") for index, name in enumerate(names)))
+    latencies = []
+    while not stepping.done():
+        probe = time.perf_counter()
+        await client.request("list")
+        latencies.append(time.perf_counter() - probe)
+        await asyncio.sleep(probe_interval)
+    await stepping
+    stepped = time.perf_counter()
+    await asyncio.gather(*(client.destroy(name) for name in names))
+    return {
+        "simulations": simulations,
+        "create_seconds": created - start,
+        "step_seconds": stepped - created,
+        "ticks_per_second": simulations * ticks / (stepped - created) if stepped > created else float("inf"),
+        "probes": len(latencies),
+        "latency_p50_ms": 1000 * _percentile(latencies, 0.5) if latencies else 0.0,
+        "latency_p95_ms": 1000 * _percentile(latencies, 0.95) if latencies else 0.0,
+        "latency_max_ms": 1000 * max(latencies) if latencies else 0.0,
+        "latency_mean_ms": 1000 * statistics.fmean(latencies) if latencies else 0.0,
+    }
+
+
+async def _run_load_test(simulations: int, ticks: int, board_size: int, workers: Optional[int], quantum: int):
+    server = SimulationServer(workers=workers, quantum=quantum, max_simulations=simulations)
+    host, port = await server.start(port=0)
+    client = await SimulationClient.connect(host, port)
+    try:
+        return await load_test(client, simulations, ticks, board_size)
+    finally:
+        await client.close()
+        await server.close()
+
+
+async def _serve(args):
+    server = SimulationServer(workers=args.workers, quantum=args.quantum, max_simulations=args.max_simulations)
+    address = await server.start(args.host, args.port, args.unix)
+    print(f"Serving simulations on {address}", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Host many simulations in one process behind a JSON-lines socket.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="threads that run simulation steps")
+    parser.add_argument("--quantum", type=int, default=5, help="ticks per scheduling slice")
+    parser.add_argument("--max-simulations", type=int, default=1024)
+    parser.add_argument("--load-test", type=int, default=None, metavar="SIMULATIONS",
+                        help="start an in-process server, step SIMULATIONS simulations at once and report latency")
+    parser.add_argument("--ticks", type=int, default=10, help="ticks per simulation in --load-test")
+    parser.add_argument("--board-size", type=int, default=60, help="board size in --load-test")
+    args = parser.parse_args(argv)
+
+    if args.load_test:
+        result = asyncio.run(_run_load_test(args.load_test, args.ticks, args.board_size, args.workers, args.quantum))
+        print(json.dumps(result, indent=2))
+        return 0
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
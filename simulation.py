@@ -1,8 +1,20 @@
 from __future__ import annotations
 import random
 import math
+import threading
+import time
+from array import array
 from enum import Enum
-from typing import Optional, Tuple, Dict, List
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Optional, Set, Tuple, Dict, Iterator, List
+from events import BufferedEventSink, DeltaSink, Event, EventKind, EventSink, TickDelta
+from metrics import SimulationMetrics
+from placement import FreeCells, ring_offsets
+from scenario import DEFAULT_CONFIG, Scenario, SpeciesEnum
+
+if TYPE_CHECKING:
+    from frames import FrameRing
+    from recorder import PopulationRecorder
 
 class Direction(Enum):
     NORTH = (0, -1)
@@ -10,7 +22,7 @@ class Direction(Enum):
     EAST = (1, 0)
     WEST = (-1, 0)
 
-class Species(Enum):
+class Species(SpeciesEnum):
     SHEEP = "Sheep"
     COW = "Cow"
     WOLF = "Wolf"
@@ -19,37 +31,84 @@ class Species(Enum):
     ROOSTER = "Rooster"
     HUNTER = "Hunter"
 
+class Gender(str, Enum):
+    """
+    Hayvan cinsiyeti. Üyeler tekil nesneler olduğundan her hayvan yalnızca bir referans tutar; `str` tabanlı olduğu için
+    "Male"/"Female" dizgileriyle karşılaştırma eskisi gibi çalışır.
+    """
+    MALE = "Male"
+    FEMALE = "Female"
+
+GENDERS = (Gender.MALE, Gender.FEMALE)
+
+# Yerleşik türlerin kuralları; tablolar tür koduyla okunur (ör. `DEFAULT_SCENARIO.priority[Species.LION.code]`).
+DEFAULT_SCENARIO = Scenario.from_dict(DEFAULT_CONFIG, Species)
+
 class MovableEntity:
+    """
+    Tahtada hareket eden varlıkların temel sınıfı. Bellek kullanımını düşük tutmak için `__slots__` kullanılır; tahta
+    boyutu ve simülasyon varlıkta saklanmaz, gerektiğinde metotlara `simulation` parametresiyle geçirilir.
+    """
+    __slots__ = ("id", "x", "y")
     id_counter = 0
-
-    def __init__(self, x: int, y: int, board_size: int, move_distance: int):
-        MovableEntity.id_counter += 1
-        self.id = MovableEntity.id_counter
+    _id_lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        # Doğrudan oluşturulan `MovableEntity`, verilen hareket mesafesini saklayabilmesi için `FixedRangeEntity`
+        # örneği olur; hayvanlar mesafeyi senaryodan okuduğu için bu alanı taşımaz.
+        if cls is MovableEntity:
+            cls = FixedRangeEntity
+        return super().__new__(cls)
+
+    def __init__(self, x: int, y: int, board_size: Optional[int] = None, move_distance: Optional[int] = None,
+                 simulation: Optional['Simulation'] = None):
+        # `board_size` geriye dönük uyumluluk için kabul edilir. Hayvanlar hareket mesafesini tür kaydından okuduğu için
+        # `move_distance` vermez. `simulation` verilirse ID simülasyonun kendi sayacından ayrılır.
+        self.id = MovableEntity.allocate_ids() if simulation is None else simulation.allocate_ids()
         self.x = x
         self.y = y
-        self.board_size = board_size
-        self.move_distance = move_distance
+        if move_distance is not None:
+            self.move_distance = move_distance
+
+    @staticmethod
+    def allocate_ids(count: int = 1) -> int:
+        """
+        Simülasyona bağlı olmadan oluşturulan varlıklar için süreç genelindeki sayaçtan `count` ardışık ID ayırır ve
+        ilkini döndürür. Sayaç birden fazla iş parçacığından kullanılabileceği için kilitle artırılır; simülasyonların
+        kendi varlıkları `Simulation.allocate_ids` ile simülasyon başına sayaçtan ID alır.
+        """
+        with MovableEntity._id_lock:
+            first = MovableEntity.id_counter + 1
+            MovableEntity.id_counter += count
+        return first
 
     def move(self, simulation: 'Simulation', max_movement: Optional[int] = None):
         """
         Varlığı hareket mesafesi kadar hareket ettirir. Her bir hareket biriminde, varlığın yeni bir yönde hareket etme
         olasılığı vardır, yani varlık her adımda farklı bir yön seçebilir.
         """
-        move_distance = self.move_distance if max_movement is None else min(self.move_distance, max_movement)
+        move_distance = self.move_range(simulation)
+        if max_movement is not None:
+            move_distance = min(move_distance, max_movement)
         for _ in range(move_distance):
             direction = self.find_valid_direction(simulation)
             if direction is None:
+                if simulation.metrics is not None:
+                    simulation.metrics.current.blocked_moves += 1
                 break
             dx, dy = direction.value
-            self.update_position(dx, dy)
-            simulation.update_all_positions_dict()
+            simulation.relocate(self, dx, dy)
+
+    def move_range(self, simulation: 'Simulation') -> int:
+        """Varlığın bu simülasyondaki hareket mesafesi."""
+        return self.move_distance
 
     def find_valid_direction(self, simulation: 'Simulation') -> Optional[Direction]:
         """
         Varlığın hareket edebileceği geçerli bir yön döndürür.
         """
         valid_directions = [direction for direction in Direction if self.is_valid_move(simulation, direction)]
-        return random.choice(valid_directions) if valid_directions else None
+        return simulation.rng.choice(valid_directions) if valid_directions else None
 
     def is_valid_move(self, simulation: 'Simulation', direction: Direction) -> bool:
         """
@@ -59,8 +118,9 @@ class MovableEntity:
         dx, dy = direction.value
         new_x = self.x + dx
         new_y = self.y + dy
-        return (0 <= new_x < self.board_size and
-                0 <= new_y < self.board_size and
+        board_size = simulation.board_size
+        return (0 <= new_x < board_size and
+                0 <= new_y < board_size and
                 simulation.is_position_available(new_x, new_y, self.id))
 
     def update_position(self, dx: int, dy: int):
@@ -68,35 +128,40 @@ class MovableEntity:
         self.x += dx
         self.y += dy
 
+class FixedRangeEntity(MovableEntity):
+    """Hareket mesafesini kendi üzerinde saklayan varlıklar (avcı ve doğrudan oluşturulan `MovableEntity`)."""
+    __slots__ = ("move_distance",)
+
 class Animal(MovableEntity):
-    species_attributes = {
-        Species.SHEEP: {"move_distance": 2, "hunt_distance": None},
-        Species.COW: {"move_distance": 2, "hunt_distance": None},
-        Species.WOLF: {"move_distance": 3, "hunt_distance": 4},
-        Species.LION: {"move_distance": 4, "hunt_distance": 5},
-        Species.CHICKEN: {"move_distance": 1, "hunt_distance": None},
-        Species.ROOSTER: {"move_distance": 1, "hunt_distance": None}
-    }
-
-    def __init__(self, x: int, y: int, gender: str, species: Species, board_size: int, simulation: 'Simulation'):
-        attributes = Animal.species_attributes[species]
-        super().__init__(x, y, board_size, attributes["move_distance"])
-        self.gender = gender
+    __slots__ = ("gender", "species")
+    # Hareket ve avlanma mesafeleri hayvan başına kopyalanmaz; simülasyon bunları kendi senaryosunun tür koduna göre
+    # indekslenen tablolarından okur (`move_range`, `scenario.hunt_distance`). Aynı `Species` Enum'u birden fazla
+    # senaryoda kullanılabildiği için hayvan mesafelerini kendisi bilmez. Aşağıdaki tablolar yalnızca yerleşik türlerin
+    # `DEFAULT_SCENARIO` değerlerinin salt okunur görünümleridir; tür kuralları `Scenario` ile değiştirilir.
+    species_traits = MappingProxyType({species: DEFAULT_SCENARIO.traits[species.code]
+                                       for species in DEFAULT_SCENARIO.animals})
+    species_attributes = MappingProxyType({species: MappingProxyType(traits._asdict())
+                                           for species, traits in species_traits.items()})
+
+    def __init__(self, x: int, y: int, gender: str, species: Species, board_size: Optional[int] = None,
+                 simulation: Optional['Simulation'] = None):
+        super().__init__(x, y, simulation=simulation)
+        self.gender = Gender(gender)
         self.species = species
-        self.hunt_distance = attributes["hunt_distance"]
-        self.simulation = simulation
 
+    def move_range(self, simulation: 'Simulation') -> int:
+        return simulation.scenario.move_distance[self.species.code]
 
-    def is_compatible_for_reproduction(self, other: 'Animal') -> bool:
+    def is_compatible_for_reproduction(self, other: 'Animal', scenario: Optional[Scenario] = None) -> bool:
         """
         İki hayvanın üreme için uyumlu olup olmadığını kontrol eder. Farklı cinsiyetlerdeki aynı tür hayvanlar üreme için uyumludur.
-        Özel bir durum olarak, tavuklar ve horozlar arasında tür farklılığına rağmen üreme uyumluluğu vardır.
+        Özel bir durum olarak, tavuklar ve horozlar arasında tür farklılığına rağmen üreme uyumluluğu vardır. Uyumluluk
+        `scenario` (verilmezse yerleşik türlerin senaryosu) üreme tablosundan okunur.
         """
         if self.gender == other.gender:
             return False
-        if self.species in [Species.CHICKEN, Species.ROOSTER] and other.species in [Species.CHICKEN, Species.ROOSTER]:
-            return True
-        return self.species == other.species
+        scenario = DEFAULT_SCENARIO if scenario is None else scenario
+        return bool(scenario.mating[self.species.code][other.species.code])
 
     def reproduce(self, partner: 'Animal', simulation: 'Simulation') -> Optional['Animal']:
         """
@@ -106,75 +171,374 @@ class Animal(MovableEntity):
         aynı tür hayvanlar ve özel durum olarak tavuk ve horoz arasında gerçekleşebilir.
         """
        
-        if not self.is_compatible_for_reproduction(partner):
+        if not self.is_compatible_for_reproduction(partner, simulation.scenario):
             return None
 
         # Ebeveynlerin konumunu merkez alarak uygun bir doğum pozisyonu bul
         birth_x, birth_y = simulation.find_birth_position((self.x + partner.x) // 2, (self.y + partner.y) // 2, radius=4)
 
         if birth_x is not None and birth_y is not None:
-            gender = random.choice(["Male", "Female"])
-            # Eğer üreme Chicken veya Rooster arasında ise, yeni doğanın türünü cinsiyete göre belirle
-            if self.species == Species.CHICKEN or partner.species == Species.CHICKEN:
-                species = Species.CHICKEN if gender == "Female" else Species.ROOSTER
-            else:
-                species = self.species
+            gender = simulation.rng.choice(GENDERS)
+            # Yavrunun türü senaryonun yavru tablosundan cinsiyete göre seçilir (ör. Chicken ile Rooster arasında dişi
+            # yavru Chicken, erkek yavru Rooster olur).
+            male_species, female_species = simulation.scenario.offspring_species[self.species.code][partner.species.code]
+            species = female_species if gender is Gender.FEMALE else male_species
             # Yeni doğan hayvanı oluştur ve döndür
-            return Animal(birth_x, birth_y, gender, species, simulation.board_size, self.simulation)
+            return Animal(birth_x, birth_y, gender, species, simulation=simulation)
         return None
 
-class Hunter(MovableEntity):
-    def __init__(self, x: int, y: int, board_size: int, hunt_distance: int = 8):
-        super().__init__(x, y, board_size, move_distance=1)
+class Hunter(FixedRangeEntity):
+    __slots__ = ("hunt_distance", "species")
+    gender = None
+
+    def __init__(self, x: int, y: int, board_size: Optional[int] = None, hunt_distance: int = 8,
+                 species: Optional[Species] = None, simulation: Optional['Simulation'] = None):
+        super().__init__(x, y, board_size, 1, simulation)
         self.hunt_distance = hunt_distance
-        self.species = Species.HUNTER
+        # Özel senaryolarda avcı, senaryonun kendi `Species` Enum'undaki `Hunter` üyesidir.
+        self.species = Species.HUNTER if species is None else species
 
     
+class SpatialGrid:
+    """
+    Tahtayı `cell_size` kenarlı kovalara bölen tekdüze ızgara (spatial hash). Her kova, o bölgedeki varlıkları ID'lerine
+    göre tutar; böylece "(x, y) noktasına r mesafedeki varlıklar" sorgusu tüm popülasyon yerine yalnızca komşu kovaları tarar.
+    """
+
+    def __init__(self, cell_size: int):
+        self.cell_size = max(1, cell_size)
+        self.buckets: Dict[Tuple[int, int], Dict[int, MovableEntity]] = {}
+
+    def bucket_of(self, x: int, y: int) -> Tuple[int, int]:
+        return x // self.cell_size, y // self.cell_size
+
+    def add(self, entity: MovableEntity):
+        self.buckets.setdefault(self.bucket_of(entity.x, entity.y), {})[entity.id] = entity
+
+    def remove(self, entity: MovableEntity):
+        key = self.bucket_of(entity.x, entity.y)
+        bucket = self.buckets.get(key)
+        if bucket is not None and bucket.get(entity.id) is entity:
+            del bucket[entity.id]
+            if not bucket:
+                del self.buckets[key]
+
+    def move(self, entity: MovableEntity, old_x: int, old_y: int):
+        """Varlık (old_x, old_y) konumundan şu anki konumuna geçtiyse gerekirse kovasını değiştirir."""
+        old_key = self.bucket_of(old_x, old_y)
+        new_key = self.bucket_of(entity.x, entity.y)
+        if old_key == new_key:
+            return
+        bucket = self.buckets.get(old_key)
+        if bucket is not None and bucket.get(entity.id) is entity:
+            del bucket[entity.id]
+            if not bucket:
+                del self.buckets[old_key]
+        self.buckets.setdefault(new_key, {})[entity.id] = entity
+
+    def query(self, x: int, y: int, radius: float, species=None, gender: Optional[str] = None) -> List[MovableEntity]:
+        """
+        (x, y) noktasına öklid mesafesi `radius` veya daha az olan varlıkları ID sırasıyla döndürür. `species` tek bir tür
+        ya da türler kümesi olabilir; `gender` verilirse yalnızca o cinsiyetteki varlıklar döner.
+        """
+        if species is not None and isinstance(species, Enum):
+            species = (species,)
+        reach = int(radius)
+        radius_squared = radius * radius
+        min_bx, min_by = self.bucket_of(x - reach, y - reach)
+        max_bx, max_by = self.bucket_of(x + reach, y + reach)
+        found = []
+        for bx in range(min_bx, max_bx + 1):
+            for by in range(min_by, max_by + 1):
+                bucket = self.buckets.get((bx, by))
+                if bucket is None:
+                    continue
+                for entity in bucket.values():
+                    if (entity.x - x) ** 2 + (entity.y - y) ** 2 > radius_squared:
+                        continue
+                    if species is not None and entity.species not in species:
+                        continue
+                    if gender is not None and getattr(entity, "gender", None) != gender:
+                        continue
+                    found.append(entity)
+        found.sort(key=lambda entity: entity.id)
+        return found
+
+    def query_for(self, owner: MovableEntity, radius: float, species=None,
+                  gender: Optional[str] = None) -> List[MovableEntity]:
+        """`owner` varlığının konumundan `query` yapar."""
+        return self.query(owner.x, owner.y, radius, species, gender)
+
+
+class IncrementalGrid(SpatialGrid):
+    """
+    Sorgu sonuçlarını önbelleğe alan ızgara. Her ekleme, çıkarma ve hareket, etkilediği kovaları değişmiş olarak
+    işaretler; her kova, kendisini tarayan önbellek kayıtlarını bilir. Bir sonraki sorguda yalnızca değişen kovaları
+    tarayan kayıtlar silinir, diğer sahiplerin önceki sonucu tek bir sözlük aramasıyla aynen döner. Böylece yeniden
+    hesaplanan sorgular, değişen bölgeleri tarayan sahiplerle sınırlıdır. Sonuçlar her zaman `SpatialGrid.query` ile
+    aynıdır.
+
+    Önbellek `caching` açıkken kullanılır. Hareket sürerken neredeyse her kova her tur değiştiğinden simülasyon önbelleği
+    ancak hareket hakkı bittiğinde açar; kapalıyken sorgular doğrudan hesaplanır ve değişiklikler izlenmez.
+    """
+
+    def __init__(self, cell_size: int):
+        super().__init__(cell_size)
+        self.caching = False
+        # Son sorgudan beri değişen kovalar.
+        self.dirty: Set[Tuple[int, int]] = set()
+        # Kova -> o kovayı tarayan önbellek kayıtları (sahip ID, sorgu anahtarı).
+        self.watchers: Dict[Tuple[int, int], Set[Tuple[int, tuple]]] = {}
+        # Sahip ID -> (yarıçap, tür, cinsiyet) -> (taranan kovalar, sonuç)
+        self.cache: Dict[int, Dict[tuple, tuple]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def set_caching(self, enabled: bool):
+        """Önbelleği açar veya kapatır; kapatılınca önbellekteki tüm kayıtlar silinir."""
+        if enabled == self.caching:
+            return
+        self.caching = enabled
+        if not enabled:
+            self.dirty.clear()
+            self.watchers.clear()
+            self.cache.clear()
+
+    def touch(self, x: int, y: int):
+        if self.caching:
+            self.dirty.add(self.bucket_of(x, y))
+
+    def add(self, entity: MovableEntity):
+        self.touch(entity.x, entity.y)
+        super().add(entity)
+
+    def remove(self, entity: MovableEntity):
+        self.touch(entity.x, entity.y)
+        for key, (buckets, _) in self.cache.pop(entity.id, {}).items():
+            self._unwatch(entity.id, key, buckets)
+        super().remove(entity)
+
+    def move(self, entity: MovableEntity, old_x: int, old_y: int):
+        # Kova değişmese de kovadaki konum değiştiği için mesafe sorgularının sonucu değişebilir. Sahibin kendi kovası
+        # taradığı bölgede olduğundan yerinden oynayan varlığın kendi kayıtları da böylece geçersiz olur.
+        self.touch(old_x, old_y)
+        self.touch(entity.x, entity.y)
+        super().move(entity, old_x, old_y)
+
+    def _unwatch(self, owner_id: int, key: tuple, buckets: List[Tuple[int, int]]):
+        watchers = self.watchers
+        for bucket in buckets:
+            owners = watchers.get(bucket)
+            if owners is not None:
+                owners.discard((owner_id, key))
+                if not owners:
+                    del watchers[bucket]
+
+    def _invalidate(self):
+        """Değişen kovaları tarayan kayıtları siler."""
+        cache = self.cache
+        for bucket in self.dirty:
+            for owner_id, key in self.watchers.pop(bucket, ()):
+                buckets, _ = cache[owner_id].pop(key)
+                self._unwatch(owner_id, key, buckets)
+        self.dirty.clear()
+
+    def query_for(self, owner: MovableEntity, radius: float, species=None,
+                  gender: Optional[str] = None) -> List[MovableEntity]:
+        """`owner` varlığının önceki sorgusunun taradığı kovalar o sorgudan sonra değişmediyse önceki sonucu döndürür."""
+        if not self.caching:
+            self.misses += 1
+            return self.query(owner.x, owner.y, radius, species, gender)
+        if self.dirty:
+            self._invalidate()
+        # Tür kümesi önbellek anahtarında kullanıldığı için hashlenebilir bir kümeye çevrilir.
+        if species is not None and not isinstance(species, Enum):
+            species = frozenset(species)
+        key = (radius, species, gender)
+        entries = self.cache.get(owner.id)
+        if entries is None:
+            entries = self.cache[owner.id] = {}
+        else:
+            entry = entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[1]
+        self.misses += 1
+        x, y = owner.x, owner.y
+        found = self.query(x, y, radius, species, gender)
+        reach = int(radius)
+        min_bx, min_by = self.bucket_of(x - reach, y - reach)
+        max_bx, max_by = self.bucket_of(x + reach, y + reach)
+        buckets = [(bx, by) for bx in range(min_bx, max_bx + 1) for by in range(min_by, max_by + 1)]
+        entries[key] = (buckets, found)
+        watcher = (owner.id, key)
+        for bucket in buckets:
+            self.watchers.setdefault(bucket, set()).add(watcher)
+        return found
+
+
 class Simulation:
     MAX_MOVEMENT = 1000
-    NUM_ANIMALS = {
-        Species.SHEEP: 30,
-        Species.COW: 10,
-        Species.WOLF: 10,
-        Species.LION: 8,
-        Species.CHICKEN: 10,
-        Species.ROOSTER: 10
-    }
+    NUM_ANIMALS = dict(DEFAULT_SCENARIO.initial_counts)
     REPRODUCTION_DISTANCE = 3
-
-    def __init__(self, board_size: int = 500):
+    OUTPUT_FILE = "simulation_output.txt"
+    ENGINES = ("object", "array", "parallel")
+    ENGINE = "object"
+    # Tahtanın bu oranından fazlası doluysa boş pozisyonlar rastgele deneme yerine `FreeCells` kümesinden seçilir.
+    DENSE_FILL = 0.5
+
+    def __new__(cls, *args, engine: str = "object", **kwargs):
+        # engine="array" seçildiğinde NumPy tabanlı ArraySimulation örneği oluşturulur.
+        if engine not in cls.ENGINES:
+            raise ValueError(f"Unknown simulation engine: {engine!r} (expected one of {cls.ENGINES})")
+        if engine == "array" and cls is Simulation:
+            from array_engine import ArraySimulation
+            cls = ArraySimulation
+        elif engine == "parallel" and cls is Simulation:
+            from parallel import ParallelSimulation
+            cls = ParallelSimulation
+        return super().__new__(cls)
+
+    def __init__(self, board_size: int = 500, event_sink: Optional[EventSink] = None, engine: str = "object",
+                 seed: Optional[int] = None, metrics: Optional[SimulationMetrics] = None,
+                 recorder: Optional['PopulationRecorder'] = None, incremental: bool = False,
+                 frames: Optional['FrameRing'] = None, scenario: Optional[Scenario] = None):
+        """
+        `event_sink` verilirse hareket, doğum ve avlanma olayları bu yazıcıya gönderilir. Verilmezse `run` olayları metin
+        biçiminde `OUTPUT_FILE` dosyasına yazar; `NullEventSink` ile olay kaydı tamamen kapatılabilir. `engine="array"`
+        hayvanları NumPy dizilerinde tutan ve tur adımlarını toplu dizi işlemleriyle yürüten motoru, `engine="parallel"`
+        tahtayı şeritlere bölüp tur adımlarını süreç havuzunda yürüten motoru seçer.
+
+        Simülasyonun tüm rastgele seçimleri kendi `rng` nesnesinden yapılır. `seed` verilirse aynı tohumla yapılan
+        çalışmalar aynı sonucu verir; verilmezse tohum global `random` modülünden çekilir. `metrics` verilirse her tur
+        için adım süreleri ve sayaçlar bu nesnede toplanır. `recorder` verilirse yerleştirmeden sonra ve her turun sonunda
+        tür/cinsiyet bazında nüfus, doğum, avlanma ve avcı türüne göre av sayıları bu kaydediciye bir satır olarak eklenir.
+        `incremental=True` (yalnızca nesne motoru) avlanma ve üreme aday listelerini `IncrementalGrid` ile önbelleğe
+        alır; sonuçlar tam hesaplamayla aynıdır. Her kova kendisini tarayan aday listelerini bilir; bir turda yalnızca
+        hareket, doğum veya ölüm olan kovaları tarayan listeler yeniden hesaplanır, diğerleri tek bir sözlük aramasıyla
+        döner. Hareket sürerken neredeyse her kova her tur değiştiği için önbellek hareket hakkı bittiğinde devreye girer;
+        o zamana kadar tam hesaplamayla aynı hızdadır. `frames`
+        verilirse yerleştirmeden sonra ve her turun sonunda tahtanın bir karesi bu halka tampona yazılır. `scenario`
+        verilirse türler, başlangıç nüfusu ve avlanma/üreme kuralları yerleşik türler yerine bu senaryodan alınır
+        (bkz. `scenario.load_scenario`).
+        """
+        self.rng = random.Random(seed if seed is not None else random.getrandbits(64))
         self.board_size = board_size
+        self.event_sink = event_sink
+        self.metrics = metrics
+        self.recorder = recorder
+        self.frames = frames
+        self.grid_class = IncrementalGrid if incremental else SpatialGrid
+        self.scenario = DEFAULT_SCENARIO if scenario is None else scenario
+        if scenario is not None:
+            self.NUM_ANIMALS = dict(scenario.initial_counts)
+        self.tick = 0
         self.animals: List[Animal] = []
         self.total_movement = 0
         self.hunted_counts: Dict[Species, int] = {species: 0 for species in self.NUM_ANIMALS.keys()}
         self.born_counts: Dict[Species, int] = {species: 0 for species in self.NUM_ANIMALS.keys()}
+        # Avcı türü (avcı dahil) -> o türün avladığı hayvan sayısı.
+        self.kill_counts: Dict[Species, int] = {}
+        # Yaşayan hayvanların (tür, cinsiyet) bazında sayısı; doğum, ekleme ve avlanmalarda güncellenir, listeden yeniden
+        # sayılmaz.
+        self.population: Dict[Tuple[Species, Gender], int] = {}
+        # Son ayrılan varlık ID'si. Sayaç simülasyona aittir; aynı tohumla kurulan simülasyonlar (veya aynı kontrol
+        # noktasından yüklenen kopyalar) birbirinin ID'lerini etkilemeden aynı ID'leri üretir.
+        self.id_counter = 0
         #self.add_hunter()
 
-        self.hunter = Hunter(random.randint(0, board_size - 1), random.randint(0, board_size - 1), board_size)
-        self.animals_to_create = [
-            (Species.SHEEP, 15, "Male"), (Species.SHEEP, 15, "Female"),
-            (Species.COW, 5, "Male"), (Species.COW, 5, "Female"),
-            (Species.WOLF, 5, "Male"), (Species.WOLF, 5, "Female"),
-            (Species.LION, 4, "Male"), (Species.LION, 4, "Female"),
-            (Species.CHICKEN, 10, "Female"),
-            (Species.ROOSTER, 10, "Male")
-        ]
+        self.hunter = Hunter(self.rng.randint(0, board_size - 1), self.rng.randint(0, board_size - 1), board_size,
+                             self.scenario.hunter_distance, self.scenario.hunter, simulation=self)
+        # Hücre -> varlık eşlemesi. Avcı dahil tüm varlıkların pozisyonlarını tutar, böylece doluluk kontrolü O(1) olur.
+        self.occupancy: Dict[Tuple[int, int], MovableEntity] = {}
+        self._indexed_animals: Optional[List[Animal]] = None
+        self._indexed_count = 0
+        self._indexed_hunter: Optional[Hunter] = None
+        # Avlanma ve üreme için mesafe sorguları; kova boyutu en büyük etkileşim yarıçapına göre seçilir.
+        self.grid = self.grid_class(self.interaction_radius())
+        self.entities_by_id: Dict[int, MovableEntity] = {}
+        # Boş hücreler kümesi; yalnızca dolu tahtada yerleştirme gerektiğinde kurulur, kurulduktan sonra hareket, doğum
+        # ve avlanmalarda güncel tutulur.
+        self.free_cells: Optional[FreeCells] = None
+        self.animals_to_create = list(self.scenario.animals_to_create)
+
+    def allocate_ids(self, count: int = 1) -> int:
+        """Simülasyonun sayacından `count` ardışık ID ayırır ve ilkini döndürür."""
+        first = self.id_counter + 1
+        self.id_counter += count
+        return first
 
     def update_all_positions_dict(self):
-        """Tüm varlıkların mevcut pozisyonlarını günceller."""
-        self.positions = {entity.id: (entity.x, entity.y) for entity in self.animals}
-
+        """
+        Doluluk indeksini (`occupancy`) hayvanlar listesi ve avcıdan sıfırdan yeniden kurar. Simülasyon kendi yaptığı
+        hareket, doğum ve ölümlerde indeksi zaten güncel tuttuğu için bu metod yalnızca `animals` listesi veya avcı
+        dışarıdan değiştirildiğinde gereklidir.
+        """
+        self.occupancy = {(entity.x, entity.y): entity for entity in self.animals}
+        self.occupancy[(self.hunter.x, self.hunter.y)] = self.hunter
+        self.grid = self.grid_class(self.interaction_radius())
+        for entity in self.animals:
+            self.grid.add(entity)
+        self.entities_by_id = {entity.id: entity for entity in self.animals}
+        # Dışarıdan eklenen varlıkların ID'leri sayacın önündeyse yeni ID'ler onlarla çakışmasın.
+        self.id_counter = max(self.id_counter, self.hunter.id, max(self.entities_by_id, default=0))
+        self.population = {}
+        for entity in self.animals:
+            key = (entity.species, entity.gender)
+            self.population[key] = self.population.get(key, 0) + 1
+        self._indexed_animals = self.animals
+        self._indexed_count = len(self.animals)
+        self._indexed_hunter = self.hunter
+        self.free_cells = None
+
+    def interaction_radius(self) -> int:
+        """Avlanma mesafelerinin, avcının menzilinin ve üreme mesafesinin en büyüğünü döndürür."""
+        return math.ceil(max(self.scenario.max_hunt_distance, self.hunter.hunt_distance, self.REPRODUCTION_DISTANCE))
+
+    def _sync_occupancy(self):
+        """`animals` listesi veya avcı simülasyon dışından değiştirildiyse doluluk indeksini yeniden kurar."""
+        if (self._indexed_animals is not self.animals or self._indexed_count != len(self.animals)
+                or self._indexed_hunter is not self.hunter):
+            self.update_all_positions_dict()
+
+    def _update_grid_caching(self):
+        """Artımlı ızgaranın önbelleğini yalnızca hareket hakkı bittikten sonra açar (bkz. `IncrementalGrid`)."""
+        if isinstance(self.grid, IncrementalGrid):
+            self.grid.set_caching(self.total_movement >= self.MAX_MOVEMENT)
 
     def is_position_available(self, x: int, y: int, current_entity_id: Optional[int]) -> bool:
         """Belirli bir pozisyonda herhangi bir nesne olup olmadığını kontrol eder."""
-        # Öncelikle, hayvanların pozisyonları için kontrol yapılır.
-        for entity in self.animals:
-            if entity.id != current_entity_id and entity.x == x and entity.y == y:
-                return False
-        # Avcının pozisyonu için kontrol yapılır.
-        if self.hunter.x == x and self.hunter.y == y:
-            return False
-        return True
+        if self.metrics is not None:
+            self.metrics.current.occupancy_checks += 1
+        self._sync_occupancy()
+        occupant = self.occupancy.get((x, y))
+        return occupant is None or occupant.id == current_entity_id
+
+    def relocate(self, entity: MovableEntity, dx: int, dy: int):
+        """Varlığı (dx, dy) kadar taşır ve doluluk indeksini eski ve yeni hücre için günceller."""
+        old_x, old_y = entity.x, entity.y
+        if self.occupancy.get((old_x, old_y)) is entity:
+            del self.occupancy[(old_x, old_y)]
+        entity.update_position(dx, dy)
+        self.occupancy[(entity.x, entity.y)] = entity
+        if self.free_cells is not None:
+            self.free_cells.release(old_x, old_y)
+            self.free_cells.occupy(entity.x, entity.y)
+        if self.entities_by_id.get(entity.id) is entity:
+            self.grid.move(entity, old_x, old_y)
+
+    def add_animal(self, animal: Animal):
+        """Hayvanı simülasyonun hayvanlar listesine ve doluluk indeksine ekler."""
+        self._sync_occupancy()
+        self.animals.append(animal)
+        self.occupancy[(animal.x, animal.y)] = animal
+        if self.free_cells is not None:
+            self.free_cells.occupy(animal.x, animal.y)
+        self.grid.add(animal)
+        self.entities_by_id[animal.id] = animal
+        key = (animal.species, animal.gender)
+        self.population[key] = self.population.get(key, 0) + 1
+        self._indexed_count += 1
 
 
     def create_animal(self, species: Species, gender: str, count: int):
@@ -182,41 +546,93 @@ class Simulation:
         for _ in range(count):
             x, y = self.find_empty_position()
             if x is not None and y is not None:
-                animal = Animal(x, y, gender, species, self.board_size, simulation=self)
-                self.animals.append(animal)
+                animal = Animal(x, y, gender, species, simulation=self)
+                self.add_animal(animal)
 
     def find_empty_position(self) -> Tuple[Optional[int], Optional[int]]:
         """ 
         Simülasyon alanı içinde, tanımlı board size sınırları dahilinde, rastgele bir boş pozisyon bulur. 
         Eğer uygun bir boş pozisyon bulunamazsa, None değerlerini döndürür.
+
+        Tahtanın yarısından azı doluysa rastgele hücreler denenir. Tahta daha doluysa (veya denemeler tükenirse) boş
+        hücre `free_cells` kümesinden tek adımda seçilir; bu yüzden None yalnızca tahtada hiç boş hücre yoksa döner.
         """
-        for _ in range(100):
-            x = random.randint(0, self.board_size - 1)
-            y = random.randint(0, self.board_size - 1)
-            if self.is_position_available(x, y, None):
-                return x, y
+        if self.free_cells is None and self.occupied_cells() <= self.DENSE_FILL * self.board_size * self.board_size:
+            for _ in range(32):
+                x = self.rng.randint(0, self.board_size - 1)
+                y = self.rng.randint(0, self.board_size - 1)
+                if self.is_position_available(x, y, None):
+                    return x, y
+        if self.free_cells is None:
+            self.free_cells = self.build_free_cells()
+        if self.free_cells:
+            return self.free_cells.sample(self.rng)
+        if self.metrics is not None:
+            self.metrics.current.failed_placements += 1
         return None, None
 
     def populate(self):
         """ Simülasyon başlangıcında, önceden tanımlı hayvan sayıları ve türlerine göre hayvanları simülasyon alanına yerleştirir."""
-        for species, count, gender in self.animals_to_create:
-            self.create_animal(species, gender, count)
+        if self.metrics is None:
+            self.place_initial_animals()
+        else:
+            # Başlangıç yerleştirmesinin ölçümleri, ilk turdan önceki tur numarasıyla ayrı bir kayıt olarak toplanır.
+            self.metrics.begin_tick(self.tick)
+            self.place_initial_animals()
+            self.metrics.end_tick()
+        if self.recorder is not None:
+            self.recorder.record(self)
+        if self.frames is not None:
+            self.frames.reset(self)
+            self.frames.publish(self.tick, self.hunter)
+
+    def occupied_cells(self) -> int:
+        """Avcı dahil dolu hücre sayısı."""
+        self._sync_occupancy()
+        return len(self.occupancy)
+
+    def build_free_cells(self) -> FreeCells:
+        """Doluluk indeksinden boş hücreler kümesini kurar."""
+        self._sync_occupancy()
+        return FreeCells(self.board_size, self.occupancy)
+
+    def place_initial_animals(self):
+        """
+        `animals_to_create` listesindeki hayvanları yerleştirir. Yerleştirme sonunda tahtanın `DENSE_FILL` oranından
+        fazlası dolacaksa boş hücreler kümesi baştan bir kez kurulur ve her hayvan bu kümeden O(1) sürede yerleştirilir.
+        Küme yalnızca yerleştirme boyunca tutulur; turlarda güncelleme maliyeti oluşmaz.
+        """
+        total = sum(count for _, count, _ in self.animals_to_create)
+        if self.free_cells is None and self.occupied_cells() + total > self.DENSE_FILL * self.board_size * self.board_size:
+            self.free_cells = self.build_free_cells()
+        try:
+            for species, count, gender in self.animals_to_create:
+                self.create_animal(species, gender, count)
+        finally:
+            self.free_cells = None
 
     def move_entities_once(self):
         """
         Simülasyondaki tüm hareketli varlıkları (hayvanlar ve avcı) tek bir hareket turunda hareket ettirir ve belirlenen maksimum hareket mesafesine kadar ilerlemeleri sağlanır.Aynı zamanda simülasyonun toplam hareket miktarını (`total_movement`) yönetir. Her varlığın hareketi, `total_movement` değerinin artmasına neden olur ve bu değer, simülasyonun maksimum hareket limitine (`MAX_MOVEMENT`) ulaşıp ulaşmadığını kontrol etmek için kullanılır. 
         """
-        for entity in self.animals + [self.hunter]:
+        sink = self.event_sink
+        log_events = sink is not None and sink.enabled
+        hunter = self.hunter
+        move_table = self.scenario.move_distance
+        for entity in self.animals + [hunter]:
             if self.total_movement >= self.MAX_MOVEMENT:
                 break
 
             initial_position = (entity.x, entity.y)  # Hareket öncesi pozisyon
-            max_movement_allowed = min(entity.move_distance, self.MAX_MOVEMENT - self.total_movement)
+            move_distance = hunter.move_distance if entity is hunter else move_table[entity.species.code]
+            max_movement_allowed = min(move_distance, self.MAX_MOVEMENT - self.total_movement)
             entity.move(self, max_movement=max_movement_allowed)
             self.total_movement += max_movement_allowed
             remaining_movement = self.MAX_MOVEMENT - self.total_movement
 
-            write_to_file(f"Entity ID: {entity.id}, Species: {entity.species}, Initial Position: {initial_position}, Final Position: ({entity.x}, {entity.y}), Movement Allowed: {max_movement_allowed}, Remaining Movement: {remaining_movement}")
+            if log_events:
+                sink.emit(Event(self.tick, EventKind.MOVE, (entity.id,), (entity.species,),
+                                (initial_position, (entity.x, entity.y)), max_movement_allowed, remaining_movement))
 
 
     def perform_hunting(self):
@@ -225,27 +641,57 @@ class Simulation:
         belirlenen avlanma mesafesi içindeki avları tespit eder. Bir av birden fazla avcı tarafından hedef alınabilir,
         bu durumda öncelik sırasına göre en uygun avcı avı avlar. Avlanan hayvanlar simülasyondan çıkarılır.
         """
-        potential_hunters: Dict[int, List[MovableEntity]] = {}
-        for predator in self.animals + [self.hunter]:
-            if predator.hunt_distance is None:
+        self._sync_occupancy()
+        self._update_grid_caching()
+        # Av ID -> (öncelik, avcı ID, avcı); avcılar tarandıkça her av için en öncelikli avcı tutulur. Kimin kimi
+        # avlayabildiği ve öncelikler senaryonun tablolarından tür koduyla okunur.
+        potential_hunters: Dict[int, Tuple[int, int, MovableEntity]] = {}
+        scenario = self.scenario
+        hunt_table, priority, eligible_table = scenario.hunt_distance, scenario.priority, scenario.eligible
+        hunter = self.hunter
+        for predator in self.animals + [hunter]:
+            code = predator.species.code
+            hunt_distance = hunter.hunt_distance if predator is hunter else hunt_table[code]
+            if not hunt_distance:
                 continue
-            for prey in self.animals:
-                if self.distance(predator, prey) <= predator.hunt_distance and predator.species != prey.species:
-                    potential_hunters.setdefault(prey.id, []).append(predator)
-
+            eligible = eligible_table[code]
+            claim = (priority[code], predator.id, predator)
+            for prey in self.grid.query_for(predator, hunt_distance):
+                if eligible[prey.species.code]:
+                    current = potential_hunters.get(prey.id)
+                    if current is None or claim < current:
+                        potential_hunters[prey.id] = claim
+
+        sink = self.event_sink
+        log_events = sink is not None and sink.enabled
         to_remove = set()
-        for prey_id, hunters in potential_hunters.items():
-            hunters.sort(key=lambda x: (x.species != Species.HUNTER, x.species != Species.LION, x.species != Species.WOLF, x.id))
-            selected_hunter = hunters[0]
-            prey = next((animal for animal in self.animals if animal.id == prey_id), None)
+        for prey_id, (_, _, selected_hunter) in potential_hunters.items():
+            prey = self.entities_by_id.get(prey_id)
             if prey:
-                write_to_file("-------HUNTING-------\n" f"{selected_hunter.species.value} (ID: {selected_hunter.id}, Location: ({selected_hunter.x}, {selected_hunter.y})) has hunted {prey.species.value} (ID: {prey.id}, Location: ({prey.x}, {prey.y}))")
+                if log_events:
+                    sink.emit(Event(self.tick, EventKind.HUNT, (selected_hunter.id, prey.id), (selected_hunter.species, prey.species),
+                                    ((selected_hunter.x, selected_hunter.y), (prey.x, prey.y))))
                 to_remove.add(prey_id)
                 self.hunted_counts[prey.species] += 1
-        to_remove = set(prey_id for prey_id, hunters in potential_hunters.items())
-
-        self.animals = [animal for animal in self.animals if animal.id not in to_remove]
-        self.update_all_positions_dict()
+                self.kill_counts[selected_hunter.species] = self.kill_counts.get(selected_hunter.species, 0) + 1
+        if self.metrics is not None:
+            self.metrics.current.hunts += len(to_remove)
+
+        survivors = []
+        for animal in self.animals:
+            if animal.id not in to_remove:
+                survivors.append(animal)
+                continue
+            if self.occupancy.get((animal.x, animal.y)) is animal:
+                del self.occupancy[(animal.x, animal.y)]
+                if self.free_cells is not None:
+                    self.free_cells.release(animal.x, animal.y)
+            self.grid.remove(animal)
+            self.entities_by_id.pop(animal.id, None)
+            self.population[(animal.species, animal.gender)] -= 1
+        self.animals = survivors
+        self._indexed_animals = survivors
+        self._indexed_count = len(survivors)
 
 
     def find_birth_position(self, parent_x, parent_y, radius=4) -> Tuple[Optional[int], Optional[int]]:
@@ -255,10 +701,10 @@ class Simulation:
         Bu süreç, yeni doğanın ebeveynlerine yakın ancak üremeye geçemeyecekleri bir konumda başlamasını sağlar.
         """
         valid_positions = []
-        for angle in range(0, 360, 10):  # 30 derecelik artışlarla çember üzerinde noktalar oluşturulur.
-            radian = math.radians(angle)
-            candidate_x = round(parent_x + radius * math.cos(radian))
-            candidate_y = round(parent_y + radius * math.sin(radian))
+        # Çember ofsetleri yarıçap başına bir kez hesaplanır; yuvarlamada aynı hücreye düşen açılar tekrar denenmez.
+        for dx, dy in ring_offsets(radius):
+            candidate_x = parent_x + dx
+            candidate_y = parent_y + dy
 
             # Koordinatların simülasyon alanı içinde ve boş olup olmadığını kontrol et
             if 0 <= candidate_x < self.board_size and 0 <= candidate_y < self.board_size and self.is_position_available(candidate_x, candidate_y, None):
@@ -266,20 +712,29 @@ class Simulation:
 
         # Geçerli ve boş pozisyonlar arasından rastgele bir seçim yap
         if valid_positions:
-            return random.choice(valid_positions)
+            return self.rng.choice(valid_positions)
         else:
+            if self.metrics is not None:
+                self.metrics.current.failed_placements += 1
             return None, None
         
     def perform_reproduction(self):
         """
         Bu method dişi hayvan için çevresindeki erkeklerden uygun bir üreme partneri seçer. Dişi, üreme mesafesindeki en yakın erkeği tercih eder; eşit uzaklıkta birden fazla erkek varsa, rastgele seçim yapılır. Seçilen erkekle üreme mesafesi uygunsa, yeni bir varlık simülasyona eklenir ve hayvankar listesi genişletilir. Bu süreç, dişi hayvanların bir anda yalnızca bir erkekle eşleşebileceği gerçeğine dayanır.
         """
-        new_animals = []
-        for female in filter(lambda a: a.gender == "Female", self.animals):
+        self._sync_occupancy()
+        self._update_grid_caching()
+        sink = self.event_sink
+        log_events = sink is not None and sink.enabled
+        mating = self.scenario.mating
+        for female in filter(lambda a: a.gender is Gender.FEMALE, self.animals):
+            # Mesafeler karesiyle karşılaştırılır; sıralama ve eşitlikler gerçek mesafeyle aynıdır. Adaylar zaten erkek
+            # olduğundan uyumluluk yalnızca senaryonun üreme tablosundan okunur.
+            mates = mating[female.species.code]
             males_within_range = [
-                (male, self.distance(female, male))
-                for male in self.animals
-                if male.gender == "Male" and female.is_compatible_for_reproduction(male) and self.distance(female, male) <= self.REPRODUCTION_DISTANCE
+                (male, (male.x - female.x) ** 2 + (male.y - female.y) ** 2)
+                for male in self.grid.query_for(female, self.REPRODUCTION_DISTANCE, gender=Gender.MALE)
+                if mates[male.species.code]
             ]
 
             if not males_within_range:
@@ -287,57 +742,186 @@ class Simulation:
 
             min_distance = min(distance for _, distance in males_within_range)
             closest_males = [male for male, distance in males_within_range if distance == min_distance]
-            chosen_male = random.choice(closest_males)
+            chosen_male = self.rng.choice(closest_males)
 
             new_animal = female.reproduce(chosen_male, self)
             if new_animal:
-                self.animals.append(new_animal)
+                self.add_animal(new_animal)
                 self.born_counts[new_animal.species] += 1
+                if self.metrics is not None:
+                    self.metrics.current.births += 1
 
-                # Yeni doğan hayvanın doğum bilgilerini dosyaya yaz
-                write_to_file("-------BORNING-------\n" f"{new_animal.species.value} (ID: {new_animal.id}, "f"Location: ({new_animal.x}, {new_animal.y})) born from " f"{female.species.value} (ID: {female.id}, "f"Location: ({female.x}, {female.y})) and "f"{chosen_male.species.value} (ID: {chosen_male.id}, "f"Location: ({chosen_male.x}, {chosen_male.y}))")
-
+                # Yeni doğan hayvanın doğum bilgilerini olay kaydına yaz
+                if log_events:
+                    sink.emit(Event(self.tick, EventKind.BIRTH, (new_animal.id, female.id, chosen_male.id),
+                                    (new_animal.species, female.species, chosen_male.species),
+                                    ((new_animal.x, new_animal.y), (female.x, female.y), (chosen_male.x, chosen_male.y))))
 
-        self.update_all_positions_dict()
 
 
     def distance(self, entity1: MovableEntity, entity2: MovableEntity) -> float:
         return ((entity1.x - entity2.x) ** 2 + (entity1.y - entity2.y) ** 2) ** 0.5
 
+    def final_counts(self) -> Dict[Species, int]:
+        """Simülasyonda hâlihazırda yaşayan hayvanların tür bazında sayılarını döndürür."""
+        self._sync_occupancy()
+        counts: Dict[Species, int] = {}
+        for (species, _), count in self.population.items():
+            if count:
+                counts[species] = counts.get(species, 0) + count
+        return counts
+
+    def results(self) -> Dict[Species, Dict[str, int]]:
+        """`report_results` tablosundaki sayıları tür bazında döndürür: initial, final, born ve hunted."""
+        final_counts = self.final_counts()
+        return {
+            species: {
+                "initial": initial_count,
+                "final": final_counts.get(species, 0),
+                "born": self.born_counts.get(species, 0),
+                "hunted": self.hunted_counts.get(species, 0),
+            }
+            for species, initial_count in self.NUM_ANIMALS.items()
+        }
+
     def report_results(self):
         print("Simulation Results:\n")
         print("{:<10} {:<10} {:<10} {:<10} {:<10}".format('Species', 'Initial', 'Final', 'Born', 'Hunted'))
         print("-" * 50)
         total_final_count = 0
-        for species, initial_count in self.NUM_ANIMALS.items():
-            final_count = len([animal for animal in self.animals if animal.species == species])
-            total_final_count += final_count
-            born = self.born_counts.get(species, 0)
-            hunted = self.hunted_counts.get(species, 0)
-            print(f"{species.value:<10} {initial_count:<10} {final_count:<10} {born:<10} {hunted:<10}")
+        for species, counts in self.results().items():
+            total_final_count += counts["final"]
+            print(f"{species.value:<10} {counts['initial']:<10} {counts['final']:<10} {counts['born']:<10} {counts['hunted']:<10}")
         print("-" * 50)
         print(f"{'Total Animal Count':<10} {'':<10} {total_final_count:<10} {'':<10} {'':<10}")
 
-    def run(self):
-        with open("simulation_output.txt", "w") as file:
-            file.truncate(0)
-
-        self.populate()
-        while self.total_movement < self.MAX_MOVEMENT:
+    def step(self):
+        """Bir simülasyon turu yürütür: hareket, üreme ve avlanma."""
+        frames = self.frames
+        if frames is None:
+            self._step()
+            return
+        # Tur boyunca olaylar karelerin çalışma tahtasına uygulanır ve asıl olay yazıcısına iletilir.
+        if not frames.started:
+            frames.reset(self)
+        frames.inner, self.event_sink = self.event_sink, frames
+        try:
+            self._step()
+        finally:
+            self.event_sink = frames.inner
+            frames.inner = None
+        frames.publish(self.tick, self.hunter)
+
+    def _step(self):
+        self.tick += 1
+        metrics = self.metrics
+        if metrics is None:
+            self.move_entities_once()
+            self.perform_reproduction()
+            self.perform_hunting()
+        else:
+            metrics.begin_tick(self.tick)
+            record = metrics.current
+            start = time.perf_counter()
             self.move_entities_once()
+            moved = time.perf_counter()
             self.perform_reproduction()
+            reproduced = time.perf_counter()
             self.perform_hunting()
-        self.report_results()
+            record.move_seconds = moved - start
+            record.reproduction_seconds = reproduced - moved
+            record.hunting_seconds = time.perf_counter() - reproduced
+            metrics.end_tick()
+        if self.recorder is not None:
+            self.recorder.record(self)
+
+    def save_checkpoint(self, path: str):
+        """
+        Simülasyonun tüm durumunu (hayvanlar, avcı, sayaçlar, ID sayacı ve rastgele sayı üretecinin durumu) `path`
+        dosyasına sıkıştırılmış ikili biçimde yazar. `load_checkpoint` ile yüklenen simülasyon, hiç durmamış bir
+        simülasyonla birebir aynı şekilde devam eder.
+        """
+        from checkpoint import save_checkpoint
+        save_checkpoint(self, path)
+
+    @classmethod
+    def load_checkpoint(cls, path: str, event_sink: Optional[EventSink] = None) -> 'Simulation':
+        """`save_checkpoint` ile yazılmış dosyadan simülasyonu, kaydedildiği motorla yeniden oluşturur."""
+        from checkpoint import load_checkpoint
+        return load_checkpoint(path, event_sink)
+
+    def export_entities(self):
+        """Kontrol noktası için hayvanları (id, x, y, tür kodu, cinsiyet kodu) sütunları olarak döndürür."""
+        return (array("q", (animal.id for animal in self.animals)),
+                array("i", (animal.x for animal in self.animals)),
+                array("i", (animal.y for animal in self.animals)),
+                array("B", (animal.species.code for animal in self.animals)),
+                array("B", (GENDERS.index(animal.gender) for animal in self.animals)))
+
+    def import_entities(self, ids, xs, ys, species_codes, gender_codes):
+        """`export_entities` sütunlarından hayvanlar listesini yeniden kurar."""
+        members = self.scenario.members
+        self.animals = []
+        for entity_id, x, y, species_code, gender_code in zip(ids, xs, ys, species_codes, gender_codes):
+            animal = Animal(x, y, GENDERS[gender_code], members[species_code])
+            animal.id = entity_id
+            self.animals.append(animal)
+        self.update_all_positions_dict()
 
+    def export_engine_state(self) -> dict:
+        """Motora özgü, kontrol noktasına JSON olarak yazılacak ek durum. Nesne motorunun ek durumu yoktur."""
+        return {}
+
+    def import_engine_state(self, state: dict):
+        pass
+
+    def iter_ticks(self, populate: bool = True) -> Iterator[TickDelta]:
+        """
+        Simülasyonu tur tur ilerleten üreteç. `populate` True ise önce hayvanları yerleştirir, sonra toplam hareket
+        sınırına ulaşılana kadar her tur için bir `TickDelta` (konumu değişen varlıklar, doğumlar, avlanmalar ve tur
+        sonundaki nüfus) döndürür. Yalnızca o turun değişiklikleri bellekte tutulur. Bir olay yazıcısı verilmişse olaylar
+        ona da iletilir ve üreteç bittiğinde yazıcı kapatılır; verilmemişse `run` gibi dosya oluşturulmaz.
+        """
+        sink = self.event_sink
+        collector = DeltaSink(sink)
+        self.event_sink = collector
+        try:
+            if populate:
+                self.populate()
+            while self.total_movement < self.MAX_MOVEMENT:
+                self.step()
+                yield collector.take(self.tick, self.final_counts())
+        finally:
+            self.event_sink = sink
+            if sink is not None:
+                sink.close()
+            if self.recorder is not None:
+                self.recorder.close()
+            if self.frames is not None:
+                self.frames.close()
+
+    def run(self, report: bool = True):
+        """
+        Simülasyonu toplam hareket sınırına ulaşılana kadar çalıştırır ve `report` True ise sonuçları yazdırır. Bir olay
+        yazıcısı verilmediyse olaylar metin biçiminde `OUTPUT_FILE` dosyasına yazılır; yazıcı ve varsa kaydedici çalışma
+        sonunda kapatılır.
+        """
+        if self.event_sink is None:
+            self.event_sink = BufferedEventSink(self.OUTPUT_FILE, format="text")
+        try:
+            self.populate()
+            while self.total_movement < self.MAX_MOVEMENT:
+                self.step()
+        finally:
+            self.event_sink.close()
+            if self.recorder is not None:
+                self.recorder.close()
+            if self.frames is not None:
+                self.frames.close()
+        if report:
+            self.report_results()
 
-def write_to_file(data, file_name="simulation_output.txt"):
-    """
-    Simülasyondaki tüm hareket, doğum ve avlanma olaylarının detaylarını, 
-    varlıkların konumları ve ID'leri ile birlikte belirtilen dosyaya yazar.
-    """
-    with open(file_name, "a") as file:
-        file.write(data + "\n")
 
 if __name__ == "__main__":
     simulation = Simulation(board_size=100)
-    simulation.run()
\ No newline at end of file
+    simulation.run()
@@ -0,0 +1,257 @@
+"""
+Parametre taramaları (sweep) için içerik adresli sonuç önbelleği.
+
+Bir tarama; tahta boyutu, başlangıç nüfusu (`animals_to_create`), `MAX_MOVEMENT`, `REPRODUCTION_DISTANCE` ve tohum
+değerlerinin tüm kombinasyonlarından oluşur (`expand_grid`). Her nokta, sonucu etkileyen kaynak dosyalarının özetiyle
+(`code_fingerprint`) birlikte SHA-256 ile anahtarlanır ve `report_results` tablosundaki sayılar (`Simulation.results`)
+bu anahtarla diskteki `ResultCache` dizinine yazılır. Aynı nokta kod değişmediği sürece bir daha çalıştırılmaz; kod
+değiştiğinde parmak izi değiştiği için eski sonuçlar kullanılmaz ve zamanla LRU sırasıyla silinir.
+
+`run_sweep` önbellekteki sonuçları hemen, eksik noktaları ise süreç havuzunda çalıştırıp tamamlandıkça döndürür; bir
+taramayı tekrarlamak veya bir parametreye yeni bir değer eklemek yalnızca yeni noktaların süresini alır.
+
+Komut satırından kullanım (her sonuç bir JSON satırı olarak yazdırılır):
+
+    python sweep.py --board-size 50 100 --seed 0 1 2 3 --reproduction-distance 2 3 4
+"""
+from __future__ import annotations
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from ensemble import RunConfig, run_single
+from simulation import DEFAULT_SCENARIO, Simulation
+
+# Sonucu etkileyen modüller; içerikleri değiştiğinde önbellekteki sonuçlar geçersiz sayılır.
+FINGERPRINT_MODULES = ("simulation.py", "placement.py", "scenario.py", "events.py", "metrics.py", "array_engine.py",
+                       "parallel.py", "ensemble.py")
+CACHE_VERSION = 1
+
+Animals = Optional[Tuple[Tuple[str, int, str], ...]]
+
+
+class SweepPoint(NamedTuple):
+    """Taramanın tek bir noktası. `animals_to_create` None ise simülasyonun varsayılan başlangıç nüfusu kullanılır."""
+    board_size: int = 100
+    animals_to_create: Animals = None
+    max_movement: int = Simulation.MAX_MOVEMENT
+    reproduction_distance: int = Simulation.REPRODUCTION_DISTANCE
+    seed: int = 0
+    engine: str = "object"
+
+
+class SweepResult(NamedTuple):
+    point: SweepPoint
+    counts: Dict[str, Dict[str, int]]  # tür adı -> {"initial", "final", "born", "hunted"}
+    cached: bool
+
+
+def _animals(value: Optional[Iterable[Sequence[Any]]]) -> Animals:
+    """Başlangıç nüfusunu (Species/Gender üyeleri veya adları) hashlenebilir ad üçlülerine çevirir."""
+    if value is None:
+        return None
+    return tuple((getattr(species, "value", species), int(count), getattr(gender, "value", gender))
+                 for species, count, gender in value)
+
+
+def expand_grid(board_size: Sequence[int] = (100,), animals_to_create: Sequence[Optional[Iterable[Sequence[Any]]]] = (None,),
+                max_movement: Sequence[int] = (Simulation.MAX_MOVEMENT,),
+                reproduction_distance: Sequence[int] = (Simulation.REPRODUCTION_DISTANCE,),
+                seed: Sequence[int] = (0,), engine: str = "object") -> List[SweepPoint]:
+    """Verilen değer listelerinin tüm kombinasyonlarını, son parametre en hızlı değişecek şekilde döndürür."""
+    return [SweepPoint(size, animals, movement, distance, run_seed, engine)
+            for size, animals, movement, distance, run_seed in itertools.product(
+                board_size, [_animals(animals) for animals in animals_to_create], max_movement, reproduction_distance,
+                seed)]
+
+
+@lru_cache(maxsize=None)
+def code_fingerprint() -> str:
+    """Sonucu etkileyen kaynak dosyalarının ve Python sürümünün SHA-256 özeti."""
+    digest = hashlib.sha256(f"{sys.version_info.major}.{sys.version_info.minor}".encode())
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in FINGERPRINT_MODULES:
+        digest.update(name.encode() + b"\0")
+        with open(os.path.join(directory, name), "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def point_key(point: SweepPoint, fingerprint: Optional[str] = None) -> str:
+    """Noktanın ve kod parmak izinin SHA-256 özeti; önbellekte dosya adı olarak kullanılır."""
+    payload = {"version": CACHE_VERSION, "code": fingerprint or code_fingerprint(), "point": point._asdict()}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Sonuçları `directory` altında anahtar başına bir JSON dosyası olarak tutan önbellek. Dosyaların toplam boyutu
+    `max_bytes` sınırını aştığında en uzun süredir kullanılmayan kayıtlar silinir; son kullanım zamanı dosyanın
+    değiştirilme zamanında saklandığından sıralama süreçler ve çalıştırmalar arasında korunur.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        # anahtar -> [boyut, son kullanım zamanı (ns)]
+        self._entries: Dict[str, List[int]] = {}
+        for entry in os.scandir(directory):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                self._entries[entry.name[:-5]] = [stat.st_size, stat.st_mtime_ns]
+        self.size = sum(size for size, _ in self._entries.values())
+        self._clock = max((used for _, used in self._entries.values()), default=0)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def _touch(self, key: str):
+        # Aynı nanosaniyede yapılan kullanımlar da sıralı kalsın diye zaman her seferinde en az 1 ns ilerletilir.
+        now = self._clock = max(time.time_ns(), self._clock + 1)
+        self._entries[key][1] = now
+        try:
+            os.utime(self._path(key), ns=(now, now))
+        except FileNotFoundError:
+            pass
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Kaydı döndürür ve son kullanım zamanını günceller; kayıt yoksa veya okunamıyorsa None."""
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        try:
+            with open(self._path(key)) as file:
+                value = json.load(file)
+        except (OSError, ValueError):
+            self._forget(key)
+            self.misses += 1
+            return None
+        self._touch(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]):
+        """Kaydı dosyaya atomik olarak yazar ve gerekirse eski kayıtları siler."""
+        data = json.dumps(value, separators=(",", ":")).encode()
+        temporary = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(data)
+        os.replace(temporary, self._path(key))
+        if key in self._entries:
+            self.size -= self._entries[key][0]
+        self._entries[key] = [len(data), 0]
+        self.size += len(data)
+        self._touch(key)
+        self.evict()
+
+    def _forget(self, key: str):
+        size, _ = self._entries.pop(key)
+        self.size -= size
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        """Toplam boyut `max_bytes` altına inene kadar en uzun süredir kullanılmayan kayıtları siler."""
+        if self.size <= self.max_bytes:
+            return
+        for key in sorted(self._entries, key=lambda key: self._entries[key][1]):
+            if self.size <= self.max_bytes:
+                break
+            self._forget(key)
+
+    def clear(self):
+        for key in list(self._entries):
+            self._forget(key)
+
+
+def run_point(point: SweepPoint) -> Dict[str, Dict[str, int]]:
+    """Noktayı `ensemble.run_single` ile olay kaydı kapalı olarak çalıştırır ve tür bazındaki sayıları döndürür."""
+    config = RunConfig(point.seed, point.board_size, point.max_movement, point.engine, None, point.animals_to_create,
+                       point.reproduction_distance)
+    return run_single(config).counts
+
+
+def run_sweep(points: Iterable[SweepPoint], cache: Optional[ResultCache] = None,
+              processes: Optional[int] = None) -> Iterator[SweepResult]:
+    """
+    Noktaların sonuçlarını döndürür. Önbellekte bulunanlar hemen, eksik noktalar tamamlandıkça (sırasız) döner ve
+    önbelleğe yazılır. Aynı nokta taramada birden fazla kez geçiyorsa bir kez çalıştırılır. `processes` verilmezse tüm
+    çekirdekler kullanılır; 1 ise eksik noktalar bu süreçte sırayla çalıştırılır.
+    """
+    fingerprint = code_fingerprint()
+    pending: Dict[str, List[SweepPoint]] = {}
+    for point in points:
+        key = point_key(point, fingerprint)
+        if key in pending:
+            pending[key].append(point)
+            continue
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            yield SweepResult(point, cached["counts"], True)
+        else:
+            pending[key] = [point]
+    if not pending:
+        return
+
+    def finish(key: str, counts: Dict[str, Dict[str, int]]) -> Iterator[SweepResult]:
+        if cache is not None:
+            cache.put(key, {"point": pending[key][0]._asdict(), "counts": counts})
+        for point in pending[key]:
+            yield SweepResult(point, counts, False)
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(pending) == 1:
+        for key, same in pending.items():
+            yield from finish(key, run_point(same[0]))
+        return
+    with ProcessPoolExecutor(max_workers=min(processes, len(pending))) as executor:
+        futures = {executor.submit(run_point, same[0]): key for key, same in pending.items()}
+        for future in as_completed(futures):
+            yield from finish(futures[future], future.result())
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Run a cached parameter sweep and stream per-point results as JSON lines.")
+    parser.add_argument("--board-size", type=int, nargs="+", default=[100])
+    parser.add_argument("--scale", type=int, nargs="+", default=[1],
+                        help="multiply the default starting population by these factors")
+    parser.add_argument("--max-movement", type=int, nargs="+", default=[Simulation.MAX_MOVEMENT])
+    parser.add_argument("--reproduction-distance", type=int, nargs="+", default=[Simulation.REPRODUCTION_DISTANCE])
+    parser.add_argument("--seed", type=int, nargs="+", default=[0])
+    parser.add_argument("--engine", choices=Simulation.ENGINES, default="object")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--cache-dir", default=".sweep_cache")
+    parser.add_argument("--max-cache-mb", type=float, default=64.0, help="evict least recently used results above this size")
+    args = parser.parse_args(argv)
+
+    animals = [None if scale == 1 else [(species, count * scale, gender)
+                                        for species, count, gender in DEFAULT_SCENARIO.animals_to_create]
+               for scale in args.scale]
+    points = expand_grid(args.board_size, animals, args.max_movement, args.reproduction_distance, args.seed, args.engine)
+    cache = ResultCache(args.cache_dir, int(args.max_cache_mb * 1024 * 1024))
+    start = time.perf_counter()
+    for result in run_sweep(points, cache, args.processes):
+        print(json.dumps({"point": result.point._asdict(), "cached": result.cached, "counts": result.counts}), flush=True)
+    print(f"{len(points)} points ({cache.hits} cached) in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,38 @@
+import asyncio
+import json
+import os
+import random
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
 import unittest
-from simulation import Simulation, Species, Animal, Hunter
+from array import array
+from benchmark import compare, run_case
+from ensemble import RunConfig, aggregate, run_ensemble, run_single
+from events import FORMATS, BufferedEventSink, Event, EventKind, ListEventSink, NullEventSink, read_binary_events
+import parallel
+from frames import FrameReader, FrameRing
+from indexed_trace import IndexedTrace, IndexedTraceSink, convert_text_trace
+from metrics import SimulationMetrics
+from placement import FreeCells, ring_offsets
+import recorder
+from recorder import PopulationRecorder, load_recording
+from scenario import MAX_SPECIES, Scenario, ScenarioError, load_scenario
+from service import ServiceError, SimulationClient, SimulationServer, load_test
+from simulation import DEFAULT_SCENARIO, GENDERS, Simulation, Species, Animal, Hunter, Gender, MovableEntity
+from sweep import ResultCache, SweepPoint, expand_grid, point_key, run_point, run_sweep
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 class TestSimulation(unittest.TestCase):
     def setUp(self):
         # Testler için daha küçük bir tahta üzerinde simülasyon başlatılıyor
-        self.simulation = Simulation(board_size=50)
+        self.simulation = Simulation(board_size=50, event_sink=NullEventSink())
 
     def test_movement_within_boundaries(self):
         """Varlıkların simülasyon sınırları dışına çıkamadığını test eder."""
@@ -46,7 +74,7 @@ class TestSimulation(unittest.TestCase):
     def test_hunting_distance_and_type(self):
         """Avcıların sadece belirli bir mesafe içinde ve kendi türlerinden olmayan hayvanları avlayabildiğini test eder."""
         # Avcıyı ve avı belirli pozisyonlara yerleştir
-        hunter = Hunter(0, 0, self.simulation.board_size)
+        hunter = Hunter(0, 0, self.simulation.board_size, simulation=self.simulation)
         prey = Animal(1, 1, "Male", Species.SHEEP, self.simulation.board_size, self.simulation)  # Avcının ulaşabileceği mesafede
         self.simulation.animals = [hunter, prey]
         # Avlanma işlemini tetikle
@@ -106,7 +134,7 @@ class TestSimulation(unittest.TestCase):
     def test_prey_removed_from_list(self):
         """Avlanan hayvanların simülasyonun hayvanlar listesinden çıkarıldığını test eder."""
         # Avcı ve av olarak işlev görecek hayvanları yerleştir
-        hunter = Hunter(0, 0, self.simulation.board_size, hunt_distance=5)
+        hunter = Hunter(0, 0, self.simulation.board_size, hunt_distance=5, simulation=self.simulation)
         prey = Animal(0, 1, "Male", Species.SHEEP, self.simulation.board_size, self.simulation)
         self.simulation.animals = [prey]
         self.simulation.hunter = hunter
@@ -136,8 +164,1103 @@ class TestSimulation(unittest.TestCase):
         for newborn in newborns:
             self.assertTrue(0 <= newborn.x < self.simulation.board_size and 0 <= newborn.y < self.simulation.board_size, "Yavrular habitat sınırları içinde doğmalıdır.")
 
+    def test_doluluk_indeksi_senkron_kalir(self):
+        """Doluluk indeksinin hareket, doğum ve avlanmalardan sonra varlıkların gerçek konumlarıyla aynı kaldığını test eder."""
+        self.simulation.populate()
+        for _ in range(5):
+            self.simulation.move_entities_once()
+            self.simulation.perform_reproduction()
+            self.simulation.perform_hunting()
+        expected = {(entity.x, entity.y): entity for entity in self.simulation.animals + [self.simulation.hunter]}
+        self.assertEqual(self.simulation.occupancy, expected, "Doluluk indeksi varlıkların konumlarıyla eşleşmelidir.")
+
+    def test_doluluk_indeksi_disaridan_degisiklikte_yenilenir(self):
+        """Hayvanlar listesi dışarıdan değiştirildiğinde doluluk kontrolünün yeni listeyi gördüğünü test eder."""
+        self.simulation.populate()
+        self.simulation.animals = [Animal(7, 7, "Male", Species.COW, self.simulation.board_size, self.simulation)]
+        self.assertFalse(self.simulation.is_position_available(7, 7, None))
+        self.assertEqual(len(self.simulation.occupancy), 2, "Eski hayvanlar indeksten çıkarılmalıdır.")
+
+    def test_mekansal_izgara_sorgusu_tam_taramayla_ayni(self):
+        """Izgara sorgusunun, tüm hayvanları tek tek tarayan mesafe kontrolüyle aynı sonucu verdiğini test eder."""
+        self.simulation.populate()
+        for _ in range(3):
+            self.simulation.move_entities_once()
+        for radius in (3, 4.5, 8, 20):
+            for x, y in ((0, 0), (25, 25), (49, 10)):
+                expected = [animal for animal in self.simulation.animals
+                            if ((animal.x - x) ** 2 + (animal.y - y) ** 2) ** 0.5 <= radius and animal.gender == "Female"]
+                found = self.simulation.grid.query(x, y, radius, gender="Female")
+                self.assertEqual(sorted(found, key=lambda a: a.id), sorted(expected, key=lambda a: a.id))
+
+    def test_hayvanlar_tur_ozelliklerini_paylasir(self):
+        """Hayvanların `__slots__` kullandığını ve mesafelerin senaryo tablolarından okunduğunu test eder."""
+        wolf = Animal(4, 4, "Female", Species.WOLF, self.simulation.board_size, self.simulation)
+        self.assertFalse(hasattr(wolf, "__dict__"))
+        self.assertFalse(hasattr(wolf, "simulation"))
+        self.assertIs(wolf.gender, Gender.FEMALE)
+        self.assertEqual(wolf.gender, "Female")
+        self.assertEqual((wolf.move_range(self.simulation), self.simulation.scenario.hunt_distance[wolf.species.code]),
+                         (3, 4))
+        # Mesafeler hayvanda değil senaryoda tutulur; özel senaryo türleri de aynı yoldan okunur.
+        self.assertFalse(hasattr(wolf, "move_distance") or hasattr(wolf, "hunt_distance"))
+        scenario = Scenario.from_dict({"species": [{"name": "Rabbit", "move_distance": 5}]})
+        simulation = Simulation(board_size=10, event_sink=NullEventSink(), seed=0, scenario=scenario)
+        rabbit = Animal(1, 1, "Male", scenario.animals[0], simulation=simulation)
+        self.assertEqual(rabbit.move_range(simulation), 5)
+        self.assertEqual(Hunter(0, 0, self.simulation.board_size).move_distance, 1)
+        # Yerleşik tür tabloları salt okunurdur; kurallar `Scenario` ile değiştirilir.
+        self.assertEqual(Animal.species_attributes[Species.WOLF]["move_distance"], 3)
+        with self.assertRaises(TypeError):
+            Animal.species_attributes[Species.WOLF]["move_distance"] = 5
+        with self.assertRaises(TypeError):
+            Animal.species_traits[Species.WOLF] = Animal.species_traits[Species.LION]
+
+    def test_temel_varlik_hareket_mesafesini_saklar(self):
+        """`MovableEntity` sınıfına verilen hareket mesafesinin saklandığını ve hareketi sınırladığını test eder."""
+        simulation = Simulation(board_size=10, event_sink=NullEventSink(), seed=0)
+        simulation.hunter.x, simulation.hunter.y = 9, 9
+        entity = MovableEntity(3, 3, 10, 2)
+        self.assertIsInstance(entity, MovableEntity)
+        self.assertEqual(entity.move_distance, 2)
+        # Hareket mesafesi alanı hayvanlarda bulunmaz; hayvanlar mesafeyi senaryodan okur.
+        self.assertNotIn("move_distance", [slot for cls in Animal.__mro__ for slot in getattr(cls, "__slots__", ())])
+        entity.move(simulation)
+        self.assertLessEqual(abs(entity.x - 3) + abs(entity.y - 3), 2)
+        entity.move(simulation, max_movement=1)
+        self.assertEqual(entity.move_distance, 2)
+
+
+class TestEventLog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def run_with_sink(self, sink):
+        simulation = Simulation(board_size=30, event_sink=sink)
+        simulation.MAX_MOVEMENT = 500
+        simulation.populate()
+        while simulation.total_movement < simulation.MAX_MOVEMENT:
+            simulation.tick += 1
+            simulation.move_entities_once()
+            simulation.perform_reproduction()
+            simulation.perform_hunting()
+        sink.close()
+        return simulation
+
+    def test_tum_bicimler_ayni_olaylari_yazar(self):
+        """Metin, JSONL ve ikili biçimlerin aynı olay dizisini eksiksiz yazdığını test eder."""
+        memory = ListEventSink()
+        self.run_with_sink(memory)
+        paths = {fmt: os.path.join(self.directory.name, "events." + fmt) for fmt in ("text", "jsonl", "binary")}
+        for fmt, path in paths.items():
+            # Küçük tampon, yazıcı yetişemediğinde emit'in beklemesini (backpressure) de çalıştırır.
+            with BufferedEventSink(path, format=fmt, capacity=8, batch_size=4) as sink:
+                for event in memory.events:
+                    sink.emit(event)
+        self.assertEqual(list(read_binary_events(paths["binary"])), memory.events)
+        with open(paths["jsonl"]) as file:
+            records = [json.loads(line) for line in file]
+        self.assertEqual([record["ids"] for record in records], [list(event.ids) for event in memory.events])
+        with open(paths["text"]) as file:
+            moves = [line for line in file if line.startswith("Entity ID:")]
+        self.assertEqual(len(moves), sum(1 for event in memory.events if event.kind == EventKind.MOVE))
+
+    def test_ikili_kayit_buyuk_idleri_korur(self):
+        """32 biti aşan ID'lerin ikili kayıtta kesilmeden yazılıp okunduğunu test eder."""
+        path = os.path.join(self.directory.name, "events.bin")
+        event = Event(5, EventKind.HUNT, (2 ** 40, 3 * 10 ** 9), (Species.HUNTER, Species.SHEEP), ((1, 2), (3, 4)))
+        with BufferedEventSink(path, format="binary") as sink:
+            sink.emit(event)
+        self.assertEqual(list(read_binary_events(path)), [event])
+
+    def test_kapatilmayan_yazici_cikista_bosaltilir(self):
+        """`close` çağrılmadan çıkan süreçte tampondaki olayların dosyaya yazıldığını test eder."""
+        path = os.path.join(self.directory.name, "events.jsonl")
+        script = ("import sys; from events import BufferedEventSink, Event, EventKind; from simulation import Species; "
+                  "sink = BufferedEventSink(sys.argv[1], format='jsonl', batch_size=64); "
+                  "[sink.emit(Event(1, EventKind.MOVE, (i,), (Species.SHEEP,), ((0, 0), (0, 1)))) for i in range(100)]")
+        subprocess.run([sys.executable, "-c", script, path], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        with open(path) as file:
+            self.assertEqual([json.loads(line)["ids"] for line in file], [[i] for i in range(100)])
+
+    def test_bos_yazici_olay_uretmez(self):
+        """NullEventSink ile çalışan simülasyonun dosya oluşturmadan ilerlediğini test eder."""
+        simulation = self.run_with_sink(NullEventSink())
+        self.assertEqual(simulation.total_movement, simulation.MAX_MOVEMENT)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+class TestEnsemble(unittest.TestCase):
+    def test_ayni_tohum_ayni_sonucu_verir(self):
+        """Süreç havuzunda ve tek süreçte çalıştırılan topluluğun tohum başına aynı sonuçları verdiğini test eder."""
+        serial = run_ensemble(4, base_seed=10, board_size=30, max_movement=300, processes=1)
+        parallel = run_ensemble(4, base_seed=10, board_size=30, max_movement=300, processes=2)
+        self.assertEqual(serial, parallel)
+        self.assertEqual([result.seed for result in serial], [10, 11, 12, 13])
+
+    def test_calistirma_global_sayaci_degistirmez(self):
+        """Aynı tohumlu çalıştırmaların aynı ID'lerle aynı olayları yazdığını ve global ID sayacına dokunmadığını test eder."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        Animal(0, 0, "Male", Species.SHEEP)
+        counter = MovableEntity.id_counter
+        outputs = []
+        for name in ("a.txt", "b.txt"):
+            path = os.path.join(directory.name, name)
+            run_single(RunConfig(3, board_size=30, max_movement=300, output_file=path))
+            with open(path) as file:
+                outputs.append(file.read())
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(MovableEntity.id_counter, counter)
+
+    def test_ozet_istatistikleri(self):
+        """Topluluk özetinin ortalama, varyans ve yüzdelikleri doğru hesapladığını test eder."""
+        results = run_ensemble(5, base_seed=0, board_size=30, max_movement=300, processes=1)
+        summary = aggregate(results)
+        finals = sorted(result.counts["Sheep"]["final"] for result in results)
+        self.assertAlmostEqual(summary["Sheep"]["final"]["mean"], statistics.fmean(finals))
+        self.assertAlmostEqual(summary["Sheep"]["final"]["variance"], statistics.variance(finals))
+        self.assertEqual(summary["Sheep"]["final"]["p50"], finals[2])
+        self.assertEqual(summary["Sheep"]["initial"]["variance"], 0.0)
+
+
+class TestMetrics(unittest.TestCase):
+    def test_tur_olcumleri_sayaclarla_uyumlu(self):
+        """Tur ölçümlerindeki doğum ve avlanma sayılarının simülasyon sayaçlarıyla aynı olduğunu test eder."""
+        metrics = SimulationMetrics()
+        records = []
+        metrics.add_callback(records.append)
+        simulation = Simulation(board_size=40, event_sink=NullEventSink(), seed=1, metrics=metrics)
+        simulation.MAX_MOVEMENT = 10 ** 9
+        simulation.populate()
+        for _ in range(5):
+            simulation.step()
+        self.assertEqual([record.tick for record in records], [0, 1, 2, 3, 4, 5], "Başlangıç yerleştirmesi 0. tur olarak kaydedilmelidir.")
+        self.assertEqual(metrics.totals.births, sum(simulation.born_counts.values()))
+        self.assertEqual(metrics.totals.hunts, sum(simulation.hunted_counts.values()))
+        self.assertGreater(metrics.totals.occupancy_checks, 0)
+        self.assertGreater(metrics.totals.move_seconds, 0)
+
+    def test_engellenen_hareket_ve_basarisiz_yerlesim_sayilir(self):
+        """Dolu tahtada engellenen hareketlerin ve yerleştirilemeyen hayvanların sayıldığını test eder."""
+        metrics = SimulationMetrics()
+        simulation = Simulation(board_size=3, event_sink=NullEventSink(), seed=0, metrics=metrics)
+        simulation.animals_to_create = [(Species.COW, 20, "Male")]
+        simulation.populate()
+        self.assertEqual(len(simulation.animals), 8, "Avcı dışındaki tüm hücreler dolmalıdır.")
+        simulation.step()
+        self.assertGreaterEqual(metrics.totals.failed_placements, 1)
+        self.assertGreater(metrics.totals.blocked_moves, 0)
+
+    def test_periyodik_ozet_yazilir(self):
+        """Her `export_every` turda bir özet satırı üretildiğini test eder."""
+        lines = []
+        metrics = SimulationMetrics(export_every=2, export=lines.append)
+        simulation = Simulation(board_size=30, event_sink=NullEventSink(), seed=2, metrics=metrics)
+        simulation.populate()
+        for _ in range(4):
+            simulation.step()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[-1].startswith("tick 3:"), "Özetler başlangıç kaydı dahil her iki kayıtta bir yazılmalıdır.")
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_olcum_tum_adimlari_raporlar(self):
+        """Ölçüm sonucunun her adım için süre, tur/saniye ve bellek bilgisi içerdiğini test eder."""
+        case = run_case(board_size=40, scale=2, ticks=2, seed=0)
+        self.assertEqual(case["population"], 156)
+        self.assertEqual(set(case["seconds"]), {"populate", "move_entities_once", "perform_reproduction", "perform_hunting", "logging"})
+        self.assertGreater(case["ticks_per_second"], 0)
+        self.assertGreater(case["peak_memory_bytes"], 0)
+
+    def test_yavaslama_ve_karesel_buyume_isaretlenir(self):
+        """Temel ölçüme göre yavaşlayan adımların ve karesel ölçeklenmenin raporlandığını test eder."""
+        def case(move_seconds):
+            return {"board_size": 100, "scale": 1, "seconds_per_tick": {"move_entities_once": move_seconds}}
+        baseline = {"cases": [case(0.010)]}
+        self.assertEqual(compare({"cases": [case(0.011)], "scaling": {}}, baseline), [])
+        self.assertEqual(len(compare({"cases": [case(0.020)], "scaling": {}}, baseline)), 1)
+        self.assertEqual(len(compare({"cases": [], "scaling": {"100": {"perform_hunting": 2.0}}}, baseline)), 1)
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def assert_resumes_identically(self, engine):
+        path = os.path.join(self.directory.name, "state.ckpt")
+        original = Simulation(board_size=40, event_sink=ListEventSink(), engine=engine, seed=7)
+        original.MAX_MOVEMENT = 10 ** 9
+        original.populate()
+        for _ in range(3):
+            original.step()
+        original.save_checkpoint(path)
+        before = len(original.event_sink.events)
+        for _ in range(4):
+            original.step()
+
+        restored = Simulation.load_checkpoint(path, event_sink=ListEventSink())
+        for _ in range(4):
+            restored.step()
+        self.assertEqual(restored.tick, original.tick)
+        self.assertEqual(restored.results(), original.results())
+        self.assertEqual(restored.event_sink.events, original.event_sink.events[before:],
+                         "Kontrol noktasından devam eden simülasyon aynı olayları üretmelidir.")
+
+    def test_nesne_motoru_kaldigi_yerden_ayni_devam_eder(self):
+        """Kontrol noktasından yüklenen simülasyonun, hiç durmamış simülasyonla birebir aynı devam ettiğini test eder."""
+        self.assert_resumes_identically("object")
+
+    @unittest.skipIf(numpy is None, "engine='array' NumPy gerektirir")
+    def test_dizi_motoru_kaldigi_yerden_ayni_devam_eder(self):
+        """Dizi motorunun kontrol noktasından NumPy üreteci dahil aynı durumla devam ettiğini test eder."""
+        self.assert_resumes_identically("array")
+
+    def test_paralel_motor_kaldigi_yerden_ayni_devam_eder(self):
+        """Paralel motorun kontrol noktasından şerit düzeni dahil aynı durumla devam ettiğini test eder."""
+        self.assert_resumes_identically("parallel")
+
+    def test_catallar_birbirini_etkilemez(self):
+        """Aynı kontrol noktasından yüklenip dönüşümlü ilerletilen iki kopyanın aynı ID'leri ve olayları ürettiğini test eder."""
+        path = os.path.join(self.directory.name, "state.ckpt")
+        original = Simulation(board_size=40, event_sink=NullEventSink(), seed=7)
+        original.MAX_MOVEMENT = 10 ** 9
+        original.populate()
+        original.step()
+        original.save_checkpoint(path)
+        first = Simulation.load_checkpoint(path, event_sink=ListEventSink())
+        second = Simulation.load_checkpoint(path, event_sink=ListEventSink())
+        for _ in range(6):
+            first.step()
+            second.step()
+        self.assertGreater(sum(first.born_counts.values()), sum(original.born_counts.values()))
+        self.assertEqual(first.id_counter, second.id_counter)
+        self.assertEqual(first.event_sink.events, second.event_sink.events)
+
+    def test_ornek_ayarlari_korunur(self):
+        """Örnek üzerinde değiştirilen üreme mesafesi ve başlangıç nüfusunun kontrol noktasından geri yüklendiğini test eder."""
+        path = os.path.join(self.directory.name, "state.ckpt")
+        original = Simulation(board_size=40, event_sink=NullEventSink(), seed=7)
+        original.REPRODUCTION_DISTANCE = 6
+        original.animals_to_create = [(species, count * 2, gender) for species, count, gender in original.animals_to_create]
+        original.NUM_ANIMALS = {species: count * 2 for species, count in original.NUM_ANIMALS.items()}
+        original.populate()
+        original.save_checkpoint(path)
+        restored = Simulation.load_checkpoint(path)
+        self.assertEqual(restored.REPRODUCTION_DISTANCE, 6)
+        self.assertEqual(restored.NUM_ANIMALS, original.NUM_ANIMALS)
+        self.assertEqual(restored.animals_to_create, original.animals_to_create)
+        self.assertEqual(restored.results(), original.results())
+
+    def test_gecersiz_dosya_reddedilir(self):
+        """Kontrol noktası olmayan bir dosyanın yüklenmediğini test eder."""
+        path = os.path.join(self.directory.name, "bogus.ckpt")
+        with open(path, "wb") as file:
+            file.write(b"not a checkpoint file")
+        with self.assertRaises(ValueError):
+            Simulation.load_checkpoint(path)
+
+
+class SameLayoutMixin:
+    """Aynı hayvan dizilimini birden fazla motora yükleyip adım adım karşılaştıran testler için yardımcılar."""
+
+    def same_layout(self, seed, board_size=40, scenario=None, layout=None, engines=("object", "array")):
+        """
+        Aynı hayvan dizilimini (ve avcı konumunu) verilen motorlara yükler. `layout` verilmezse nesne motoruyla
+        yerleştirilip iki tur hareket ettirilmiş (kümelenmiş) bir dizilim kullanılır; verilirse (x, y, tür, cinsiyet)
+        dörtlüleri ve avcı konumu ID sırasıyla yüklenir.
+        """
+        scenario = scenario or DEFAULT_SCENARIO
+        if layout is None:
+            source = Simulation(board_size=board_size, event_sink=NullEventSink(), seed=seed, scenario=scenario)
+            source.MAX_MOVEMENT = 10 ** 9
+            source.populate()
+            for _ in range(2):
+                source.move_entities_once()
+            columns, hunter = source.export_entities(), (source.hunter.x, source.hunter.y)
+        else:
+            animals, hunter = layout
+            # ID'ler avcının ID'siyle çakışmayacak kadar büyük seçilir.
+            columns = (array("q", range(100, 100 + len(animals))), array("i", [x for x, _, _, _ in animals]),
+                       array("i", [y for _, y, _, _ in animals]), array("B", [species.code for _, _, species, _ in animals]),
+                       array("B", [GENDERS.index(gender) for _, _, _, gender in animals]))
+        simulations = {}
+        for engine in engines:
+            simulation = Simulation(board_size=board_size, event_sink=ListEventSink(), engine=engine, seed=seed,
+                                    scenario=scenario)
+            if engine == "parallel":
+                self.addCleanup(simulation.close)
+            simulation.MAX_MOVEMENT = 10 ** 9
+            simulation.hunter.x, simulation.hunter.y = hunter
+            simulation.import_entities(*columns)
+            simulations[engine] = simulation
+        return simulations
+
+    def events(self, simulation, kind):
+        return [event for event in simulation.event_sink.events if event.kind == kind]
+
+    def check_newborn_father(self, engines):
+        """Menzilinde erkek olmayan dişinin önceki dişinin aynı turda doğan erkek yavrusuyla eşleştiğini denetler."""
+        scenario = Scenario.from_dict({"species": [{"name": "Rock", "move_distance": 0},
+                                                   {"name": "Runner", "move_distance": 1}]})
+        rock, runner = scenario.members[:2]
+        # İlk çiftin doğum çemberinde yalnızca (6, 7) boş; oraya doğan yavru, menzilinde erkek olmayan ikinci dişiye 3 uzaklıkta.
+        animals = [(2, 7, runner, Gender.FEMALE), (3, 7, runner, Gender.MALE), (9, 7, runner, Gender.FEMALE)]
+        animals += [(2 + dx, 7 + dy, rock, Gender.FEMALE) for dx, dy in ring_offsets(4)
+                    if (dx, dy) != (4, 0) and 0 <= 2 + dx < 15 and 0 <= 7 + dy < 15]
+        male_children = 0
+        for seed in range(8):
+            for engine, simulation in self.same_layout(seed, 15, scenario, (animals, (14, 14)), engines).items():
+                with self.subTest(seed=seed, engine=engine):
+                    simulation.perform_reproduction()
+                    ids, xs, ys, _, genders = simulation.export_entities()
+                    first_child = list(zip(xs, ys)).index((6, 7))
+                    mothers = {event.positions[1] for event in self.events(simulation, EventKind.BIRTH)}
+                    self.assertIn((2, 7), mothers)
+                    male_child = GENDERS[genders[first_child]] is Gender.MALE
+                    male_children += male_child
+                    self.assertEqual((9, 7) in mothers, male_child)
+        self.assertTrue(male_children)
+
+
+@unittest.skipIf(numpy is None, "engine='array' NumPy gerektirir")
+class TestArrayEngine(SameLayoutMixin, unittest.TestCase):
+    def trajectory(self, engine, seed, ticks=4):
+        """Verilen motorla birkaç tur çalıştırır ve her tur için (doğum, avlanma, nüfus) sayılarını döndürür."""
+        random.seed(seed)
+        simulation = Simulation(board_size=40, event_sink=NullEventSink(), engine=engine)
+        simulation.MAX_MOVEMENT = 10 ** 9
+        simulation.populate()
+        history = []
+        for _ in range(ticks):
+            simulation.tick += 1
+            simulation.move_entities_once()
+            born = sum(simulation.born_counts.values())
+            simulation.perform_reproduction()
+            hunted = sum(simulation.hunted_counts.values())
+            simulation.perform_hunting()
+            history.append((sum(simulation.born_counts.values()) - born, sum(simulation.hunted_counts.values()) - hunted,
+                            sum(simulation.final_counts().values())))
+        return history
+
+    def test_avlanma_ayni_dizilimde_ayni(self):
+        """Aynı dizilimde iki motorun aynı avcı-av eşleşmelerini ve av sayılarını ürettiğini test eder."""
+        for seed in range(10):
+            simulations = self.same_layout(seed)
+            for simulation in simulations.values():
+                simulation.perform_hunting()
+            hunts = {engine: sorted(self.events(simulation, EventKind.HUNT)) for engine, simulation in simulations.items()}
+            self.assertTrue(hunts["object"])
+            self.assertEqual(hunts["object"], hunts["array"], f"{seed} tohumunda avlanmalar farklı")
+            self.assertEqual(simulations["object"].final_counts(), simulations["array"].final_counts())
+
+    def test_ayni_hucreye_yonelen_varliklardan_kucuk_idli_kazanir(self):
+        """Tek boş hücreye aynı anda yönelen iki hayvandan ID'si küçük olanın hücreyi aldığını test eder."""
+        scenario = Scenario.from_dict({"species": [{"name": "Rock", "move_distance": 0},
+                                                   {"name": "Runner", "move_distance": 1}]})
+        rock, runner = scenario.members[:2]
+        # Ortadaki (1, 1) hücresi dışındaki her yer dolu; iki koşucunun da tek hamlesi bu hücreye.
+        animals = [(0, 1, runner, Gender.MALE), (2, 1, runner, Gender.MALE)]
+        animals += [(x, y, rock, Gender.MALE) for x, y in ((0, 0), (1, 0), (2, 0), (0, 2), (1, 2))]
+        for engine, simulation in self.same_layout(0, 3, scenario, (animals, (2, 2))).items():
+            with self.subTest(engine=engine):
+                simulation.move_entities_once()
+                moves = dict(event.positions for event in self.events(simulation, EventKind.MOVE))
+                self.assertEqual(moves[(0, 1)], (1, 1))
+                self.assertEqual(moves[(2, 1)], (2, 1))
+
+    def test_hareket_sinirlari(self):
+        """
+        Toplam hareket sınırı listenin ortasında dolduğunda iki motorun her varlığa aynı hareket hakkını verdiğini,
+        hiçbir varlığın hakkından fazla ilerlemediğini ve konumların çakışmadığını test eder.
+        """
+        for seed in range(5):
+            simulations = self.same_layout(seed)
+            budgets = {}
+            for engine, simulation in simulations.items():
+                simulation.MAX_MOVEMENT = 57
+                simulation.move_entities_once()
+                self.assertEqual(simulation.total_movement, 57)
+                moves = self.events(simulation, EventKind.MOVE)
+                budgets[engine] = [(event.ids, event.movement, event.remaining) for event in moves]
+                for event in moves:
+                    (x0, y0), (x1, y1) = event.positions
+                    self.assertLessEqual(abs(x1 - x0) + abs(y1 - y0), event.movement)
+                    self.assertLessEqual(event.movement, simulation.scenario.move_distance[event.species[0].code])
+            self.assertEqual(budgets["object"], budgets["array"])
+            array_simulation = simulations["array"]
+            n = array_simulation.count
+            positions = set(zip(array_simulation.x[:n].tolist(), array_simulation.y[:n].tolist()))
+            self.assertEqual(len(positions), n)
+            self.assertTrue(all(0 <= x < 40 and 0 <= y < 40 for x, y in positions))
+            self.assertTrue((array_simulation.cells[array_simulation.y[:n], array_simulation.x[:n]] == numpy.arange(1, n + 1)).all())
+
+    def test_ayni_turda_dogan_erkek_sonraki_disiyle_eslesir(self):
+        """
+        Menzilinde erkek olmayan bir dişinin, kendisinden önce doğuran dişinin aynı turda doğan erkek yavrusuyla
+        eşleştiğini nesne ve dizi motorlarında test eder.
+        """
+        self.check_newborn_father(("object", "array"))
+
+    def test_dogum_kurallari(self):
+        """
+        İki motorda da her doğumun menzildeki en yakın uyumlu erkekle, senaryonun yavru tablosuna uygun türde ve anne-baba
+        ortasının doğum çemberi üzerinde gerçekleştiğini; menzilinde uyumlu erkek olan her başlangıç dişisinin bir kez
+        doğurduğunu test eder.
+        """
+        ring = set(ring_offsets(4))
+        MALE, FEMALE = GENDERS.index(Gender.MALE), GENDERS.index(Gender.FEMALE)
+        limit = Simulation.REPRODUCTION_DISTANCE ** 2
+        for seed in range(5):
+            for engine, simulation in self.same_layout(seed).items():
+                with self.subTest(seed=seed, engine=engine):
+                    animals = {entity_id: (x, y, species, gender) for entity_id, x, y, species, gender in zip(
+                        *(list(column) for column in simulation.export_entities()))}
+                    simulation.perform_reproduction()
+                    births = self.events(simulation, EventKind.BIRTH)
+                    mothers = [event.ids[1] for event in births]
+                    self.assertEqual(len(mothers), len(set(mothers)))
+                    # Başlangıç dişisi ID -> menzilindeki en yakın uyumlu başlangıç erkeğinin uzaklığının karesi.
+                    closest = {}
+                    for entity_id, (x, y, species, gender) in animals.items():
+                        distances = [(mx - x) ** 2 + (my - y) ** 2 for mx, my, male_species, male_gender in animals.values()
+                                     if male_gender == MALE and DEFAULT_SCENARIO.mating[species][male_species]]
+                        distances = [distance for distance in distances if distance <= limit]
+                        if gender == FEMALE and distances:
+                            closest[entity_id] = min(distances)
+                    self.assertLessEqual(set(closest), set(mothers))
+                    for event in births:
+                        child, mother, father = event.positions
+                        child_species, mother_species, father_species = event.species
+                        distance = (mother[0] - father[0]) ** 2 + (mother[1] - father[1]) ** 2
+                        self.assertLessEqual(distance, limit)
+                        self.assertTrue(DEFAULT_SCENARIO.mating[mother_species.code][father_species.code])
+                        self.assertIn(child_species, DEFAULT_SCENARIO.offspring_species[mother_species.code][father_species.code])
+                        self.assertIn((child[0] - (mother[0] + father[0]) // 2, child[1] - (mother[1] + father[1]) // 2), ring)
+                        # Yeni doğan bir erkek, ancak başlangıç erkeklerinden daha yakınsa seçilebilir.
+                        if event.ids[1] in closest:
+                            self.assertLessEqual(distance, closest[event.ids[1]])
+                            if event.ids[2] in animals:
+                                self.assertEqual(distance, closest[event.ids[1]])
+
+    def test_sonradan_eklenen_hayvanlar_dizilere_yazilir(self):
+        """`create_animal` ve `add_animal` ile eklenen hayvanların dizilere, nüfusa ve doluluk dizisine işlendiğini test eder."""
+        simulation = Simulation(board_size=40, event_sink=NullEventSink(), engine="array", seed=1)
+        simulation.populate()
+        sheep = simulation.population[(Species.SHEEP, Gender.MALE)]
+        simulation.create_animal(Species.SHEEP, "Male", 3)
+        self.assertEqual(simulation.count, 81)
+        self.assertEqual(simulation.population[(Species.SHEEP, Gender.MALE)], sheep + 3)
+        x, y = next((x, y) for x in range(40) for y in range(40) if simulation.cells[y, x] == 0)
+        cow = Animal(x, y, Gender.FEMALE, Species.COW, simulation=simulation)
+        simulation.add_animal(cow)
+        self.assertEqual(int(simulation.ids[simulation.cells[y, x] - 1]), cow.id)
+        with self.assertRaises(ValueError):
+            simulation.add_animal(Animal(x, y, Gender.MALE, Species.COW, simulation=simulation))
+        self.assertEqual(simulation.animals, [])
+        n = simulation.count
+        self.assertEqual(int((simulation.cells > 0).sum()), n)
+        self.assertEqual(len(set(zip(simulation.x[:n].tolist(), simulation.y[:n].tolist()))), n)
+        self.assertEqual(sum(simulation.final_counts().values()), n)
+
+    def test_dizi_motoru_nesne_motoruyla_istatistiksel_olarak_esdeger(self):
+        """
+        Dizi motorunun tur başına doğum, avlanma ve nüfus ortalamalarının nesne motoruyla uyumlu olduğunu test eder.
+        Farklar turlar boyunca biriktiği için yeterince uzun çalıştırılır; sınır, iki ortalamanın farkının standart
+        hatasının 3 katıdır (sabit tohumlarla belirlenimcidir).
+        """
+        runs, ticks = 60, 8
+        object_runs = [self.trajectory("object", seed, ticks) for seed in range(runs)]
+        array_runs = [self.trajectory("array", seed, ticks) for seed in range(runs)]
+        for tick in range(ticks):
+            for column, name in enumerate(("doğum", "avlanma", "nüfus")):
+                object_values = [run[tick][column] for run in object_runs]
+                array_values = [run[tick][column] for run in array_runs]
+                standard_error = ((statistics.variance(object_values) + statistics.variance(array_values)) / runs) ** 0.5
+                difference = abs(statistics.mean(object_values) - statistics.mean(array_values))
+                self.assertLessEqual(difference, 3 * standard_error, f"{tick}. turdaki {name} ortalaması farklı")
+
+    def test_dizi_motoru_ayni_sonuc_tablosunu_uretir(self):
+        """Dizi motorunun nesne motoruyla aynı tür sütunlarına sahip sonuç tablosunu verdiğini ve çakışma olmadığını test eder."""
+        random.seed(3)
+        simulation = Simulation(board_size=40, event_sink=NullEventSink(), engine="array")
+        simulation.MAX_MOVEMENT = 2000
+        simulation.run()
+        n = simulation.count
+        cells = set(zip(simulation.x[:n].tolist(), simulation.y[:n].tolist()))
+        cells.add((simulation.hunter.x, simulation.hunter.y))
+        self.assertEqual(len(cells), n + 1, "Varlıkların pozisyonları benzersiz olmalıdır.")
+        self.assertEqual(sum(simulation.final_counts().values()), n)
+        self.assertEqual(int((simulation.cells > 0).sum()), n)
+
+class TestParallelEngine(SameLayoutMixin, unittest.TestCase):
+    def run_parallel(self, processes, tiles=4):
+        simulation = Simulation(board_size=60, event_sink=ListEventSink(), engine="parallel", seed=5,
+                                processes=processes, tiles=tiles)
+        self.addCleanup(simulation.close)
+        simulation.MAX_MOVEMENT = 10 ** 9
+        simulation.animals_to_create = [(species, count * 4, gender) for species, count, gender in simulation.animals_to_create]
+        simulation.populate()
+        for _ in range(4):
+            simulation.step()
+        return simulation
+
+    def test_sonuclar_surec_sayisindan_bagimsizdir(self):
+        """Aynı tohum ve şerit düzeniyle tek süreçte ve süreç havuzunda aynı olayların üretildiğini test eder."""
+        serial = self.run_parallel(processes=1)
+        pooled = self.run_parallel(processes=2)
+        self.assertEqual(serial.results(), pooled.results())
+        self.assertEqual(serial.event_sink.events, pooled.event_sink.events)
+
+    def test_hucre_dizisi_konumlarla_eslesir(self):
+        """Şerit sınırlarını geçen hareketlerden, doğum ve avlanmalardan sonra iki varlığın aynı hücrede olmadığını test eder."""
+        simulation = self.run_parallel(processes=1)
+        state, board = simulation.state, simulation.board_size
+        positions = {(state.x[row], state.y[row]) for row in range(simulation.count)}
+        self.assertEqual(len(positions), simulation.count)
+        self.assertNotIn((simulation.hunter.x, simulation.hunter.y), positions)
+        for row in range(simulation.count):
+            self.assertEqual(state.cells[state.y[row] * board + state.x[row]], row + 1)
+        kinds = {event.kind for event in simulation.event_sink.events}
+        self.assertTrue({EventKind.BIRTH, EventKind.HUNT} <= kinds)
+
+    def test_ayni_turda_dogan_erkek_sonraki_disiyle_eslesir(self):
+        """
+        Menzilinde erkek olmayan bir dişinin, kendisinden önce doğuran dişinin aynı turda doğan erkek yavrusuyla
+        eşleştiğini paralel motorda test eder.
+        """
+        self.check_newborn_father(("object", "parallel"))
+
+    def test_sonradan_eklenen_hayvanlar_sutunlara_yazilir(self):
+        """`add_animal` ile eklenen hayvanın sütunlara ve hücre dizisine işlendiğini, dolu hücrenin reddedildiğini test eder."""
+        simulation = Simulation(board_size=30, event_sink=NullEventSink(), engine="parallel", seed=4, processes=1)
+        self.addCleanup(simulation.close)
+        simulation.populate()
+        state, board = simulation.state, simulation.board_size
+        cell = next(cell for cell in range(board * board) if state.cells[cell] == 0)
+        cow = Animal(cell % board, cell // board, Gender.FEMALE, Species.COW, simulation=simulation)
+        simulation.add_animal(cow)
+        self.assertEqual(state.ids[state.cells[cell] - 1], cow.id)
+        self.assertEqual(simulation.animals, [])
+        with self.assertRaises(ValueError):
+            simulation.add_animal(Animal(cow.x, cow.y, Gender.MALE, Species.COW, simulation=simulation))
+        self.assertEqual(sum(simulation.final_counts().values()), simulation.count)
+        simulation.step()
+        self.assertEqual(sorted(state.ids[:simulation.count]), list(state.ids[:simulation.count]))
+
+    def test_varsayilan_surec_sayisi_tahta_boyutuna_gore(self):
+        """Küçük tahtada işlerin bu süreçte yürütüldüğünü ve kapatılınca tabloların bırakıldığını test eder."""
+        simulation = Simulation(board_size=60, event_sink=NullEventSink(), engine="parallel", seed=5)
+        self.assertEqual(simulation.processes, 1)
+        self.assertIn(simulation.tables, parallel._tables)
+        simulation.close()
+        self.assertNotIn(simulation.tables, parallel._tables)
+
+class TestTickDeltas(unittest.TestCase):
+    def replay(self, engine):
+        """Başlangıç durumuna tur deltalarını uygular ve her turda nüfusun yeniden sayımla eşleştiğini doğrular."""
+        sink = ListEventSink()
+        simulation = Simulation(board_size=40, event_sink=sink, engine=engine, seed=11)
+        simulation.MAX_MOVEMENT = 3000
+        simulation.populate()
+        ids, xs, ys, species_codes, _ = simulation.export_entities()
+        members = list(Species)
+        state = {entity_id: [x, y, members[code]] for entity_id, x, y, code in zip(ids, xs, ys, species_codes)}
+        state[simulation.hunter.id] = [simulation.hunter.x, simulation.hunter.y, Species.HUNTER]
+        ticks = 0
+        for delta in simulation.iter_ticks(populate=False):
+            ticks += 1
+            for move in delta.moves:
+                state[move.id][:2] = move.x, move.y
+            for birth in delta.births:
+                state[birth.id] = [birth.x, birth.y, birth.species]
+            for hunt in delta.hunts:
+                self.assertEqual(state.pop(hunt.prey)[2], hunt.prey_species)
+            recount = {}
+            for _, _, species in state.values():
+                if species != Species.HUNTER:
+                    recount[species] = recount.get(species, 0) + 1
+            self.assertEqual(delta.population, recount)
+        self.assertEqual(ticks, simulation.tick)
+        self.assertEqual(simulation.event_sink, sink)
+        ids, xs, ys, _, _ = simulation.export_entities()
+        expected = {entity_id: (x, y) for entity_id, x, y in zip(ids, xs, ys)}
+        expected[simulation.hunter.id] = (simulation.hunter.x, simulation.hunter.y)
+        self.assertEqual({entity_id: (x, y) for entity_id, (x, y, _) in state.items()}, expected)
+        self.assertTrue(any(event.kind == EventKind.HUNT for event in sink.events), "Olaylar yazıcıya da iletilmelidir.")
+
+    def test_nesne_motoru_deltalari_durumu_yeniden_kurar(self):
+        """Tur deltalarının art arda uygulanmasının simülasyonun son durumunu verdiğini test eder."""
+        self.replay("object")
+
+    @unittest.skipIf(numpy is None, "engine='array' NumPy gerektirir")
+    def test_dizi_motoru_deltalari_durumu_yeniden_kurar(self):
+        self.replay("array")
+
+    def test_paralel_motor_deltalari_durumu_yeniden_kurar(self):
+        self.replay("parallel")
+
+class TestPopulationRecorder(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def record(self, chunk_ticks=4):
+        simulation = Simulation(board_size=40, event_sink=NullEventSink(), seed=4,
+                                recorder=PopulationRecorder(self.directory.name, chunk_ticks=chunk_ticks))
+        simulation.MAX_MOVEMENT = 10000
+        simulation.run(report=False)
+        return simulation
+
+    def test_kayit_sayaclarla_eslesir(self):
+        """Tur satırlarının toplamlarının ve son nüfusun simülasyonun sayaçlarıyla eşleştiğini test eder."""
+        simulation = self.record()
+        recording = load_recording(self.directory.name)
+        self.assertEqual(list(recording["tick"]), list(range(simulation.tick + 1)))
+        for species, counts in simulation.results().items():
+            self.assertEqual(sum(recording[f"born.{species.value}"]), counts["born"])
+            self.assertEqual(sum(recording[f"hunted.{species.value}"]), counts["hunted"])
+            final = sum(recording[f"population.{species.value}.{gender}"][-1] for gender in ("Male", "Female"))
+            self.assertEqual(final, counts["final"])
+        kills = sum(sum(recording[f"kills.{predator}"]) for predator in ("Hunter", "Wolf", "Lion"))
+        self.assertEqual(kills, sum(simulation.hunted_counts.values()))
+
+    def test_tur_araligi_okunur(self):
+        """Bir tur aralığının, dosyanın tamamı okunmadan ve NumPy olmadan da aynı değerlerle okunduğunu test eder."""
+        self.record(chunk_ticks=3)
+        full = load_recording(self.directory.name)
+        part = load_recording(self.directory.name, 4, 9, columns=["tick", "population.Sheep.Female"])
+        self.assertEqual(list(part["tick"]), [4, 5, 6, 7, 8])
+        self.assertEqual(list(part["population.Sheep.Female"]), list(full["population.Sheep.Female"][4:9]))
+        original, recorder.np = recorder.np, None
+        try:
+            fallback = load_recording(self.directory.name, 4, 9, columns=["population.Sheep.Female"])
+        finally:
+            recorder.np = original
+        self.assertEqual(list(fallback["population.Sheep.Female"]), list(part["population.Sheep.Female"]))
+
+class TestPlacement(unittest.TestCase):
+    def test_dolu_tahtada_hayvan_kaybolmaz(self):
+        """Tahta %99 dolacak kadar hayvan istendiğinde hiçbir hayvanın yerleştirilemeden kaybolmadığını test eder."""
+        for engine, options in (("object", {}), ("parallel", {"processes": 1})):
+            with self.subTest(engine=engine):
+                simulation = Simulation(board_size=20, event_sink=NullEventSink(), seed=3, engine=engine, **options)
+                if engine == "parallel":
+                    self.addCleanup(simulation.close)
+                simulation.animals_to_create = [(Species.SHEEP, 396, "Male")]
+                simulation.populate()
+                self.assertEqual(simulation.final_counts()[Species.SHEEP], 396)
+                self.assertIsNone(simulation.free_cells, "Boş hücre kümesi yerleştirmeden sonra tutulmamalıdır.")
+                if engine == "object":
+                    positions = {(animal.x, animal.y) for animal in simulation.animals} | {(simulation.hunter.x, simulation.hunter.y)}
+                    self.assertEqual(len(positions), 397)
+                self.assertIsNotNone(simulation.find_empty_position()[0], "Kalan boş hücreler bulunabilmelidir.")
+
+    def test_bos_hucre_kumesi_guncel_kalir(self):
+        """Kurulan boş hücre kümesinin hareket, doğum ve avlanmalardan sonra tahtadaki boş hücrelerle aynı kaldığını test eder."""
+        simulation = Simulation(board_size=12, event_sink=NullEventSink(), seed=4)
+        simulation.populate()
+        simulation.free_cells = simulation.build_free_cells()
+        for _ in range(3):
+            simulation.step()
+        empty = {(x, y) for x in range(12) for y in range(12)} - set(simulation.occupancy)
+        self.assertEqual({position for position in empty if position in simulation.free_cells}, empty)
+        self.assertEqual(len(simulation.free_cells), len(empty))
+
+    def test_cember_ofsetleri_tekrarsizdir(self):
+        """Çember ofsetlerinin 36 açıdaki yuvarlanmış noktaları ilk geçtikleri sırayla ve tekrarsız içerdiğini test eder."""
+        offsets = ring_offsets(4)
+        self.assertEqual(len(offsets), len(set(offsets)))
+        self.assertEqual(offsets[0], (4, 0))
+        simulation = Simulation(board_size=9, event_sink=NullEventSink(), seed=0)
+        simulation.hunter.x, simulation.hunter.y = 0, 0
+        simulation.animals = [Animal(4 + dx, 4 + dy, "Male", Species.COW, simulation=simulation) for dx, dy in offsets[1:]]
+        self.assertEqual(simulation.find_birth_position(4, 4), (8, 4), "Tek boş çember hücresi seçilmelidir.")
+
+    def test_bos_hucre_secimi(self):
+        """Boş hücre kümesinden çıkarılan hücrelerin bir daha seçilmediğini test eder."""
+        cells = FreeCells(3, [(0, 0), (1, 1)])
+        cells.occupy(2, 2)
+        cells.release(1, 1)
+        rng = random.Random(0)
+        samples = {cells.sample(rng) for _ in range(200)}
+        self.assertEqual(len(cells), 7)
+        self.assertEqual(samples, {(x, y) for x in range(3) for y in range(3)} - {(0, 0), (2, 2)})
+
+class TestIncrementalGrid(unittest.TestCase):
+    def run_simulation(self, incremental):
+        sink = ListEventSink()
+        simulation = Simulation(board_size=40, event_sink=sink, seed=8, incremental=incremental)
+        simulation.MAX_MOVEMENT = 2000
+        simulation.animals_to_create = [(species, count * 3, gender) for species, count, gender in simulation.animals_to_create]
+        simulation.populate()
+        # Hareket hakkı bittikten sonraki turlarda yalnızca doğum ve avlanma olan bölgeler değişir.
+        for _ in range(12):
+            simulation.step()
+        return simulation, sink.events
+
+    def test_artimli_mod_tam_hesaplamayla_ayni(self):
+        """Artımlı aday önbelleğiyle ve her tur tam hesaplamayla aynı olayların ve sonuçların üretildiğini test eder."""
+        full, full_events = self.run_simulation(incremental=False)
+        incremental, incremental_events = self.run_simulation(incremental=True)
+        self.assertEqual(incremental_events, full_events)
+        self.assertEqual(incremental.results(), full.results())
+        self.assertGreater(incremental.grid.hits, 0, "Değişmeyen bölgelerdeki adaylar önbellekten gelmelidir.")
+        self.assertGreater(incremental.grid.misses, 0)
+
+    def test_yalnizca_degisen_bolgeyi_tarayanlar_yeniden_hesaplanir(self):
+        """Bir hayvan yer değiştirdiğinde yalnızca onun kovalarını tarayan sahiplerin sorgularının yenilendiğini test eder."""
+        simulation = Simulation(board_size=200, event_sink=NullEventSink(), seed=3, incremental=True)
+        simulation.MAX_MOVEMENT = 0
+        simulation.populate()
+        grid = simulation.grid
+        grid.set_caching(True)
+        females = [animal for animal in simulation.animals if animal.gender is Gender.FEMALE]
+        species = {Species.SHEEP, Species.COW}
+        for female in females:
+            self.assertEqual(grid.query_for(female, 3, species), grid.query(female.x, female.y, 3, species))
+        mover = next(animal for animal in simulation.animals if simulation.is_position_available(animal.x + 1, animal.y, None)
+                     and animal.x + 1 < simulation.board_size)
+        affected = {grid.bucket_of(mover.x, mover.y), grid.bucket_of(mover.x + 1, mover.y)}
+        simulation.relocate(mover, 1, 0)
+        misses = grid.misses
+        for female in females:
+            self.assertEqual(grid.query_for(female, 3, species), grid.query(female.x, female.y, 3, species))
+        expected = sum(1 for female in females if affected & set(grid.cache[female.id][(3, frozenset(species), None)][0]))
+        self.assertEqual(grid.misses - misses, expected)
+        self.assertLess(expected, len(females))
+
+    def test_dizi_motorlari_artimli_modu_reddeder(self):
+        """`incremental=True` seçeneğinin yalnızca nesne motorunda, `False` değerinin her motorda kabul edildiğini test eder."""
+        for engine in ("array", "parallel"):
+            with self.subTest(engine=engine):
+                with self.assertRaises(ValueError):
+                    Simulation(board_size=20, event_sink=NullEventSink(), engine=engine, incremental=True)
+                simulation = Simulation(board_size=20, event_sink=NullEventSink(), engine=engine, incremental=False)
+                if engine == "parallel":
+                    simulation.close()
+
+class TestIndexedTrace(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        sink = ListEventSink()
+        simulation = Simulation(board_size=40, event_sink=sink, seed=6)
+        simulation.MAX_MOVEMENT = 3000
+        simulation.run(report=False)
+        self.events = sink.events
+
+    def test_sorgular_yalnizca_ilgili_bloklari_okur(self):
+        """Varlık, tür ve tur aralığı sorgularının doğru olayları döndürdüğünü ve yalnızca ilgili blokları okuduğunu test eder."""
+        path = os.path.join(self.directory.name, "trace.bin")
+        with IndexedTraceSink(path, block_events=200) as sink:
+            for event in self.events:
+                sink.emit(event)
+        with IndexedTrace(path) as trace:
+            self.assertGreater(len(trace.blocks), 3)
+            self.assertEqual(trace.ticks(1, 10 ** 9), self.events)
+            self.assertTrue(all(first <= last for _, _, first, last, _ in trace.blocks))
+            trace.blocks_read = 0
+            entity_id = self.events[0].ids[0]
+            self.assertEqual(trace.entity_history(entity_id), [event for event in self.events if entity_id in event.ids])
+            self.assertLessEqual(trace.blocks_read, len(trace.entities[str(entity_id)]))
+            hunts = list(trace.events(kind=EventKind.HUNT, start=3, stop=6))
+            self.assertEqual(hunts, [event for event in self.events if event.kind == EventKind.HUNT and 3 <= event.tick < 6])
+            births = list(trace.events(kind=EventKind.BIRTH, species=Species.CHICKEN))
+            self.assertEqual(births, [event for event in self.events
+                                      if event.kind == EventKind.BIRTH and Species.CHICKEN in event.species])
+
+    def test_metin_kaydi_donusturulur(self):
+        """Eski metin kaydının tur numaraları dahil aynı olaylara dönüştürüldüğünü test eder."""
+        text_path = os.path.join(self.directory.name, "simulation_output.txt")
+        trace_path = os.path.join(self.directory.name, "trace.bin")
+        with open(text_path, "wb") as file:
+            file.write(FORMATS["text"](self.events))
+        self.assertEqual(convert_text_trace(text_path, trace_path, block_events=100), len(self.events))
+        with IndexedTrace(trace_path) as trace:
+            self.assertEqual(list(trace.events()), self.events)
+
+class TestFrames(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "frames.bin")
+
+    def expected_board(self, simulation):
+        codes = list(Species)
+        board = [[0] * simulation.board_size for _ in range(simulation.board_size)]
+        for animal in simulation.animals:
+            board[animal.y][animal.x] = codes.index(animal.species) + 1
+        return board
+
+    def test_kareler_tahtayla_ayni(self):
+        """Olaylardan artımlı yazılan karelerin, halka birkaç kez dolduktan sonra da tahtanın kendisiyle aynı olduğunu test eder."""
+        ring = FrameRing(self.path, 30, slots=2)
+        simulation = Simulation(board_size=30, event_sink=NullEventSink(), seed=9, frames=ring)
+        simulation.MAX_MOVEMENT = 10 ** 9
+        reader = FrameReader(self.path)
+        self.addCleanup(reader.close)
+        self.assertIsNone(reader.latest())
+        simulation.populate()
+        for _ in range(6):
+            simulation.step()
+            frame = reader.latest()
+            self.assertEqual((frame.number, frame.tick), (simulation.tick, simulation.tick))
+            self.assertEqual(frame.hunter, (simulation.hunter.x, simulation.hunter.y))
+            self.assertEqual([list(frame.cells[y]) for y in range(30)], self.expected_board(simulation))
+        self.assertEqual(reader.species, [species.value for species in Species])
+        ring.close()
+
+    def test_cok_turlu_senaryo_basliga_sigar(self):
+        """Tür adları varsayılan başlığa sığmayan bir senaryoda başlığın büyütüldüğünü ve karelerin doğru okunduğunu test eder."""
+        config = {"species": [{"name": f"Species{index:02d}", "move_distance": 1, "initial": {"Male": 2, "Female": 2}}
+                              for index in range(MAX_SPECIES - 1)]}
+        scenario = Scenario.from_dict(config)
+        ring = FrameRing(self.path, 30, slots=2)
+        self.addCleanup(ring.close)
+        # Okuyucu başlık büyütülmeden önce açılır.
+        reader = FrameReader(self.path)
+        self.addCleanup(reader.close)
+        simulation = Simulation(board_size=30, event_sink=NullEventSink(), seed=2, frames=ring, scenario=scenario)
+        simulation.populate()
+        simulation.step()
+        frame = reader.latest()
+        self.assertEqual(reader.species, [species.value for species in scenario.members])
+        board = [[0] * 30 for _ in range(30)]
+        _, xs, ys, codes, _ = simulation.export_entities()
+        for x, y, code in zip(xs, ys, codes):
+            board[y][x] = code + 1
+        self.assertEqual([list(frame.cells[y]) for y in range(30)], board)
+        with self.assertRaises(ValueError):
+            ring.reset(Simulation(board_size=30, event_sink=NullEventSink(), scenario=Scenario.from_dict(
+                {"species": [{"name": "S" * 4000, "move_distance": 1}]})))
+
+    def test_sira_kilidi(self):
+        """Kopyasız okunan karenin yuvası yeniden yazılınca geçersiz sayıldığını ve yazılmakta olan yuvanın okunmadığını test eder."""
+        ring = FrameRing(self.path, 10, slots=2)
+        self.addCleanup(ring.close)
+        simulation = Simulation(board_size=10, event_sink=NullEventSink(), seed=1, frames=ring)
+        simulation.animals_to_create = [(Species.COW, 5, "Male")]
+        simulation.populate()
+        reader = FrameReader(self.path)
+        self.addCleanup(reader.close)
+        frame = reader.latest(copy=False)
+        self.assertTrue(reader.is_current(frame))
+        simulation.step()
+        self.assertTrue(reader.is_current(frame), "Çift tamponlamada bir sonraki kare diğer yuvaya yazılmalıdır.")
+        simulation.step()
+        self.assertFalse(reader.is_current(frame))
+        del frame
+        # Yazıcı yuvanın ortasında kalmış gibi sıra numarasını tek sayı yap.
+        slot = (ring.published - 1) % ring.slots
+        base = ring.header_size + slot * ring.slot_size
+        struct.pack_into("<Q", ring._map, base, struct.unpack_from("<Q", ring._map, base)[0] + 1)
+        with self.assertRaises(RuntimeError):
+            reader.latest(attempts=3)
+
+class TestService(unittest.IsolatedAsyncioTestCase):
+    async def start_server(self, **options):
+        server = SimulationServer(**options)
+        host, port = await server.start(port=0)
+        self.addAsyncCleanup(server.close)
+        client = await SimulationClient.connect(host, port)
+        self.addAsyncCleanup(client.close)
+        return server, client
+
+    async def test_yasam_dongusu_tek_simulasyonla_ayni(self):
+        """Sunucuda kurulan ve ilerletilen simülasyonun aynı tohumlu bağımsız simülasyonla aynı sonucu verdiğini test eder."""
+        _, client = await self.start_server(workers=2)
+        animals = [["Sheep", 10, "Male"], ["Sheep", 10, "Female"], ["Wolf", 3, "Male"], ["Wolf", 3, "Female"]]
+        name = await client.create(board_size=30, seed=4, animals=animals, max_movement=400)
+        stepped = await client.step(name, 1000)
+        self.assertTrue(stepped["finished"])
+        counts = await client.counts(name)
+        snapshot = await client.snapshot(name)
+
+        expected = Simulation(board_size=30, event_sink=NullEventSink(), seed=4)
+        expected.animals_to_create = [(Species(species), count, Gender(gender)) for species, count, gender in animals]
+        expected.MAX_MOVEMENT = 400
+        expected.run(report=False)
+        self.assertEqual(stepped["tick"], expected.tick)
+        self.assertEqual(counts["counts"], {species.value: values for species, values in expected.results().items()})
+        self.assertEqual(sorted((x, y) for _, _, _, x, y in snapshot["animals"]),
+                         sorted((animal.x, animal.y) for animal in expected.animals))
+
+        await client.destroy(name)
+        with self.assertRaises(ServiceError):
+            await client.counts(name)
+        with self.assertRaises(ServiceError):
+            await client.create(board_size=10, engine="parallel")
+
+    async def test_kiracilar_arasinda_adil_siralama(self):
+        """Uzun bir adım isteği sürerken başka bir kiracının kısa isteğinin önce tamamlandığını test eder."""
+        _, client = await self.start_server(workers=1, quantum=1)
+        options = {"board_size": 30, "max_movement": 10 ** 9, "animals": [["Cow", 20, "Male"]]}
+        long_run = await client.create(seed=1, tenant="a", **options)
+        short_run = await client.create(seed=2, tenant="b", **options)
+        long_step = asyncio.ensure_future(client.step(long_run, 30, tenant="a"))
+        await asyncio.sleep(0)
+        short_result = await client.step(short_run, 2, tenant="b")
+        self.assertEqual(short_result["ticks"], 2)
+        self.assertFalse(long_step.done(), "Kısa istek uzun isteğin bitmesini beklememelidir.")
+        self.assertEqual((await long_step)["ticks"], 30)
+
+    async def test_yuk_testi(self):
+        """Yük testinin eşzamanlı simülasyonları ilerletip gecikme ölçümlerini raporladığını test eder."""
+        server, client = await self.start_server(workers=2)
+        result = await load_test(client, simulations=8, ticks=3, board_size=30)
+        self.assertEqual(result["simulations"], 8)
+        self.assertGreater(result["ticks_per_second"], 0)
+        self.assertGreaterEqual(result["latency_max_ms"], result["latency_p50_ms"])
+        self.assertEqual(server.simulations, {})
+
+class TestScenario(unittest.TestCase):
+    CONFIG = {
+        "species": [
+            {"name": "Rabbit", "move_distance": 2, "initial": {"Male": 12, "Female": 12}},
+            {"name": "Deer", "move_distance": 2, "initial": {"Male": 6, "Female": 6}},
+            {"name": "Fox", "move_distance": 3, "hunt_distance": 4, "prey": ["Rabbit"], "priority": 1,
+             "initial": {"Male": 4, "Female": 4}},
+        ],
+        "hunter": {"hunt_distance": 6, "prey": ["Deer"]},
+    }
+
+    def test_varsayilan_tablolar_yerlesik_kurallarla_ayni(self):
+        """Varsayılan senaryonun tablolarının yerleşik avlanma, öncelik ve üreme kurallarını verdiğini test eder."""
+        scenario = DEFAULT_SCENARIO
+        members = list(Species)
+        self.assertEqual([species.code for species in members], list(range(len(members))))
+        for predator in members:
+            for prey in members[:-1]:
+                expected = scenario.traits[predator.code].hunt_distance is not None or predator is Species.HUNTER
+                self.assertEqual(bool(scenario.eligible[predator.code][prey.code]), expected and predator is not prey)
+        ranking = sorted(members, key=lambda species: scenario.priority[species.code])
+        self.assertEqual(ranking[:3], [Species.HUNTER, Species.LION, Species.WOLF])
+        poultry = (Species.CHICKEN, Species.ROOSTER)
+        for a in members:
+            for b in members:
+                self.assertEqual(bool(scenario.mating[a.code][b.code]), a is b or (a in poultry and b in poultry))
+        offspring = scenario.offspring_species[Species.ROOSTER.code]
+        self.assertEqual(offspring[Species.CHICKEN.code], (Species.ROOSTER, Species.CHICKEN))
+        self.assertEqual(offspring[Species.ROOSTER.code], (Species.ROOSTER, Species.ROOSTER))
+        self.assertEqual(Simulation.NUM_ANIMALS, DEFAULT_SCENARIO.initial_counts)
+
+    def test_ayni_tur_enumu_birden_fazla_senaryoda_kullanilir(self):
+        """Yerleşik `Species` Enum'uyla ikinci bir senaryonun kurulabildiğini ve varsayılan kuralları değiştirmediğini test eder."""
+        config = DEFAULT_SCENARIO.to_dict()
+        for entry in config["species"]:
+            if entry["name"] == "Wolf":
+                entry["prey"] = ["Sheep"]
+        scenario = Scenario.from_dict(config, Species)
+        self.assertFalse(hasattr(Species.WOLF, "prey"))
+        self.assertFalse(scenario.eligible[Species.WOLF.code][Species.COW.code])
+        self.assertTrue(DEFAULT_SCENARIO.eligible[Species.WOLF.code][Species.COW.code])
+        sink = ListEventSink()
+        simulation = Simulation(board_size=30, event_sink=sink, seed=2, scenario=scenario)
+        simulation.MAX_MOVEMENT = 3000
+        simulation.populate()
+        for _ in range(15):
+            simulation.step()
+        hunts = [event.species for event in sink.events if event.kind == EventKind.HUNT]
+        self.assertNotIn((Species.WOLF, Species.COW), hunts)
+
+    def test_tur_sayisi_sinirlanir(self):
+        """Tür kodları bir bayta sığmayacaksa senaryonun reddedildiğini test eder."""
+        def config(count):
+            return {"species": [{"name": f"S{index}", "move_distance": 1} for index in range(count)]}
+        self.assertEqual(len(Scenario.from_dict(config(MAX_SPECIES - 1)).members), MAX_SPECIES)
+        with self.assertRaises(ScenarioError):
+            Scenario.from_dict(config(MAX_SPECIES))
+
+    def test_dosyadan_yuklenen_turlar_yalnizca_izin_verilen_avlari_avlar(self):
+        """Özel türlerin dosyadan yüklendiğini ve avcıların yalnızca `prey` listesindeki türleri avladığını test eder."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scenario.json")
+            with open(path, "w") as file:
+                json.dump(self.CONFIG, file)
+            engines = ["object", "parallel"] + (["array"] if numpy is not None else [])
+            for engine in engines:
+                with self.subTest(engine=engine):
+                    scenario = load_scenario(path)
+                    sink = ListEventSink()
+                    extra = {"processes": 1} if engine == "parallel" else {}
+                    simulation = Simulation(board_size=30, event_sink=sink, engine=engine, seed=2, scenario=scenario,
+                                            **extra)
+                    simulation.MAX_MOVEMENT = 3000
+                    simulation.populate()
+                    for _ in range(15):
+                        simulation.step()
+                    self.assertEqual([species.value for species in simulation.NUM_ANIMALS], ["Rabbit", "Deer", "Fox"])
+                    hunts = [event.species for event in sink.events if event.kind == EventKind.HUNT]
+                    self.assertTrue(hunts)
+                    allowed = {("Fox", "Rabbit"), ("Hunter", "Deer")}
+                    self.assertTrue(all((predator.value, prey.value) in allowed for predator, prey in hunts))
+
+    def test_gecersiz_yapilandirma_reddedilir(self):
+        """Bilinmeyen alanların, tanımsız türlere başvuruların ve ayrılmış adların reddedildiğini test eder."""
+        broken = [
+            {"species": []},
+            {"species": [{"name": "Hunter", "move_distance": 1}]},
+            {"species": [{"name": "Fox", "move_distance": 1, "hunt_distance": 3, "prey": ["Rabbit"]}]},
+            {"species": [{"name": "Fox", "move_distance": -1}]},
+            {"species": [{"name": "Fox", "move_distance": 1, "speed": 2}]},
+            {"species": [{"name": "Fox", "move_distance": 1, "prey": ["Fox"]}]},
+            {"species": [{"name": "Fox", "move_distance": 1, "offspring": {"Male": "Fox"}}]},
+        ]
+        for config in broken:
+            with self.subTest(config=config), self.assertRaises(ScenarioError):
+                Scenario.from_dict(config)
+        with self.assertRaises(ScenarioError):
+            Scenario.from_dict(self.CONFIG, Species)
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_tekrarlanan_taramada_yalnizca_yeni_noktalar_calisir(self):
+        """Tekrarlanan taramanın tamamen önbellekten geldiğini, yeni bir tohumun yalnızca kendi noktasını çalıştırdığını test eder."""
+        cache = ResultCache(self.directory.name)
+        points = expand_grid(board_size=[20], max_movement=[300], reproduction_distance=[2, 3], seed=[0, 1])
+        self.assertEqual(len(points), 4)
+        first = {result.point: result for result in run_sweep(points, cache, processes=1)}
+        self.assertFalse(any(result.cached for result in first.values()))
+        self.assertEqual(first[points[0]].counts, run_point(points[0]))
+
+        repeated = list(run_sweep(points, ResultCache(self.directory.name), processes=1))
+        self.assertTrue(all(result.cached for result in repeated))
+        self.assertEqual({result.point: result.counts for result in repeated},
+                         {point: result.counts for point, result in first.items()})
+
+        extended = expand_grid(board_size=[20], max_movement=[300], reproduction_distance=[2, 3], seed=[0, 1, 2])
+        fresh = [result.point for result in run_sweep(extended, cache, processes=1) if not result.cached]
+        self.assertEqual(sorted(fresh), sorted(point for point in extended if point.seed == 2))
+
+    def test_baslangic_nufusu_anahtara_ve_sonuca_yansir(self):
+        """Başlangıç nüfusunun nokta anahtarını değiştirdiğini ve sonuçtaki başlangıç sayılarına yansıdığını test eder."""
+        animals = [(Species.COW, 4, Gender.MALE), (Species.COW, 4, Gender.FEMALE)]
+        point = SweepPoint(board_size=20, animals_to_create=(("Cow", 4, "Male"), ("Cow", 4, "Female")), max_movement=100)
+        self.assertEqual(expand_grid(board_size=[20], animals_to_create=[animals], max_movement=[100]), [point])
+        self.assertNotEqual(point_key(point), point_key(point._replace(animals_to_create=None)))
+        self.assertNotEqual(point_key(point, "a"), point_key(point, "b"))
+        counts = run_point(point)
+        self.assertEqual(counts["Cow"]["initial"], 8)
+        self.assertEqual(counts["Sheep"], {"initial": 0, "final": 0, "born": 0, "hunted": 0})
+
+    def test_boyut_siniri_en_eski_kullanilani_siler(self):
+        """Boyut sınırı aşıldığında en uzun süredir kullanılmayan kaydın silindiğini test eder."""
+        value = {"counts": {"Sheep": {"initial": 1}}, "padding": "x" * 100}
+        size = len(json.dumps(value, separators=(",", ":")))
+        cache = ResultCache(self.directory.name, max_bytes=3 * size)
+        for key in ("a", "b", "c"):
+            cache.put(key, value)
+        self.assertIsNotNone(cache.get("a"))
+        cache.put("d", value)
+        self.assertEqual(sorted(os.path.splitext(name)[0] for name in os.listdir(self.directory.name)), ["a", "c", "d"])
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(ResultCache(self.directory.name, max_bytes=3 * size)), 3)
 
 
 if __name__ == '__main__':
-    suite = unittest.TestLoader().loadTestsFromTestCase(TestSimulation)
-    unittest.TextTestRunner(verbosity=2).run(suite)
\ No newline at end of file
+    unittest.main(verbosity=2)
\ No newline at end of file